@@ -0,0 +1,8 @@
+import os
+
+import django
+
+
+def setup() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wantedlab.settings")
+    django.setup()
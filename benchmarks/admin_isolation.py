@@ -0,0 +1,99 @@
+"""API latency while the Django admin is under load, for the WSGIMiddleware mount vs. the bounded ASGI mount.
+
+python -m benchmarks.admin_isolation --tag tag_1 --api-concurrency 20 --admin-concurrency 50 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks import setup
+from benchmarks.stats import summarize
+
+setup()
+
+import httpx  # noqa: E402
+from asgiref.sync import sync_to_async  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.test import Client  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.middleware.wsgi import WSGIMiddleware  # noqa: E402
+
+from wantedlab.asgi import admin_application  # noqa: E402
+from wantedlab.company.routers import router as company_router  # noqa: E402
+
+ADMIN_USERNAME = "benchmark-admin"
+
+
+def build_app(admin: str) -> FastAPI:
+    app = FastAPI()
+    app.mount("/django", WSGIMiddleware(get_wsgi_application()) if admin == "wsgi" else admin_application)
+    app.include_router(company_router, prefix="/api/v1")
+    return app
+
+
+def admin_session() -> str:
+    user, _ = get_user_model().objects.get_or_create(
+        username=ADMIN_USERNAME, defaults={"is_staff": True, "is_superuser": True}
+    )
+    client = Client()
+    client.force_login(user)
+    return client.cookies["sessionid"].value
+
+
+async def run(app: FastAPI, args, session: str, with_admin: bool) -> dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    remaining = iter(range(args.requests))
+    api_done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=None) as client:
+
+        async def api_worker() -> None:
+            for offset in remaining:
+                started = time.perf_counter()
+                # Vary the offset so the response cache does not answer every request.
+                response = await client.get(f"/api/v1/companies/tag/{args.tag}", params={"offset": offset % 50})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        async def admin_worker() -> None:
+            while not api_done.is_set():
+                response = await client.get(
+                    "/django/admin/company/company/", params={"q": "a"}, cookies={"sessionid": session}
+                )
+                response.raise_for_status()
+
+        admin = [asyncio.create_task(admin_worker()) for _ in range(args.admin_concurrency if with_admin else 0)]
+        started = time.perf_counter()
+        await asyncio.gather(*(api_worker() for _ in range(args.api_concurrency)))
+        elapsed = time.perf_counter() - started
+        api_done.set()
+        await asyncio.gather(*admin)
+
+    return summarize(latencies, elapsed)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tag", default="tag_1")
+    parser.add_argument("--api-concurrency", type=int, default=20)
+    parser.add_argument("--admin-concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    session = await sync_to_async(admin_session)()
+    results = {}
+    for admin in ("wsgi", "asgi"):
+        app = build_app(admin)
+        results[admin] = {
+            "api_only": await run(app, args, session, with_admin=False),
+            "api_with_busy_admin": await run(app, args, session, with_admin=True),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+"""Seeded synthetic companies with Korean/English/Japanese names, written as JSONL for import_companies.
+
+python -m benchmarks.dataset --companies 100000 --tags 300 --tags-per-company poisson:3 --output companies.jsonl --load
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import math
+import random
+from typing import Callable, Iterator
+
+# (ko, en, ja) readings, so the three names of a company stay transliterations of each other.
+SYLLABLES = (
+    ("원", "won", "ウォン"),
+    ("티", "ti", "ティ"),
+    ("드", "de", "ド"),
+    ("카", "ka", "カ"),
+    ("나", "na", "ナ"),
+    ("리", "ri", "リ"),
+    ("모", "mo", "モ"),
+    ("토", "to", "ト"),
+    ("하", "ha", "ハ"),
+    ("미", "mi", "ミ"),
+    ("소", "so", "ソ"),
+    ("라", "ra", "ラ"),
+    ("노", "no", "ノ"),
+    ("비", "bi", "ビ"),
+    ("코", "ko", "コ"),
+    ("스", "s", "ス"),
+    ("타", "ta", "タ"),
+    ("마", "ma", "マ"),
+    ("제", "je", "ジェ"),
+    ("로", "ro", "ロ"),
+    ("다", "da", "ダ"),
+    ("에", "e", "エ"),
+    ("유", "yu", "ユ"),
+    ("키", "ki", "キ"),
+)
+
+SUFFIXES = (
+    ("랩", "Lab", "ラボ"),
+    ("테크", "Tech", "テック"),
+    ("소프트", "Soft", "ソフト"),
+    ("네트웍스", "Networks", "ネットワークス"),
+    ("바이오", "Bio", "バイオ"),
+    ("에너지", "Energy", "エナジー"),
+    ("코리아", "Korea", "コリア"),
+    ("파트너스", "Partners", "パートナーズ"),
+    ("솔루션즈", "Solutions", "ソリューションズ"),
+    ("게임즈", "Games", "ゲームズ"),
+    ("모빌리티", "Mobility", "モビリティ"),
+    ("헬스케어", "Healthcare", "ヘルスケア"),
+    ("스튜디오", "Studio", "スタジオ"),
+    ("로보틱스", "Robotics", "ロボティクス"),
+)
+
+TAG_WORDS = (
+    "개발",
+    "디자인",
+    "마케팅",
+    "금융",
+    "교육",
+    "헬스케어",
+    "게임",
+    "커머스",
+    "모빌리티",
+    "인공지능",
+    "보안",
+    "클라우드",
+    "핀테크",
+    "물류",
+    "콘텐츠",
+    "부동산",
+    "채용",
+    "여행",
+    "푸드",
+    "반도체",
+)
+
+
+def tag_name(number: int) -> str:
+    word = TAG_WORDS[(number - 1) % len(TAG_WORDS)]
+    cycle = (number - 1) // len(TAG_WORDS)
+    return word if cycle == 0 else f"{word}{cycle + 1}"
+
+
+def tags_per_company(spec: str, rng: random.Random) -> Callable[[], int]:
+    """``fixed:K``, ``uniform:A-B`` or ``poisson:MEAN``."""
+    kind, _, value = spec.partition(":")
+    if kind == "fixed":
+        count = int(value)
+        return lambda: count
+    if kind == "uniform":
+        low, _, high = value.partition("-")
+        return lambda: rng.randint(int(low), int(high))
+    if kind == "poisson":
+        threshold = math.exp(-float(value))
+
+        def poisson() -> int:
+            # Knuth's method; fine for the small means used here.
+            count, product = 0, rng.random()
+            while product > threshold:
+                count += 1
+                product *= rng.random()
+            return count
+
+        return poisson
+    raise argparse.ArgumentTypeError(f"unknown distribution: {spec}")
+
+
+def generate(
+    companies: int, tags: int, distribution: str, seed: int, skew: float = 1.1, english_only_ratio: float = 0.05
+) -> Iterator[dict]:
+    """Same arguments, same records. Tag popularity follows a Zipf curve with exponent ``skew``."""
+    rng = random.Random(seed)
+    tag_count = tags_per_company(distribution, rng)
+    cumulative = list(itertools.accumulate(1 / rank**skew for rank in range(1, tags + 1)))
+    seen: set[str] = set()
+
+    for _ in range(companies):
+        parts = [rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))]
+        suffix = rng.choice(SUFFIXES)
+        name_ko = "".join(part[0] for part in parts) + suffix[0]
+        name_en = "".join(part[1] for part in parts).capitalize() + " " + suffix[1]
+        name_ja = "".join(part[2] for part in parts) + suffix[2]
+        if name_ko in seen:
+            serial = len(seen)
+            name_ko, name_en, name_ja = f"{name_ko} {serial}", f"{name_en} {serial}", f"{name_ja}{serial}"
+        seen.add(name_ko)
+
+        numbers: set[int] = set()
+        wanted = min(tag_count(), tags)
+        while len(numbers) < wanted:
+            numbers.add(bisect.bisect(cumulative, rng.random() * cumulative[-1]) + 1)
+
+        english_only = rng.random() < english_only_ratio
+        yield {
+            "name_ko": None if english_only else name_ko,
+            "name_en": name_en,
+            "name_ja": None if english_only else name_ja,
+            "tags": [{"number": number, "name": tag_name(number)} for number in sorted(numbers)],
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--companies", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=300)
+    parser.add_argument("--tags-per-company", default="poisson:3", help="fixed:K, uniform:A-B or poisson:MEAN")
+    parser.add_argument("--tag-skew", type=float, default=1.1, help="Zipf exponent of tag popularity")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="companies.jsonl")
+    parser.add_argument("--load", action="store_true", help="run import_companies on the output afterwards")
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        for record in generate(args.companies, args.tags, args.tags_per_company, args.seed, args.tag_skew):
+            file.write(json.dumps(record, ensure_ascii=False))
+            file.write("\n")
+
+    if args.load:
+        from benchmarks import setup
+
+        setup()
+
+        from django.core.management import call_command
+
+        call_command("import_companies", args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Drive every company endpoint through the full FastAPI app and report latency and queries per request.
+
+python -m benchmarks.load --concurrency 20 --requests 1000 --output results.json --baseline baseline.json
+
+Run against a database seeded with benchmarks.dataset. Mutating scenarios add a tag and remove it again,
+so the dataset is unchanged afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Awaitable, Callable
+
+from benchmarks import setup
+from benchmarks.stats import compare, summarize
+
+setup()
+
+import httpx  # noqa: E402
+from asgiref.sync import sync_to_async  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+from wantedlab.company.cache import response_cache  # noqa: E402
+from wantedlab.company.models import Company, Tag  # noqa: E402
+from wantedlab.company.warmup import warm_up_company_indexes  # noqa: E402
+from wantedlab.fastapi import app  # noqa: E402
+
+Request = Callable[[httpx.AsyncClient, random.Random], Awaitable[int]]
+
+
+class QueryCounter:
+    """Counts SQL statements on every connection opened after install(), on any thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def _on_connection_created(self, sender, connection, **kwargs) -> None:
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def install(self) -> None:
+        connection_created.connect(self._on_connection_created, weak=False)
+
+
+class Sample:
+    def __init__(self, seed: int, size: int) -> None:
+        rng = random.Random(seed)
+        company_rows = list(
+            Company.objects.order_by("id").values_list("id", "name_ko", "name_en", "name_ja", "tag_snapshot")[:size]
+        )
+        if not company_rows:
+            raise SystemExit("no companies loaded; seed the database with benchmarks.dataset first")
+        self.company_ids = [row[0] for row in company_rows]
+        self.company_tags = {row[0]: {tag["id"] for tag in row[4]} for row in company_rows}
+        self.names = [name for row in company_rows for name in row[1:4] if name]
+        self.prefixes = [name[: rng.randint(1, min(len(name), 4))] for name in self.names]
+        self.tags = list(Tag.objects.order_by("id").values_list("id", "number"))
+        self.untagged_companies = [
+            company_id for company_id, tag_ids in self.company_tags.items() if len(tag_ids) < len(self.tags)
+        ]
+        rng.shuffle(self.names)
+        rng.shuffle(self.prefixes)
+
+
+def scenarios(sample: Sample, limit: int) -> dict[str, Request]:
+    async def get(client: httpx.AsyncClient, url: str, params: dict | None = None) -> int:
+        response = await client.get(url, params=params)
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return 1
+
+    async def autocomplete(client, rng):
+        return await get(
+            client, "/api/v1/companies/search/keyword", {"company_name": rng.choice(sample.prefixes), "limit": limit}
+        )
+
+    async def search(client, rng):
+        return await get(client, "/api/v1/companies/search", {"name": rng.choice(sample.names)})
+
+    async def by_tag(client, rng):
+        _, number = rng.choice(sample.tags)
+        return await get(
+            client, f"/api/v1/companies/tag/tag_{number}", {"offset": rng.randrange(0, 100), "limit": limit}
+        )
+
+    async def export_by_tag(client, rng):
+        _, number = rng.choice(sample.tags)
+        return await get(client, "/api/v1/companies/export", {"tag": f"tag_{number}"})
+
+    async def add_remove_tag(client, rng):
+        company_id = rng.choice(sample.untagged_companies)
+        # Only tags the company does not have, so the DELETE restores the seeded state.
+        tag_id = rng.choice([tag_id for tag_id, _ in sample.tags if tag_id not in sample.company_tags[company_id]])
+        (await client.post(f"/api/v1/companies/{company_id}/tags", json=tag_id)).raise_for_status()
+        (await client.delete(f"/api/v1/companies/{company_id}/tags/{tag_id}")).raise_for_status()
+        return 2
+
+    async def bulk_tags(client, rng):
+        tag_id, _ = rng.choice(sample.tags)
+        company_ids = rng.sample(sample.company_ids, min(50, len(sample.company_ids)))
+        assignments = [{"company_id": company_id, "tag_ids": [tag_id]} for company_id in company_ids]
+        response = await client.post("/api/v1/companies/tags/bulk", json={"add": assignments})
+        response.raise_for_status()
+        added = [result for result in response.json()["add"] if result["status"] == "added"]
+        removals = [{"company_id": result["company_id"], "tag_ids": [tag_id]} for result in added]
+        if removals:
+            (await client.post("/api/v1/companies/tags/bulk", json={"remove": removals})).raise_for_status()
+            return 2
+        return 1
+
+    available = {
+        "autocomplete": autocomplete,
+        "search": search,
+        "by_tag": by_tag,
+        "export_by_tag": export_by_tag,
+        "add_remove_tag": add_remove_tag,
+        "bulk_tags": bulk_tags,
+    }
+    if not sample.untagged_companies:
+        del available["add_remove_tag"]
+    return available
+
+
+async def drive(
+    request: Request, counter: QueryCounter, concurrency: int, requests: int, seed: int
+) -> dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    sent = 0
+    remaining = iter(range(requests))
+    queries_before = counter.count
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost", timeout=None) as client:
+
+        async def worker(rng: random.Random) -> None:
+            nonlocal sent
+            for _ in remaining:
+                started = time.perf_counter()
+                count = await request(client, rng)
+                latencies.append(time.perf_counter() - started)
+                sent += count
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(random.Random(seed + index)) for index in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    result = summarize(latencies, elapsed)
+    result["queries_per_request"] = round((counter.count - queries_before) / max(sent, 1), 2)
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=1000, help="iterations per scenario")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--sample", type=int, default=5000, help="companies sampled for request parameters")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenario", action="append", help="run only these scenarios (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p99/throughput regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    counter = QueryCounter()
+    counter.install()
+    sample = await sync_to_async(Sample)(args.seed, args.sample)
+    await warm_up_company_indexes()
+    if args.no_cache:
+        response_cache.enabled = False
+
+    available = scenarios(sample, args.limit)
+    results = {
+        "meta": {
+            "vendor": connection.vendor,
+            "companies": await sync_to_async(Company.objects.count)(),
+            "tags": len(sample.tags),
+            **{name: getattr(args, name) for name in ("concurrency", "requests", "limit", "seed", "no_cache")},
+        },
+        "scenarios": {},
+    }
+    for name in args.scenario or available:
+        results["scenarios"][name] = await drive(available[name], counter, args.concurrency, args.requests, args.seed)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results["scenarios"], json.load(file)["scenarios"], args.tolerance)
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
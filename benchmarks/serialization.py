@@ -0,0 +1,96 @@
+"""Model/schema/response_model serialization vs. values() dicts encoded straight to JSON.
+
+python -m benchmarks.serialization --items 100 --tags 5 --iterations 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks import setup
+from benchmarks.stats import summarize
+
+setup()
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from pydantic_core import to_json  # noqa: E402
+
+from wantedlab.company.models import Company  # noqa: E402
+from wantedlab.company.schemas import CompanySchema, PaginatedCompanyResponse  # noqa: E402
+from wantedlab.company.views import CompanyView  # noqa: E402
+
+RESPONSE_FIELD = create_response_field(name="Response", type_=PaginatedCompanyResponse, mode="serialization")
+
+
+def make_rows(items: int, tags: int) -> list[dict]:
+    snapshot = [{"id": number, "name": f"태그_{number}", "number": number} for number in range(1, tags + 1)]
+    return [
+        {
+            "id": company_id,
+            "name_ko": f"원티드랩 {company_id}",
+            "name_en": f"Wantedlab {company_id}",
+            "name_ja": f"ウォンテッドラボ {company_id}",
+            "tag_snapshot": snapshot,
+        }
+        for company_id in range(1, items + 1)
+    ]
+
+
+async def schema_path(rows: list[dict]) -> bytes:
+    companies = [Company(**row) for row in rows]
+    response = PaginatedCompanyResponse(
+        items=[
+            CompanySchema(
+                id=company.id,
+                name_ko=company.name_ko,
+                name_en=company.name_en,
+                name_ja=company.name_ja,
+                tags=company.tag_snapshot,
+            )
+            for company in companies
+        ],
+        total=len(companies),
+        limit=len(companies),
+        offset=0,
+    )
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=response)
+    return JSONResponse(content).body
+
+
+async def fast_path(rows: list[dict]) -> bytes:
+    items = [CompanyView._company_payload(row) for row in rows]
+    return to_json(CompanyView._page_payload(items, len(rows), len(rows), 0, None))
+
+
+async def measure(target, rows: list[dict], iterations: int) -> dict[str, float]:
+    latencies: list[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        await target(rows)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.items, args.tags)
+    if json.loads(await schema_path(rows)) != json.loads(await fast_path(rows)):
+        raise SystemExit("fast path output differs from the response_model output")
+
+    results = {}
+    for name, target in (("schema_path", schema_path), ("fast_path", fast_path)):
+        results[name] = await measure(target, rows, args.iterations)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
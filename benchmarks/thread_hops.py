@@ -0,0 +1,68 @@
+"""Per-call sync_to_async hops vs. one unit of work per request.
+
+python -m benchmarks.thread_hops --tag tag_1 --concurrency 50 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks import setup
+from benchmarks.stats import summarize
+
+setup()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+
+from wantedlab.company.models import Company, Tag  # noqa: E402
+from wantedlab.company.views import CompanyView  # noqa: E402
+
+
+async def per_call_hops(full_tag: str, limit: int) -> None:
+    _, number = full_tag.split("_")
+    tag = await sync_to_async(Tag.objects.get)(number=int(number))
+    companies = await sync_to_async(tag.companies.all)()
+    await sync_to_async(companies.count)()
+    for company in await sync_to_async(list)(companies[:limit]):
+        await sync_to_async(list)(company.tags.all())
+
+
+async def unit_of_work(full_tag: str, limit: int) -> None:
+    await CompanyView.list_companies_company_by_tag(full_tag=full_tag, offset=0, limit=limit)
+
+
+async def drive(target, full_tag: str, limit: int, concurrency: int, requests: int) -> dict[str, float]:
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await target(full_tag, limit)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tag", default="tag_1")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    if not await sync_to_async(Company.objects.exists)():
+        raise SystemExit("no companies loaded; seed the database first")
+
+    results = {}
+    for name, target in (("per_call_hops", per_call_hops), ("unit_of_work", unit_of_work)):
+        results[name] = await drive(target, args.tag, args.limit, args.concurrency, args.requests)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
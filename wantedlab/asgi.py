@@ -7,10 +7,34 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
+import asyncio
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wantedlab.settings")
 
 application = get_asgi_application()
+
+
+class BoundedASGIApp:
+    """Caps concurrent HTTP requests into a sync-heavy ASGI app.
+
+    Django's ASGIHandler runs each request's sync code on a thread owned by that
+    request's ThreadSensitiveContext, so the cap also bounds the admin's threads,
+    and none of them come from the executor the API uses for its queries.
+    """
+
+    def __init__(self, app, max_concurrency: int) -> None:
+        self.app = app
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        async with self._semaphore:
+            await self.app(scope, receive, send)
+
+
+admin_application = BoundedASGIApp(application, max_concurrency=settings.DJANGO_ADMIN_MAX_CONCURRENCY)
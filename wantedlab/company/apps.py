@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CompanyConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "wantedlab.company"
+
+    def ready(self) -> None:
+        from wantedlab.company import lookups, metrics, signals  # noqa: F401
@@ -0,0 +1,237 @@
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from pydantic_core import to_json
+
+from wantedlab.company.metrics import measure_serialization
+from wantedlab.company.routing import reads_from_replica, reads_pinned
+
+SCOPE_COMPANIES = "companies"
+SCOPE_TAGS = "tags"
+
+_GENERATION_KEY = "company:generation"
+_ANY_GENERATION = object()
+
+
+def company_scope(company_id: int) -> str:
+    return f"company:{company_id}"
+
+
+def tag_scope(tag_number: int) -> str:
+    return f"tag:{tag_number}"
+
+
+class LocalLRUCache:
+    def __init__(self, max_entries: int) -> None:
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class ResponseCache:
+    """Two-level (process LRU + Django cache) cache whose entries record the
+    version token of every scope they were built from. Invalidating a scope
+    replaces its token, so only entries depending on it stop validating."""
+
+    def __init__(self) -> None:
+        options = settings.COMPANY_RESPONSE_CACHE
+        self.enabled: bool = options["ENABLED"]
+        self.ttl: float = options["TTL"]
+        self._local = LocalLRUCache(options["MAX_ENTRIES"])
+        self._shared_alias: str | None = options["SHARED_ALIAS"]
+
+    @property
+    def _shared(self):
+        return caches[self._shared_alias] if self._shared_alias else None
+
+    @property
+    def crosses_processes(self) -> bool:
+        # Only then does invalidate() from a management command reach the running servers.
+        return self._shared is not None and not isinstance(self._shared, LocMemCache)
+
+    @staticmethod
+    def make_key(namespace: str, params: dict[str, Any]) -> str:
+        canonical = json.dumps(
+            {name: value.value if isinstance(value, Enum) else value for name, value in sorted(params.items())},
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return f"company:response:{namespace}:{hashlib.sha1(canonical.encode()).hexdigest()}"
+
+    def get(self, key: str) -> bytes | None:
+        if not self.enabled:
+            return None
+
+        entry = self._local.get(key)
+        if entry is None and self._shared is not None:
+            entry = self._shared.get(key)
+            if entry is not None:
+                self._local.set(key, entry, self.ttl)
+        if entry is None:
+            return None
+
+        payload, versions = entry
+        if self._versions(versions) != versions:
+            return None
+        return payload
+
+    def generation(self) -> str | None:
+        """Token replaced by every invalidation in any process. Taken before a
+        read and passed to set(), it tells whether anything changed meanwhile."""
+        if self._shared is not None:
+            return self._shared.get(_GENERATION_KEY)
+        return _local_versions.get(_GENERATION_KEY)
+
+    def set(
+        self,
+        key: str,
+        payload: bytes,
+        scopes: Iterable[str],
+        from_replica: bool = False,
+        generation: str | None | object = _ANY_GENERATION,
+    ) -> None:
+        if not self.enabled:
+            return
+
+        versions = self._versions(scopes, create=True)
+        # Read after the versions: invalidate() replaces the generation first, so a version token newer than the
+        # read always comes with a changed generation and the possibly stale payload is dropped.
+        if generation is not _ANY_GENERATION and self.generation() != generation:
+            return
+        # A replica may not have replayed a write yet; caching its answer would pin stale data for the whole TTL.
+        if from_replica and self._invalidated_within(versions.values(), settings.DB_READ_YOUR_WRITES_SECONDS):
+            return
+        entry = (payload, versions)
+        self._local.set(key, entry, self.ttl)
+        if self._shared is not None:
+            self._shared.set(key, entry, self.ttl)
+
+    def invalidate(self, *scopes: str) -> None:
+        # Tokens written by an invalidation carry its time, so set() can tell how recent it was.
+        token = f"{uuid.uuid4().hex}@{time.time():.3f}"
+        tokens = {self._version_key(scope): token for scope in scopes}
+        if self._shared is not None:
+            self._shared.set(_GENERATION_KEY, token, timeout=None)
+            self._shared.set_many(tokens, timeout=None)
+        else:
+            _local_versions[_GENERATION_KEY] = token
+            _local_versions.update(tokens)
+
+    def clear(self) -> None:
+        self._local.clear()
+        _local_versions.clear()
+        if self._shared is not None:
+            self._shared.clear()
+
+    @staticmethod
+    def _invalidated_within(tokens: Iterable[str | None], seconds: float) -> bool:
+        since = time.time() - seconds
+        for token in tokens:
+            _, _, invalidated_at = (token or "").partition("@")
+            if invalidated_at and float(invalidated_at) > since:
+                return True
+        return False
+
+    @staticmethod
+    def _version_key(scope: str) -> str:
+        return f"company:scope:{scope}"
+
+    def _versions(self, scopes: Iterable[str], create: bool = False) -> dict[str, str | None]:
+        keys = {scope: self._version_key(scope) for scope in scopes}
+        store = self._shared.get_many(keys.values()) if self._shared is not None else _local_versions
+        versions = {scope: store.get(key) for scope, key in keys.items()}
+        if create:
+            for scope, version in versions.items():
+                if version is None:
+                    versions[scope] = self._create_version(keys[scope])
+        return versions
+
+    def _create_version(self, key: str) -> str:
+        token = uuid.uuid4().hex
+        if self._shared is None:
+            return _local_versions.setdefault(key, token)
+        if self._shared.add(key, token, timeout=None):
+            return token
+        return self._shared.get(key)
+
+
+_local_versions: dict[str, str] = {}
+
+response_cache = ResponseCache()
+
+
+def cached_response(
+    namespace: str,
+    scopes: Callable[[Any, dict[str, Any]], Iterable[str]],
+    key_params: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+):
+    """Wrap an async function returning JSON-compatible data so that it returns
+    the encoded JSON bytes, served from the cache when still valid."""
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> bytes:
+            # Pinned clients just wrote; a cached page may predate the write or come from a lagging replica.
+            if not response_cache.enabled or reads_pinned():
+                result = await func(*args, **kwargs)
+                with measure_serialization():
+                    return to_json(result)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            key = response_cache.make_key(namespace, key_params(params) if key_params else params)
+
+            payload = response_cache.get(key)
+            if payload is not None:
+                return payload
+
+            # Taken before the read: if any process invalidates meanwhile, set() skips the possibly stale result.
+            generation = response_cache.generation()
+            result = await func(*args, **kwargs)
+            with measure_serialization():
+                payload = to_json(result)
+            response_cache.set(
+                key, payload, scopes(result, params), from_replica=reads_from_replica(), generation=generation
+            )
+            return payload
+
+        return wrapper
+
+    return decorator
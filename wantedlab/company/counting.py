@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import QuerySet
+
+from wantedlab.company.schemas import TotalMode
+
+
+class CountCache:
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._entries: dict[tuple, tuple[float, int]] = {}
+
+    def get(self, key: tuple) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key: tuple, count: int, ttl: float) -> None:
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + ttl, count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
+
+
+def planner_estimate(queryset: QuerySet) -> int:
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    sql, params = queryset.order_by().query.sql_with_params()
+    key = (queryset.db, sql, tuple(params))
+    count = count_cache.get(key)
+    if count is None:
+        if connections[queryset.db].vendor == "postgresql":
+            count = planner_estimate(queryset)
+        else:
+            count = queryset.count()
+        count_cache.set(key, count, settings.COMPANY_COUNT_CACHE_TTL)
+    return count
+
+
+def count_queryset(queryset: QuerySet, total_mode: TotalMode) -> int | None:
+    if total_mode == TotalMode.NONE:
+        return None
+    if total_mode == TotalMode.ESTIMATE:
+        return estimate_count(queryset)
+    return queryset.count()
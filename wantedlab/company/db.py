@@ -0,0 +1,206 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Generator, ParamSpec, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from wantedlab.company.metrics import record_executor_wait
+
+P = ParamSpec("P")
+R = TypeVar("R")
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class _Call:
+    __slots__ = ("label", "submitted_at", "started")
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.submitted_at = time.perf_counter()
+        self.started = False
+
+
+class DBExecutor:
+    """Thread pool for blocking ORM calls, sized within the connection pool.
+
+    Records per label (the function handed to ``run_in_db``) how long calls
+    waited for a thread, how long they ran, and how many are queued or running.
+    """
+
+    def __init__(self, max_workers: int, slow_wait_ms: float, thread_name_prefix: str = "company-db") -> None:
+        self.max_workers = max_workers
+        self.slow_wait = slow_wait_ms / 1000
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def _label_stats(self, label: str) -> dict[str, float]:
+        stats = self._stats.get(label)
+        if stats is None:
+            stats = self._stats[label] = {
+                "calls": 0,
+                "errors": 0,
+                "queued": 0,
+                "in_flight": 0,
+                "wait_seconds_total": 0.0,
+                "wait_seconds_max": 0.0,
+                "run_seconds_total": 0.0,
+                "run_seconds_max": 0.0,
+            }
+        return stats
+
+    def submit(self, label: str) -> _Call:
+        with self._lock:
+            self._label_stats(label)["queued"] += 1
+        return _Call(label)
+
+    def abandon(self, call: _Call) -> None:
+        # Undoes submit() when the awaiting task is cancelled before a thread picks the call up.
+        with self._lock:
+            if not call.started:
+                call.started = True
+                self._stats[call.label]["queued"] -= 1
+
+    def run(self, call: _Call, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        started_at = time.perf_counter()
+        wait = started_at - call.submitted_at
+        with self._lock:
+            stats = self._stats[call.label]
+            if not call.started:
+                call.started = True
+                stats["queued"] -= 1
+            stats["in_flight"] += 1
+            stats["wait_seconds_total"] += wait
+            stats["wait_seconds_max"] = max(stats["wait_seconds_max"], wait)
+            queued = sum(label_stats["queued"] for label_stats in self._stats.values())
+        record_executor_wait(wait)
+        if wait >= self.slow_wait:
+            logger.warning(
+                "%s waited %.0f ms for a DB thread (%d queued, %d workers)",
+                call.label,
+                wait * 1000,
+                queued,
+                self.max_workers,
+            )
+
+        failed = True
+        close_old_connections()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            close_old_connections()
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                stats["calls"] += 1
+                stats["errors"] += failed
+                stats["in_flight"] -= 1
+                stats["run_seconds_total"] += elapsed
+                stats["run_seconds_max"] = max(stats["run_seconds_max"], elapsed)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {label: dict(stats) for label, stats in self._stats.items()}
+
+
+@functools.cache
+def db_executor() -> DBExecutor:
+    return DBExecutor(settings.DB_EXECUTOR_MAX_WORKERS, settings.DB_EXECUTOR_SLOW_WAIT_MS)
+
+
+@functools.cache
+def export_executor() -> DBExecutor:
+    # Long streaming exports run here so they cannot starve the API's threads.
+    return DBExecutor(settings.DB_EXPORT_MAX_WORKERS, settings.DB_EXECUTOR_SLOW_WAIT_MS, "company-export")
+
+
+def _label(func: Callable) -> str:
+    return getattr(func, "__qualname__", None) or repr(func)
+
+
+async def _run(executor: DBExecutor, label: str, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    call = executor.submit(label)
+    try:
+        return await sync_to_async(executor.run, thread_sensitive=False, executor=executor.pool)(
+            call, func, *args, **kwargs
+        )
+    finally:
+        executor.abandon(call)
+
+
+async def run_in_db(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    return await _run(db_executor(), _label(func), func, *args, **kwargs)
+
+
+async def stream_in_db(
+    func: Callable[P, Generator[T, None, None]], *args: P.args, max_buffered: int = 8, **kwargs: P.kwargs
+) -> AsyncIterator[T]:
+    """Run a sync generator as one unit of work on an export thread and yield its
+    items. At most ``max_buffered`` items are held, so a slow client pauses the
+    producer instead of growing memory."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[object, BaseException | None]] = asyncio.Queue(max_buffered)
+    stopped = threading.Event()
+
+    def put(item: object, error: BaseException | None = None) -> None:
+        if not stopped.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put((item, error)), loop).result()
+
+    def produce() -> None:
+        iterator = func(*args, **kwargs)
+        try:
+            for item in iterator:
+                if stopped.is_set():
+                    return
+                put(item)
+        except Exception as e:
+            put(_DONE, e)
+        else:
+            put(_DONE)
+        finally:
+            iterator.close()
+
+    producer = asyncio.ensure_future(_run(export_executor(), _label(func), produce))
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        stopped.set()
+        # Unblock a producer waiting on a full queue so it can notice the stop and release its connection.
+        while not queue.empty():
+            queue.get_nowait()
+        await producer
+
+
+def executor_stats() -> dict:
+    executor, export = db_executor(), export_executor()
+    return {
+        "max_workers": executor.max_workers,
+        "calls": executor.snapshot(),
+        "export": {"max_workers": export.max_workers, "calls": export.snapshot()},
+    }
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    stats = {}
+    for connection in connections.all(initialized_only=False):
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            stats[connection.alias] = pool.get_stats()
+    return stats
@@ -0,0 +1,64 @@
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = ("",) + tuple("ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ")
+
+# Compound vowels and final consonant clusters are typed as two keystrokes on a 2-set keyboard.
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ",
+    "ㅙ": "ㅗㅐ",
+    "ㅚ": "ㅗㅣ",
+    "ㅝ": "ㅜㅓ",
+    "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ",
+    "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ",
+    "ㄵ": "ㄴㅈ",
+    "ㄶ": "ㄴㅎ",
+    "ㄺ": "ㄹㄱ",
+    "ㄻ": "ㄹㅁ",
+    "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ",
+    "ㅀ": "ㄹㅎ",
+    "ㅄ": "ㅂㅅ",
+}
+
+CONSONANTS = frozenset(CHOSUNG) | frozenset("ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄ")
+
+
+def _compact(text: str | None) -> str:
+    return "".join((text or "").casefold().split())
+
+
+def _split_syllable(char: str) -> tuple[str, str, str] | None:
+    code = ord(char)
+    if not HANGUL_BASE <= code <= HANGUL_LAST:
+        return None
+    code -= HANGUL_BASE
+    return CHOSUNG[code // 588], JUNGSUNG[(code % 588) // 28], JONGSUNG[code % 28]
+
+
+def extract_chosung(text: str | None) -> str:
+    result = []
+    for char in _compact(text):
+        syllable = _split_syllable(char)
+        result.append(syllable[0] if syllable else char)
+    return "".join(result)
+
+
+def decompose_jamo(text: str | None) -> str:
+    result = []
+    for char in _compact(text):
+        syllable = _split_syllable(char)
+        for jamo in syllable or (char,):
+            result.append(COMPOUND_JAMO.get(jamo, jamo))
+    return "".join(result)
+
+
+def is_chosung_query(text: str | None) -> bool:
+    compact = _compact(text)
+    return bool(compact) and all(char in CONSONANTS for char in compact)
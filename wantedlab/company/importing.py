@@ -0,0 +1,320 @@
+import codecs
+import csv
+import json
+import os
+from typing import BinaryIO, Iterable, Iterator, NamedTuple
+
+from django.db import connection
+
+from wantedlab.company.hangul import decompose_jamo, extract_chosung
+from wantedlab.company.models import Company, CompanyName, CompanyTag, Tag
+from wantedlab.company.text import normalize_name
+
+FORMATS = ("csv", "jsonl")
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class ImportedTag(NamedTuple):
+    number: int
+    name: str | None
+
+
+class ImportedCompany(NamedTuple):
+    line: int
+    name_ko: str | None
+    name_en: str | None
+    name_ja: str | None
+    tags: tuple[ImportedTag, ...]
+
+
+class Checkpoint(NamedTuple):
+    offset: int
+    line: int
+    size: int
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint | None":
+        try:
+            with open(path) as file:
+                return cls(**json.load(file))
+        except FileNotFoundError:
+            return None
+
+    def save(self, path: str) -> None:
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(self._asdict(), file)
+        os.replace(f"{path}.tmp", path)
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ImportFormatError(f"파일 형식을 알 수 없습니다: {path} (--format 으로 지정하세요)")
+
+
+def _name(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_tag(value, line: int) -> ImportedTag:
+    try:
+        if isinstance(value, dict):
+            return ImportedTag(int(value["number"]), _name(value.get("name")))
+        number, _, name = str(value).partition(":")
+        return ImportedTag(int(number), _name(name))
+    except (KeyError, TypeError, ValueError):
+        raise ImportFormatError(f"{line}번째 행의 태그 형식이 잘못되었습니다: {value!r}")
+
+
+def _company(line: int, record: dict, tags: Iterable) -> ImportedCompany:
+    company = ImportedCompany(
+        line=line,
+        name_ko=_name(record.get("name_ko")),
+        name_en=_name(record.get("name_en")),
+        name_ja=_name(record.get("name_ja")),
+        tags=tuple(_parse_tag(tag, line) for tag in tags),
+    )
+    if not (company.name_ko or company.name_en or company.name_ja):
+        raise ImportFormatError(f"{line}번째 행에 회사명이 없습니다.")
+    return company
+
+
+def _lines(stream: BinaryIO, position: list[int]) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for raw in iter(stream.readline, b""):
+        position[0] += len(raw)
+        yield decoder.decode(raw)
+
+
+def read_companies(
+    stream: BinaryIO, fmt: str, checkpoint: Checkpoint | None = None
+) -> Iterator[tuple[ImportedCompany, int]]:
+    """Yield (company, byte offset just past it). Streams line by line, so the
+    offset can be stored as a checkpoint and passed back in to resume."""
+    header = stream.readline() if fmt == "csv" else b""
+    position = [len(header)]
+    if checkpoint is not None:
+        stream.seek(checkpoint.offset)
+        position[0] = checkpoint.offset
+    line = checkpoint.line if checkpoint is not None else 0
+
+    if fmt == "csv":
+        fieldnames = next(csv.reader([header.decode("utf-8-sig")]), None)
+        if not fieldnames:
+            raise ImportFormatError("CSV 헤더가 없습니다.")
+        for record in csv.DictReader(_lines(stream, position), fieldnames=fieldnames):
+            line += 1
+            tags = [tag for tag in (record.get("tags") or "").split("|") if tag.strip()]
+            yield _company(line, record, tags), position[0]
+        return
+
+    for text in _lines(stream, position):
+        line += 1
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError:
+            raise ImportFormatError(f"{line}번째 행이 올바른 JSON 이 아닙니다.")
+        if not isinstance(record, dict):
+            raise ImportFormatError(f"{line}번째 행이 JSON 객체가 아닙니다.")
+        yield _company(line, record, record.get("tags") or []), position[0]
+
+
+def _tables() -> dict[str, str]:
+    quote = connection.ops.quote_name
+    return {
+        "company": quote(Company._meta.db_table),
+        "company_name": quote(CompanyName._meta.db_table),
+        "company_tag": quote(CompanyTag._meta.db_table),
+        "tag": quote(Tag._meta.db_table),
+    }
+
+
+CREATE_STAGING_SQL = (
+    """
+    CREATE TEMPORARY TABLE import_company (
+        line bigint PRIMARY KEY,
+        name_ko text,
+        name_en text,
+        name_ja text,
+        name_chosung text NOT NULL,
+        name_jamo text NOT NULL,
+        normalized_ko text NOT NULL,
+        normalized_en text NOT NULL,
+        normalized_ja text NOT NULL,
+        match_lang varchar(2) NOT NULL,
+        match_name text NOT NULL,
+        company_id bigint
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMPORARY TABLE import_company_tag (
+        line bigint NOT NULL,
+        tag_number integer NOT NULL,
+        tag_name text
+    ) ON COMMIT DROP
+    """,
+)
+
+# A tag given by number alone must already exist; a nameless Tag row would break the tag registry and snapshots.
+UNNAMED_NEW_TAG_SQL = """
+    SELECT s.line, s.tag_number FROM import_company_tag s
+    WHERE s.tag_name IS NULL
+        AND NOT EXISTS (SELECT 1 FROM {tag} t WHERE t.number = s.tag_number)
+        AND NOT EXISTS (SELECT 1 FROM import_company_tag n WHERE n.tag_number = s.tag_number AND n.tag_name IS NOT NULL)
+    ORDER BY s.line
+    LIMIT 1
+"""
+
+# Upsert keyed on unique_tag_number. The last name in the batch wins; one upsert cannot touch a row twice.
+# Returned ids (inserted or renamed) get their companies' snapshots rebuilt below.
+MERGE_TAGS_SQL = (
+    """
+    CREATE TEMPORARY TABLE import_tag ON COMMIT DROP AS
+    SELECT DISTINCT ON (tag_number) tag_number, tag_name FROM import_company_tag ORDER BY tag_number, line DESC
+    """,
+    """
+    CREATE TEMPORARY TABLE import_renamed_tag (id bigint PRIMARY KEY) ON COMMIT DROP
+    """,
+    """
+    WITH upserted AS (
+        INSERT INTO {tag} AS t (name, number, created_at, updated_at)
+        SELECT s.tag_name, s.tag_number, %(now)s, %(now)s FROM import_tag s
+        WHERE s.tag_name IS NOT NULL
+        ON CONFLICT (number) DO UPDATE SET name = EXCLUDED.name, updated_at = EXCLUDED.updated_at
+        WHERE t.name IS DISTINCT FROM EXCLUDED.name
+        RETURNING t.id
+    )
+    INSERT INTO import_renamed_tag (id) SELECT id FROM upserted
+    """,
+)
+
+# Companies have no natural key; an existing row is reused when all three names match. Candidates come from
+# companyname_normalized_idx on the row's first normalized name, so the company table is never scanned.
+MATCH_COMPANIES_SQL = """
+    UPDATE import_company s SET company_id = c.id
+    FROM {company_name} n
+    JOIN {company} c ON c.id = n.company_id
+    WHERE s.company_id IS NULL
+        AND n.normalized_name = s.match_name
+        AND n.lang = s.match_lang
+        AND COALESCE(c.name_ko, '') = COALESCE(s.name_ko, '')
+        AND COALESCE(c.name_en, '') = COALESCE(s.name_en, '')
+        AND COALESCE(c.name_ja, '') = COALESCE(s.name_ja, '')
+"""
+
+MERGE_COMPANIES_SQL = (
+    # The staging table has no statistics otherwise, and the planner may pick a hash join over all names.
+    "ANALYZE import_company",
+    MATCH_COMPANIES_SQL,
+    # New companies have no CompanyName rows yet, so their ids come back from the insert itself.
+    """
+    WITH inserted AS (
+        INSERT INTO {company} (
+            name_ko, name_en, name_ja, name_chosung, name_jamo, tag_snapshot, created_at, updated_at
+        )
+        SELECT DISTINCT ON (COALESCE(name_ko, ''), COALESCE(name_en, ''), COALESCE(name_ja, ''))
+            name_ko, name_en, name_ja, name_chosung, name_jamo, '[]'::jsonb, %(now)s, %(now)s
+        FROM import_company
+        WHERE company_id IS NULL
+        ORDER BY COALESCE(name_ko, ''), COALESCE(name_en, ''), COALESCE(name_ja, ''), line
+        RETURNING id, name_ko, name_en, name_ja
+    )
+    UPDATE import_company s SET company_id = i.id
+    FROM inserted i
+    WHERE s.company_id IS NULL
+        AND COALESCE(i.name_ko, '') = COALESCE(s.name_ko, '')
+        AND COALESCE(i.name_en, '') = COALESCE(s.name_en, '')
+        AND COALESCE(i.name_ja, '') = COALESCE(s.name_ja, '')
+    """,
+    """
+    INSERT INTO {company_name} (company_id, lang, normalized_name)
+    SELECT DISTINCT s.company_id, names.lang, names.normalized_name
+    FROM import_company s,
+        LATERAL (VALUES ('ko', s.normalized_ko), ('en', s.normalized_en), ('ja', s.normalized_ja))
+            AS names (lang, normalized_name)
+    WHERE names.normalized_name <> ''
+    ON CONFLICT (company_id, lang) DO NOTHING
+    """,
+    """
+    INSERT INTO {company_tag} (company_id, tag_id, created_at, updated_at)
+    SELECT DISTINCT s.company_id, t.id, %(now)s, %(now)s
+    FROM import_company_tag st
+    JOIN import_company s ON s.line = st.line
+    JOIN {tag} t ON t.number = st.tag_number
+    ON CONFLICT (company_id, tag_id) DO NOTHING
+    """,
+    """
+    UPDATE {company} c SET tag_snapshot = COALESCE(
+        (
+            SELECT jsonb_agg(jsonb_build_object('id', t.id, 'name', t.name, 'number', t.number) ORDER BY t.id)
+            FROM {company_tag} ct JOIN {tag} t ON t.id = ct.tag_id
+            WHERE ct.company_id = c.id
+        ),
+        '[]'::jsonb
+    )
+    WHERE c.id IN (
+        SELECT company_id FROM import_company
+        UNION
+        SELECT ct.company_id FROM {company_tag} ct JOIN import_renamed_tag r ON r.id = ct.tag_id
+    )
+    """,
+)
+
+
+def load_batch(companies: list[ImportedCompany], now) -> None:
+    """COPY one batch into session-local staging tables and merge it. Must run
+    inside a transaction; the staging tables are dropped on commit."""
+    tables = _tables()
+    params = {"now": now}
+    with connection.cursor() as cursor:
+        for statement in CREATE_STAGING_SQL:
+            cursor.execute(statement)
+        with cursor.copy(
+            "COPY import_company (line, name_ko, name_en, name_ja, name_chosung, name_jamo, "
+            "normalized_ko, normalized_en, normalized_ja, match_lang, match_name) FROM STDIN"
+        ) as copy:
+            for company in companies:
+                normalized = {
+                    CompanyName.Language.KO: normalize_name(company.name_ko),
+                    CompanyName.Language.EN: normalize_name(company.name_en),
+                    CompanyName.Language.JA: normalize_name(company.name_ja),
+                }
+                match_lang = next((lang for lang, name in normalized.items() if name), CompanyName.Language.KO)
+                copy.write_row(
+                    (
+                        company.line,
+                        company.name_ko,
+                        company.name_en,
+                        company.name_ja,
+                        extract_chosung(company.name_ko),
+                        decompose_jamo(company.name_ko),
+                        *normalized.values(),
+                        match_lang.value,
+                        normalized[match_lang],
+                    )
+                )
+        with cursor.copy("COPY import_company_tag (line, tag_number, tag_name) FROM STDIN") as copy:
+            for company in companies:
+                for tag in company.tags:
+                    copy.write_row((company.line, tag.number, tag.name))
+
+        cursor.execute(UNNAMED_NEW_TAG_SQL.format(**tables))
+        unnamed = cursor.fetchone()
+        if unnamed is not None:
+            line, number = unnamed
+            raise ImportFormatError(f"{line}번째 행의 태그 {number} 는 새 태그이므로 이름이 필요합니다. (번호:이름)")
+
+        for statement in (*MERGE_TAGS_SQL, *MERGE_COMPANIES_SQL):
+            sql = statement.format(**tables)
+            cursor.execute(sql, params if "%(now)s" in sql else None)
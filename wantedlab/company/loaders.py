@@ -0,0 +1,37 @@
+from typing import Iterable
+
+from wantedlab.company.models import CompanyTag
+from wantedlab.company.schemas import CompanyTagSchema
+
+
+class CompanyTagLoader:
+    def __init__(self) -> None:
+        self._queue: set[int] = set()
+        self._cache: dict[int, list[CompanyTagSchema]] = {}
+
+    def prime(self, company_ids: Iterable[int]) -> None:
+        self._queue.update(company_id for company_id in company_ids if company_id not in self._cache)
+
+    def dispatch(self) -> None:
+        if not self._queue:
+            return
+
+        company_ids, self._queue = self._queue, set()
+        tags_by_company: dict[int, list[CompanyTagSchema]] = {company_id: [] for company_id in company_ids}
+        rows = (
+            CompanyTag.objects.filter(company_id__in=company_ids)
+            .order_by("company_id", "tag_id")
+            .values_list("company_id", "tag_id", "tag__name", "tag__number")
+        )
+        for company_id, tag_id, name, number in rows:
+            tags_by_company[company_id].append(CompanyTagSchema(id=tag_id, name=name, number=number))
+        self._cache.update(tags_by_company)
+
+    def load(self, company_id: int) -> list[CompanyTagSchema]:
+        return self.load_many([company_id])[company_id]
+
+    def load_many(self, company_ids: Iterable[int]) -> dict[int, list[CompanyTagSchema]]:
+        company_ids = list(company_ids)
+        self.prime(company_ids)
+        self.dispatch()
+        return {company_id: self._cache[company_id] for company_id in company_ids}
@@ -0,0 +1,17 @@
+from django.db.models import CharField, Lookup
+from django.db.models.lookups import IContains
+
+
+@CharField.register_lookup
+class ILikeContains(Lookup):
+    lookup_name = "ilike_contains"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        rhs_params = ["%%%s%%" % connection.ops.prep_for_like_query(rhs_params[0])]
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
@@ -0,0 +1,92 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from wantedlab.company.cache import SCOPE_COMPANIES, SCOPE_TAGS, response_cache
+from wantedlab.company.importing import (
+    FORMATS,
+    Checkpoint,
+    ImportFormatError,
+    detect_format,
+    load_batch,
+    read_companies,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV/JSONL 회사 데이터를 스트리밍으로 읽어 COPY 로 적재합니다. "
+        "컬럼: name_ko, name_en, name_ja, tags (CSV 는 '번호:이름|번호:이름', JSONL 은 [{number, name}])"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="가져올 CSV 또는 JSONL 파일 경로")
+        parser.add_argument("--format", choices=FORMATS, help="파일 형식 (기본값: 확장자로 판단)")
+        parser.add_argument("--batch-size", type=int, default=20000, help="한 트랜잭션에 적재할 행 수")
+        parser.add_argument("--checkpoint", help="진행 상황 파일 경로 (기본값: <path>.checkpoint)")
+        parser.add_argument("--resume", action="store_true", help="진행 상황 파일의 위치부터 이어서 가져옵니다.")
+
+    def handle(
+        self, *args, path: str, format: str | None, batch_size: int, checkpoint: str | None, resume: bool, **options
+    ):
+        if connection.vendor != "postgresql":
+            raise CommandError("import_companies 는 PostgreSQL 에서만 사용할 수 있습니다.")
+
+        checkpoint_path = checkpoint or f"{path}.checkpoint"
+        size = os.path.getsize(path)
+        start = Checkpoint.load(checkpoint_path) if resume else None
+        if start is not None and start.size != size:
+            raise CommandError(f"{checkpoint_path} 가 다른 파일의 진행 상황입니다. (파일 크기 불일치)")
+        if start is not None:
+            self.stdout.write(f"{start.line} 번째 행 이후부터 이어서 가져옵니다.")
+
+        try:
+            fmt = format or detect_format(path)
+            with open(path, "rb") as stream:
+                total = self._import(read_companies(stream, fmt, start), batch_size, checkpoint_path, size)
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        response_cache.invalidate(SCOPE_COMPANIES, SCOPE_TAGS)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} 개 행 가져오기 완료. 실행 중인 서버의 검색 인덱스와 태그 비트맵은 주기적으로 갱신됩니다."
+            )
+        )
+        if response_cache.enabled and not response_cache.crosses_processes:
+            self.stdout.write(
+                self.style.WARNING(
+                    "응답 캐시가 프로세스 로컬(locmem)이라 실행 중인 서버의 캐시는 무효화되지 않습니다. "
+                    f"최대 {response_cache.ttl:g}초 동안 이전 응답이 보일 수 있습니다. (CACHE_BACKEND=file 등 공유 캐시 사용 시 즉시 반영)"
+                )
+            )
+
+    def _import(self, records, batch_size: int, checkpoint_path: str, size: int) -> int:
+        started = time.monotonic()
+        total = 0
+        batch = []
+        offset = 0
+        for company, offset in records:
+            batch.append(company)
+            if len(batch) >= batch_size:
+                total += self._load(batch, offset, checkpoint_path, size, started, total)
+                batch = []
+        if batch:
+            total += self._load(batch, offset, checkpoint_path, size, started, total)
+        return total
+
+    def _load(self, batch, offset: int, checkpoint_path: str, size: int, started: float, loaded: int) -> int:
+        with transaction.atomic():
+            load_batch(batch, timezone.now())
+        # Saved only after the commit, so a resumed run never skips uncommitted rows.
+        Checkpoint(offset=offset, line=batch[-1].line, size=size).save(checkpoint_path)
+
+        total = loaded + len(batch)
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"{total} 행 ({offset / size:.1%}) - {total / max(elapsed, 1e-6):,.0f} 행/초")
+        return len(batch)
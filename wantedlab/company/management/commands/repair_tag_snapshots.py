@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wantedlab.company.models import Company
+from wantedlab.company.snapshots import build_tag_snapshots, refresh_tag_snapshots
+
+
+class Command(BaseCommand):
+    help = "CompanyTag 기준으로 Company.tag_snapshot 을 검사하고 복구합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="복구하지 않고 불일치 여부만 검사합니다.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, check: bool, batch_size: int, **options):
+        checked = mismatched = 0
+        last_id = 0
+        while True:
+            batch = list(
+                Company.objects.filter(id__gt=last_id).order_by("id").values_list("id", "tag_snapshot")[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            expected = build_tag_snapshots(company_id for company_id, _ in batch)
+            stale = [company_id for company_id, snapshot in batch if snapshot != expected[company_id]]
+            checked += len(batch)
+            mismatched += len(stale)
+            if stale and not check:
+                refresh_tag_snapshots(stale)
+
+        if check and mismatched:
+            raise CommandError(f"{mismatched}/{checked} 개 회사의 태그 스냅샷이 CompanyTag 와 일치하지 않습니다.")
+        action = "검사" if check else "복구"
+        self.stdout.write(self.style.SUCCESS(f"{checked} 개 회사 {action} 완료 (불일치 {mismatched} 개)"))
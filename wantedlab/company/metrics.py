@@ -0,0 +1,256 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from wantedlab.company.slow_queries import slow_query_log
+
+
+class RequestMetrics:
+    """Mutable per-request counters. sync_to_async copies the context into the
+    worker thread, so DB work done there updates the same object."""
+
+    __slots__ = ("scope", "db_queries", "db_seconds", "wait_seconds", "serialize_seconds")
+
+    def __init__(self, scope: dict | None = None) -> None:
+        self.scope = scope
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def record_executor_wait(seconds: float) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.wait_seconds += seconds
+
+
+@contextmanager
+def measure_serialization() -> Iterator[None]:
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.serialize_seconds += time.perf_counter() - started
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None and not slow_query_log.enabled:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        result = execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        if metrics is not None:
+            metrics.db_queries += 1
+            metrics.db_seconds += elapsed
+    # Captured only after success and outside the timing above, so EXPLAIN is never billed to the request.
+    if slow_query_log.enabled and elapsed >= slow_query_log.threshold:
+        scope = metrics.scope if metrics is not None else None
+        route = _route_label(scope) if scope is not None else None
+        slow_query_log.capture(sql, params, many, context, elapsed, scope, route)
+    return result
+
+
+@receiver(connection_created)
+def install_db_execute_wrapper(sender, connection, **kwargs) -> None:
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+INF_BOUND = 'le="+Inf"'
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float], labels: tuple[str, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        bounds = [f'le="{bound}"' for bound in self.buckets]
+        for labels, counts, total, count in sorted(series):
+            for bound, bucket_count in zip(bounds, counts):
+                yield f"{self.name}_bucket{_format_labels(self.labels, labels, bound)} {bucket_count}"
+            yield f"{self.name}_bucket{_format_labels(self.labels, labels, INF_BOUND)} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labels, labels)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labels, labels)} {count}"
+
+
+SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROUTE_LABELS = ("method", "route")
+
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Time to the last response byte.", SECONDS, ROUTE_LABELS)
+DB_SECONDS = Histogram("http_request_db_seconds", "Time spent executing SQL per request.", SECONDS, ROUTE_LABELS)
+DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements per request.", (0, 1, 2, 3, 5, 10, 20, 50, 100), ROUTE_LABELS
+)
+WAIT_SECONDS = Histogram(
+    "http_request_db_executor_wait_seconds",
+    "Time spent waiting for a DB executor thread per request.",
+    SECONDS,
+    ROUTE_LABELS,
+)
+SERIALIZE_SECONDS = Histogram(
+    "http_request_serialize_seconds", "Time spent encoding response JSON per request.", SECONDS, ROUTE_LABELS
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes", "Response body size.", (256, 1024, 4096, 16384, 65536, 262144, 1048576), ROUTE_LABELS
+)
+HISTOGRAMS = (REQUEST_SECONDS, DB_SECONDS, DB_QUERIES, WAIT_SECONDS, SERIALIZE_SECONDS, RESPONSE_BYTES)
+
+
+def server_timing(metrics: RequestMetrics, elapsed: float) -> bytes:
+    return (
+        f'db;dur={metrics.db_seconds * 1000:.2f};desc="{metrics.db_queries} queries", '
+        f"wait;dur={metrics.wait_seconds * 1000:.2f}, "
+        f"serialize;dur={metrics.serialize_seconds * 1000:.2f}, "
+        f"app;dur={elapsed * 1000:.2f}"
+    ).encode()
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    # Mounted apps (the Django admin) are labelled by their mount path, and unmatched paths share one label,
+    # so arbitrary URLs can't grow the series count.
+    return getattr(route, "path_format", None) or scope.get("root_path") or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Collects DB, executor-wait and serialization time per request, adds them
+    as a Server-Timing header and feeds the /metrics histograms.
+
+    The header goes out with the first body chunk, so for streaming responses
+    it only covers the work done before that chunk."""
+
+    def __init__(self, app, exclude_paths: tuple[str, ...] = ("/metrics",)) -> None:
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            return await self.app(scope, receive, send)
+
+        metrics = RequestMetrics(scope)
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        pending_start = None
+        size = 0
+
+        async def send_with_timing(message) -> None:
+            nonlocal pending_start, size
+            if message["type"] == "http.response.start":
+                pending_start = message
+                return
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if pending_start is not None:
+                    start, pending_start = pending_start, None
+                    if settings.REQUEST_METRICS_SERVER_TIMING:
+                        header = server_timing(metrics, time.perf_counter() - started)
+                        start = {**start, "headers": [*start.get("headers", []), (b"server-timing", header)]}
+                    await send(start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            labels = (scope["method"], _route_label(scope))
+            REQUEST_SECONDS.observe(labels, time.perf_counter() - started)
+            DB_SECONDS.observe(labels, metrics.db_seconds)
+            DB_QUERIES.observe(labels, metrics.db_queries)
+            WAIT_SECONDS.observe(labels, metrics.wait_seconds)
+            SERIALIZE_SECONDS.observe(labels, metrics.serialize_seconds)
+            RESPONSE_BYTES.observe(labels, size)
+
+
+def _gauges(name: str, documentation: str, kind: str, label: str, values: dict) -> Iterator[str]:
+    yield f"# HELP {name} {documentation}"
+    yield f"# TYPE {name} {kind}"
+    for key, value in sorted(values.items()):
+        yield f"{name}{_format_labels((label,), (key,))} {value}"
+
+
+def render_metrics(executor: dict, pools: dict[str, dict[str, int]]) -> str:
+    """Prometheus text exposition of the request histograms plus the DB executor
+    and connection pool counters."""
+    lines: list[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+
+    export = executor.get("export", {"max_workers": 0, "calls": {}})
+    # Export labels (the streamed generators) never run on the API executor, so the two merge without clashes.
+    calls = {**executor["calls"], **export["calls"]}
+    for name, field, kind, documentation in (
+        ("db_executor_calls_total", "calls", "counter", "Completed DB executor calls."),
+        ("db_executor_errors_total", "errors", "counter", "DB executor calls that raised."),
+        ("db_executor_queued", "queued", "gauge", "DB executor calls waiting for a thread."),
+        ("db_executor_in_flight", "in_flight", "gauge", "DB executor calls running."),
+        ("db_executor_wait_seconds_total", "wait_seconds_total", "counter", "Time DB executor calls waited."),
+        ("db_executor_run_seconds_total", "run_seconds_total", "counter", "Time DB executor calls ran."),
+    ):
+        values = {label: stats[field] for label, stats in calls.items()}
+        lines.extend(_gauges(name, documentation, kind, "function", values))
+    lines.extend(
+        _gauges(
+            "db_executor_max_workers",
+            "DB executor threads.",
+            "gauge",
+            "executor",
+            {"company": executor["max_workers"], "export": export["max_workers"]},
+        )
+    )
+
+    pool_fields = sorted({field for stats in pools.values() for field in stats})
+    for field in pool_fields:
+        values = {alias: stats[field] for alias, stats in pools.items() if field in stats}
+        lines.extend(_gauges(f"db_pool_{field}", f"psycopg pool {field}.", "gauge", "alias", values))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.2 on 2025-06-15 14:40
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+from wantedlab.company.hangul import decompose_jamo, extract_chosung
+
+
+def populate_hangul_columns(apps, schema_editor):
+    Company = apps.get_model('company', 'Company')
+    batch = []
+    for company in Company.objects.only('id', 'name_ko').iterator(chunk_size=2000):
+        company.name_chosung = extract_chosung(company.name_ko)
+        company.name_jamo = decompose_jamo(company.name_ko)
+        batch.append(company)
+        if len(batch) >= 2000:
+            Company.objects.bulk_update(batch, ['name_chosung', 'name_jamo'])
+            batch = []
+    if batch:
+        Company.objects.bulk_update(batch, ['name_chosung', 'name_jamo'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_company_name_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='name_chosung',
+            field=models.CharField(blank=True, default='', editable=False, help_text='한글 회사명 초성', max_length=150),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='name_jamo',
+            field=models.CharField(blank=True, default='', editable=False, help_text='한글 회사명 자모', max_length=1000),
+        ),
+        migrations.RunPython(populate_hangul_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='company',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name_chosung'], name='company_name_chosung_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='company',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name_jamo'], name='company_name_jamo_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.2 on 2025-06-16 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0003_company_name_chosung_name_jamo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companytag',
+            index=models.Index(fields=['tag', 'company'], name='companytag_tag_company_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.2 on 2025-06-17 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from wantedlab.company.text import normalize_name
+
+
+def populate_company_names(apps, schema_editor):
+    Company = apps.get_model('company', 'Company')
+    CompanyName = apps.get_model('company', 'CompanyName')
+    batch = []
+    for company in Company.objects.only('id', 'name_ko', 'name_en', 'name_ja').iterator(chunk_size=2000):
+        for lang, name in (('ko', company.name_ko), ('en', company.name_en), ('ja', company.name_ja)):
+            normalized_name = normalize_name(name)
+            if normalized_name:
+                batch.append(CompanyName(company_id=company.id, lang=lang, normalized_name=normalized_name))
+        if len(batch) >= 5000:
+            CompanyName.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        CompanyName.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0004_companytag_tag_company_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyName',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lang', models.CharField(choices=[('ko', '한국어'), ('en', '영어'), ('ja', '일본어')], help_text='회사명 언어', max_length=2)),
+                ('normalized_name', models.CharField(help_text='정규화된 회사명 (NFKC, casefold, 공백 정리)', max_length=600)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='names', to='company.company')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['normalized_name', 'company'], name='companyname_normalized_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company', 'lang'), name='unique_company_name_lang')],
+            },
+        ),
+        migrations.RunPython(populate_company_names, migrations.RunPython.noop),
+    ]
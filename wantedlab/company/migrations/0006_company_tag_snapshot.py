@@ -0,0 +1,39 @@
+# Generated by Django 5.2.2 on 2025-06-18 10:48
+
+from django.db import migrations, models
+
+
+def populate_tag_snapshots(apps, schema_editor):
+    Company = apps.get_model('company', 'Company')
+    CompanyTag = apps.get_model('company', 'CompanyTag')
+    company_ids = list(Company.objects.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(company_ids), 2000):
+        chunk = company_ids[start : start + 2000]
+        snapshots = {company_id: [] for company_id in chunk}
+        rows = (
+            CompanyTag.objects.filter(company_id__in=chunk)
+            .order_by('company_id', 'tag_id')
+            .values_list('company_id', 'tag_id', 'tag__name', 'tag__number')
+        )
+        for company_id, tag_id, name, number in rows:
+            snapshots[company_id].append({'id': tag_id, 'name': name, 'number': number})
+        Company.objects.bulk_update(
+            [Company(id=company_id, tag_snapshot=snapshot) for company_id, snapshot in snapshots.items()],
+            ['tag_snapshot'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0005_companyname'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='tag_snapshot',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='태그 스냅샷 [{id, name, number}] (CompanyTag 에서 파생)'),
+        ),
+        migrations.RunPython(populate_tag_snapshots, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,21 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
+
+from wantedlab.company.hangul import decompose_jamo, extract_chosung
+from wantedlab.company.text import normalize_name
 
 
 class Company(models.Model):
     name_ko = models.CharField(max_length=150, blank=True, null=True, help_text="한글 회사명")
     name_en = models.CharField(max_length=300, blank=True, null=True, help_text="영문 회사명")
     name_ja = models.CharField(max_length=300, blank=True, null=True, help_text="일본어 회사명")
+    name_chosung = models.CharField(
+        max_length=150, blank=True, default="", editable=False, help_text="한글 회사명 초성"
+    )
+    name_jamo = models.CharField(max_length=1000, blank=True, default="", editable=False, help_text="한글 회사명 자모")
+    tag_snapshot = models.JSONField(
+        default=list, blank=True, editable=False, help_text="태그 스냅샷 [{id, name, number}] (CompanyTag 에서 파생)"
+    )
     tags = models.ManyToManyField(
         "Tag",
         related_name="companies",
@@ -14,9 +25,77 @@ class Company(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=["name_ko"], opclasses=["gin_trgm_ops"], name="company_name_ko_trgm"),
+            GinIndex(fields=["name_en"], opclasses=["gin_trgm_ops"], name="company_name_en_trgm"),
+            GinIndex(fields=["name_ja"], opclasses=["gin_trgm_ops"], name="company_name_ja_trgm"),
+            GinIndex(fields=["name_chosung"], opclasses=["gin_trgm_ops"], name="company_name_chosung_trgm"),
+            GinIndex(fields=["name_jamo"], opclasses=["gin_trgm_ops"], name="company_name_jamo_trgm"),
+            # Range scans from the search index's periodic refresh.
+            models.Index(fields=["updated_at"], name="company_updated_at_idx"),
+        ]
+
     def __str__(self) -> str:
         return self.name_ko or self.name_en or self.name_ja
 
+    def save(self, *args, **kwargs) -> None:
+        self.name_chosung = extract_chosung(self.name_ko)
+        self.name_jamo = decompose_jamo(self.name_ko)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name_ko" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "name_chosung", "name_jamo"}
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            self.sync_names()
+
+    def normalized_names(self) -> dict[str, str]:
+        names = {
+            CompanyName.Language.KO: self.name_ko,
+            CompanyName.Language.EN: self.name_en,
+            CompanyName.Language.JA: self.name_ja,
+        }
+        normalized = {lang: normalize_name(name) for lang, name in names.items()}
+        return {lang: name for lang, name in normalized.items() if name}
+
+    def sync_names(self) -> None:
+        expected = self.normalized_names()
+        current = dict(self.names.values_list("lang", "normalized_name"))
+        if current == expected:
+            return
+
+        self.names.exclude(lang__in=expected).delete()
+        for lang, normalized_name in expected.items():
+            if current.get(lang) != normalized_name:
+                CompanyName.objects.update_or_create(
+                    company=self, lang=lang, defaults={"normalized_name": normalized_name}
+                )
+
+
+class CompanyName(models.Model):
+    class Language(models.TextChoices):
+        KO = "ko", "한국어"
+        EN = "en", "영어"
+        JA = "ja", "일본어"
+
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="names")
+    lang = models.CharField(max_length=2, choices=Language.choices, help_text="회사명 언어")
+    normalized_name = models.CharField(max_length=600, help_text="정규화된 회사명 (NFKC, casefold, 공백 정리)")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "lang"],
+                name="unique_company_name_lang",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["normalized_name", "company"], name="companyname_normalized_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.company_id} ({self.lang}) - {self.normalized_name}"
+
 
 class Tag(models.Model):
     name = models.CharField(max_length=50, blank=True, null=True, help_text="태그 이름")
@@ -51,3 +130,6 @@ class CompanyTag(models.Model):
                 name="unique_company_tag",
             )
         ]
+        indexes = [
+            models.Index(fields=["tag", "company"], name="companytag_tag_company_idx"),
+        ]
@@ -0,0 +1,97 @@
+import json
+from typing import Callable, NamedTuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from wantedlab.company.cache import company_scope, tag_scope
+from wantedlab.company.models import Company, CompanyTag, Tag
+from wantedlab.company.signals import invalidate_on_commit
+from wantedlab.company.tag_bitmaps import tag_bitmaps
+
+
+class TagMutation(NamedTuple):
+    company_exists: bool
+    tag_number: int | None
+    changed: bool
+    tag_snapshot: list[dict]
+
+
+def _tables() -> dict[str, str]:
+    quote = connection.ops.quote_name
+    return {
+        "company": quote(Company._meta.db_table),
+        "tag": quote(Tag._meta.db_table),
+        "company_tag": quote(CompanyTag._meta.db_table),
+    }
+
+
+# The company row is locked so snapshot rebuilds for the same company cannot interleave.
+MUTATION_SQL = """
+WITH company AS (
+    SELECT id, tag_snapshot FROM {company} WHERE id = %(company_id)s FOR UPDATE
+), tag AS (
+    SELECT id, number FROM {tag} WHERE id = %(tag_id)s
+), changed AS (
+    {statement}
+)
+SELECT
+    EXISTS (SELECT 1 FROM company),
+    (SELECT number FROM tag),
+    EXISTS (SELECT 1 FROM changed),
+    (SELECT tag_snapshot FROM company)
+"""
+
+INSERT_SQL = """
+    INSERT INTO {company_tag} (company_id, tag_id, created_at, updated_at)
+    SELECT company.id, tag.id, %(now)s, %(now)s FROM company CROSS JOIN tag
+    ON CONFLICT (company_id, tag_id) DO NOTHING
+    RETURNING 1
+"""
+
+DELETE_SQL = """
+    DELETE FROM {company_tag}
+    WHERE company_id IN (SELECT id FROM company) AND tag_id IN (SELECT id FROM tag)
+    RETURNING 1
+"""
+
+REFRESH_SNAPSHOT_SQL = """
+UPDATE {company} SET tag_snapshot = COALESCE(
+    (
+        SELECT jsonb_agg(jsonb_build_object('id', t.id, 'name', t.name, 'number', t.number) ORDER BY t.id)
+        FROM {company_tag} ct JOIN {tag} t ON t.id = ct.tag_id
+        WHERE ct.company_id = %(company_id)s
+    ),
+    '[]'::jsonb
+)
+WHERE id = %(company_id)s
+RETURNING tag_snapshot
+"""
+
+
+def _load_json(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _mutate(statement: str, company_id: int, tag_id: int, on_changed: Callable[[int, int], None]) -> TagMutation:
+    tables = _tables()
+    params = {"company_id": company_id, "tag_id": tag_id, "now": timezone.now()}
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(MUTATION_SQL.format(statement=statement.format(**tables), **tables), params)
+        company_exists, tag_number, changed, tag_snapshot = cursor.fetchone()
+        if changed:
+            cursor.execute(REFRESH_SNAPSHOT_SQL.format(**tables), params)
+            (tag_snapshot,) = cursor.fetchone()
+            # Raw SQL bypasses the CompanyTag signals, so invalidate here.
+            invalidate_on_commit(company_scope(company_id), tag_scope(tag_number))
+            transaction.on_commit(lambda: on_changed(company_id, tag_id))
+
+    return TagMutation(company_exists, tag_number, changed, _load_json(tag_snapshot) or [])
+
+
+def insert_company_tag(company_id: int, tag_id: int) -> TagMutation:
+    return _mutate(INSERT_SQL, company_id, tag_id, tag_bitmaps.add)
+
+
+def delete_company_tag(company_id: int, tag_id: int) -> TagMutation:
+    return _mutate(DELETE_SQL, company_id, tag_id, tag_bitmaps.remove)
@@ -0,0 +1,105 @@
+import base64
+import binascii
+import json
+from bisect import bisect_right
+from typing import Any, Callable, Generic, NamedTuple, Sequence, TypeVar
+
+from django.db.models import Q, QuerySet
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+
+class Page(NamedTuple, Generic[T]):
+    rows: list[T]
+    next_cursor: str | None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(list(values), separators=(",", ":"), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+CursorType = type | tuple[type, ...]
+
+
+def decode_cursor(cursor: str, types: Sequence[CursorType]) -> list[Any]:
+    """Decode a cursor holding one value per entry of ``types``, each an instance of it."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        # bool is an int subclass but never a valid key.
+        or not all(isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(values, types))
+    ):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return values
+
+
+def _value_type(value: Any) -> CursorType:
+    # Float keys (trigram similarity) are compared numerically, so an int is as good.
+    return (int, float) if isinstance(value, float) else type(value)
+
+
+def _field_type(queryset: QuerySet, name: str) -> CursorType:
+    expression = queryset.query.annotations.get(name)
+    field = expression.output_field if expression is not None else queryset.model._meta.get_field(name)
+    internal_type = field.get_internal_type()
+    if internal_type in ("FloatField", "DecimalField"):
+        return int, float
+    if internal_type.endswith(("IntegerField", "AutoField")):
+        return int
+    return str
+
+
+def keyset_filter(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip("-")
+        operator = "lt" if field.startswith("-") else "gt"
+        step = Q(**{f"{name}__{operator}": values[position]})
+        for previous, value in zip(ordering[:position], values):
+            step &= Q(**{previous.lstrip("-"): value})
+        condition |= step
+    return condition
+
+
+def _page(rows: list[T], limit: int, sort_key: Callable[[T], Sequence[Any]]) -> Page[T]:
+    if len(rows) <= limit:
+        return Page(rows, None)
+    rows = rows[:limit]
+    return Page(rows, encode_cursor(sort_key(rows[-1])))
+
+
+def _field_value(row: Any, name: str) -> Any:
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def paginate_queryset(queryset: QuerySet, offset: int, limit: int, cursor: str | None) -> Page:
+    ordering = [str(field) for field in queryset.query.order_by]
+    if cursor is not None:
+        types = [_field_type(queryset, field.lstrip("-")) for field in ordering]
+        queryset = queryset.filter(keyset_filter(ordering, decode_cursor(cursor, types)))
+        offset = 0
+
+    rows = list(queryset[offset : offset + limit + 1])
+    return _page(rows, limit, lambda row: [_field_value(row, field.lstrip("-")) for field in ordering])
+
+
+def paginate_sequence(
+    items: Sequence[T],
+    offset: int,
+    limit: int,
+    cursor: str | None,
+    sort_key: Callable[[T], Sequence[Any]],
+) -> Page[T]:
+    if not items:
+        return Page([], None)
+    if cursor is not None:
+        after = decode_cursor(cursor, [_value_type(value) for value in sort_key(items[0])])
+        offset = bisect_right(items, after, key=lambda item: list(sort_key(item)))
+
+    return _page(list(items[offset : offset + limit + 1]), limit, sort_key)
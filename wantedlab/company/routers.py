@@ -1,12 +1,17 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Body, HTTPException, Path, Query, status
+from fastapi.responses import Response, StreamingResponse
 
 from wantedlab.company.schemas import (
+    AutocompleteMode,
+    BulkTagRequest,
+    BulkTagResponse,
     CompanySchema,
     PaginatedAutocompleteResponse,
     PaginatedCompanyResponse,
     TagUpdateResponse,
+    TotalMode,
 )
 
 from .views import CompanyView
@@ -22,7 +27,8 @@ router = APIRouter(
     "/search/keyword",
     response_model=PaginatedAutocompleteResponse,
     summary="회사 자동완성 검색",
-    description="회사 이름으로 자동완성 검색을 수행합니다. 페이지네이션을 지원합니다.",
+    description="회사 이름으로 자동완성 검색을 수행합니다. offset 또는 cursor 페이지네이션을 지원하며, "
+    "facets 를 지정하면 검색된 회사들의 태그별 개수를 함께 반환합니다.",
     responses={
         200: {
             "description": "성공적으로 회사 목록을 반환",
@@ -33,6 +39,8 @@ router = APIRouter(
                         "total": 2,
                         "offset": 0,
                         "limit": 10,
+                        "has_more": False,
+                        "next_cursor": None,
                     }
                 }
             },
@@ -43,12 +51,36 @@ async def list_companies_autocomplete(
     company_name: Annotated[str, Query(description="검색할 회사 이름 (부분 일치)")],
     offset: Annotated[int, Query(ge=0, description="건너뛸 항목 수")] = 0,
     limit: Annotated[int, Query(ge=1, le=100, description="반환할 최대 항목 수")] = 10,
-) -> PaginatedAutocompleteResponse:
-    return await CompanyView.list_companies_autocomplete(
+    mode: Annotated[
+        AutocompleteMode,
+        Query(
+            description="검색 방식 (default: 메모리 인덱스, trigram: pg_trgm 인덱스 + 유사도 정렬, "
+            "chosung: 한글 초성/자모 검색)"
+        ),
+    ] = AutocompleteMode.DEFAULT,
+    cursor: Annotated[str | None, Query(description="이전 응답의 next_cursor (지정 시 offset 무시)")] = None,
+    total_mode: Annotated[
+        TotalMode,
+        Query(description="전체 개수 계산 방식 (exact: 정확한 개수, estimate: 추정치, none: 계산하지 않음)"),
+    ] = TotalMode.EXACT,
+    facets: Annotated[
+        int,
+        Query(
+            ge=0, le=50, description="검색된 회사들의 태그별 개수를 많은 순으로 함께 반환할 개수 (0: 반환하지 않음)"
+        ),
+    ] = 0,
+) -> Response:
+    payload = await CompanyView.list_companies_autocomplete(
         company_name=company_name,
         offset=offset,
         limit=limit,
+        mode=mode,
+        cursor=cursor,
+        total_mode=total_mode,
+        facets=facets,
+        as_json=True,
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get(
@@ -67,28 +99,100 @@ async def list_companies_autocomplete(
 async def search_company_by_name(
     name: Annotated[str, Query(min_length=1, description="검색할 회사의 정확한 이름")],
 ):
-    company = await CompanyView.get_company_by_name(name)
-    if not company:
+    payload = await CompanyView.get_company_by_name(name, as_json=True)
+    if payload == b"null":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Company not found")
-    return company
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get(
     "/tag/{tag}",
     response_model=PaginatedCompanyResponse,
     summary="태그로 회사 검색",
-    description="특정 태그가 지정된 모든 회사를 검색합니다. 페이지네이션을 지원합니다.",
+    description="특정 태그가 지정된 모든 회사를 검색합니다. offset 또는 cursor 페이지네이션을 지원합니다.",
 )
 async def list_companies_by_tag(
     tag: Annotated[str, Path(description="검색할 태그")],
     offset: Annotated[int, Query(ge=0, description="건너뛸 항목 수")] = 0,
     limit: Annotated[int, Query(ge=1, le=100, description="반환할 최대 항목 수")] = 10,
-) -> PaginatedCompanyResponse:
-    return await CompanyView.list_companies_company_by_tag(
+    cursor: Annotated[str | None, Query(description="이전 응답의 next_cursor (지정 시 offset 무시)")] = None,
+    total_mode: Annotated[
+        TotalMode,
+        Query(description="전체 개수 계산 방식 (exact: 정확한 개수, estimate: 추정치, none: 계산하지 않음)"),
+    ] = TotalMode.EXACT,
+) -> Response:
+    payload = await CompanyView.list_companies_company_by_tag(
         full_tag=tag,
         offset=offset,
         limit=limit,
+        cursor=cursor,
+        total_mode=total_mode,
+        as_json=True,
     )
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get(
+    "/tags/query",
+    response_model=PaginatedCompanyResponse,
+    summary="태그 조합으로 회사 검색",
+    description="all 의 태그를 모두 가지고, any 의 태그 중 하나 이상을 가지며, none 의 태그는 하나도 없는 회사를 "
+    "ID 순서로 반환합니다. offset 또는 cursor 페이지네이션을 지원합니다.",
+    responses={
+        400: {"description": "태그를 하나도 지정하지 않았거나 잘못된 태그 형식"},
+        404: {"description": "태그를 찾을 수 없음"},
+    },
+)
+async def query_companies_by_tags(
+    all_tags: Annotated[list[str], Query(alias="all", description="모두 가져야 하는 태그 (반복 가능)")] = [],
+    any_tags: Annotated[list[str], Query(alias="any", description="하나 이상 가져야 하는 태그 (반복 가능)")] = [],
+    none_tags: Annotated[list[str], Query(alias="none", description="가지면 안 되는 태그 (반복 가능)")] = [],
+    offset: Annotated[int, Query(ge=0, description="건너뛸 항목 수")] = 0,
+    limit: Annotated[int, Query(ge=1, le=100, description="반환할 최대 항목 수")] = 10,
+    cursor: Annotated[str | None, Query(description="이전 응답의 next_cursor (지정 시 offset 무시)")] = None,
+) -> Response:
+    payload = await CompanyView.query_companies_by_tags(
+        all_tags=all_tags,
+        any_tags=any_tags,
+        none_tags=none_tags,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        as_json=True,
+    )
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="회사 전체 내보내기",
+    description="모든 회사(또는 특정 태그가 지정된 회사)를 ID 순서로 한 줄에 하나씩 NDJSON 으로 스트리밍합니다.",
+    responses={
+        200: {"description": "회사 정보 NDJSON 스트림", "content": {"application/x-ndjson": {}}},
+        404: {"description": "태그를 찾을 수 없음"},
+    },
+)
+async def export_companies(
+    tag: Annotated[str | None, Query(description="내보낼 회사의 태그 (지정하지 않으면 전체)")] = None,
+) -> StreamingResponse:
+    chunks = await CompanyView.export_companies(full_tag=tag)
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+
+@router.post(
+    "/tags/bulk",
+    response_model=BulkTagResponse,
+    status_code=status.HTTP_200_OK,
+    summary="회사 태그 일괄 추가/제거",
+    description="여러 회사에 여러 태그를 한 트랜잭션으로 추가하거나 제거하고, 항목별 처리 결과를 반환합니다. "
+    "같은 (회사, 태그) 쌍이 추가와 제거에 모두 있으면 제거 후 추가합니다.",
+    responses={400: {"description": "처리할 수 있는 항목 수 초과"}},
+)
+async def bulk_update_company_tags(
+    request: Annotated[BulkTagRequest, Body(description="추가/제거할 회사별 태그 ID 목록")],
+) -> BulkTagResponse:
+    return await CompanyView.bulk_update_company_tags(request)
 
 
 @router.post(
@@ -0,0 +1,183 @@
+import itertools
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "read_primary_until"
+PIN_HEADER = b"x-read-primary-until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class RequestRouting:
+    """Per-request routing state, shared with the DB worker threads through the
+    copied context like RequestMetrics."""
+
+    __slots__ = ("pinned", "wrote", "replica", "replica_chosen")
+
+    def __init__(self, pinned: bool = False) -> None:
+        self.pinned = pinned
+        self.wrote = False
+        # Chosen on the first read and kept, so a count and its page come from the same replica.
+        self.replica: str | None = None
+        self.replica_chosen = False
+
+
+_current: ContextVar[RequestRouting | None] = ContextVar("request_routing", default=None)
+
+
+def record_primary_write() -> None:
+    # The rest of the request, and the client's requests for the pin window, read from the primary.
+    routing = _current.get()
+    if routing is not None:
+        routing.pinned = routing.wrote = True
+
+
+def reads_pinned() -> bool:
+    routing = _current.get()
+    return routing is not None and routing.pinned
+
+
+def reads_from_replica() -> bool:
+    routing = _current.get()
+    return routing is not None and not routing.pinned and routing.replica is not None
+
+
+class ReplicaSet:
+    """Replica aliases handed out round-robin, skipping the ones whose last
+    health check failed."""
+
+    def __init__(self, aliases: list[str] | None = None) -> None:
+        self.aliases = list(settings.DB_REPLICA_ALIASES if aliases is None else aliases)
+        self._lock = threading.Lock()
+        self._healthy = list(self.aliases)
+        self._turn = itertools.count()
+
+    def choose(self) -> str | None:
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def mark(self, alias: str, healthy: bool) -> None:
+        with self._lock:
+            current = set(self._healthy)
+            if healthy == (alias in current):
+                return
+            if healthy:
+                current.add(alias)
+            else:
+                current.discard(alias)
+            self._healthy = [other for other in self.aliases if other in current]
+        if healthy:
+            logger.info("replica %s is healthy again", alias)
+        else:
+            logger.warning("replica %s failed its health check; reads go to the other replicas or the primary", alias)
+
+    def check(self) -> dict[str, bool]:
+        """Run SELECT 1 on every replica from the calling thread and update the healthy set."""
+        status = {}
+        for alias in self.aliases:
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                status[alias] = True
+            except Exception:
+                status[alias] = False
+                connections[alias].close()
+            self.mark(alias, status[alias])
+        return status
+
+    def status(self) -> dict[str, bool]:
+        healthy = self._healthy
+        return {alias: alias in healthy for alias in self.aliases}
+
+
+replicas = ReplicaSet()
+
+
+class ReplicaRouter:
+    """Reads made while serving an API request go to a healthy replica. Writes,
+    reads inside a transaction, pinned clients and everything outside an API
+    request (admin, management commands, warmup) use the primary."""
+
+    def db_for_read(self, model, **hints) -> str | None:
+        routing = _current.get()
+        if routing is None or routing.pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        if not routing.replica_chosen:
+            routing.replica, routing.replica_chosen = replicas.choose(), True
+        return routing.replica
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool:
+        return db == DEFAULT_DB_ALIAS
+
+
+def _pinned_until(scope) -> float:
+    values = []
+    for name, value in scope.get("headers", []):
+        if name == PIN_HEADER:
+            values.append(value.decode("latin-1"))
+        elif name == b"cookie":
+            try:
+                morsel = SimpleCookie(value.decode("latin-1")).get(PIN_COOKIE)
+            except CookieError:
+                continue
+            if morsel is not None:
+                values.append(morsel.value)
+
+    until = 0.0
+    for value in values:
+        try:
+            until = max(until, float(value))
+        except ValueError:
+            continue
+    # The value comes from the client; never honour more than one pin window from now.
+    return min(until, time.time() + settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+class ReadYourWritesMiddleware:
+    """Pins reads to the primary for unsafe methods and for clients that wrote
+    recently. A request that wrote gets the pin deadline back as a cookie and an
+    X-Read-Primary-Until header; clients without cookies echo the header.
+
+    Only paths under ``path_prefix`` get routing state. Everything else, such as
+    the mounted Django admin and its session lookups, reads from the primary."""
+
+    def __init__(self, app, path_prefix: str = "/") -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            return await self.app(scope, receive, send)
+
+        routing = RequestRouting(pinned=scope["method"] not in SAFE_METHODS or _pinned_until(scope) > time.time())
+        token = _current.set(routing)
+
+        async def send_with_pin(message) -> None:
+            if message["type"] == "http.response.start" and routing.wrote:
+                window = settings.DB_READ_YOUR_WRITES_SECONDS
+                until = f"{time.time() + window:.3f}"
+                cookie = f"{PIN_COOKIE}={until}; Max-Age={int(window) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                headers = [*message.get("headers", []), (b"set-cookie", cookie.encode()), (PIN_HEADER, until.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _current.reset(token)
@@ -1,4 +1,18 @@
-from pydantic import BaseModel
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class AutocompleteMode(str, Enum):
+    DEFAULT = "default"
+    TRIGRAM = "trigram"
+    CHOSUNG = "chosung"
+
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
 
 
 class AutocompletedCompanySchema(BaseModel):
@@ -8,19 +22,32 @@ class AutocompletedCompanySchema(BaseModel):
     name_ja: str | None
 
 
-class PaginatedAutocompleteResponse(BaseModel):
-    items: list[AutocompletedCompanySchema]
-    total: int
-    limit: int
-    offset: int
-
-
 class CompanyTagSchema(BaseModel):
     id: int
     name: str
     number: int
 
 
+class TagFacetSchema(CompanyTagSchema):
+    count: int
+
+
+class TagFacetsSchema(BaseModel):
+    items: list[TagFacetSchema]
+    matched: int
+    sampled: bool = False
+
+
+class PaginatedAutocompleteResponse(BaseModel):
+    items: list[AutocompletedCompanySchema]
+    total: int | None
+    limit: int
+    offset: int
+    has_more: bool = False
+    next_cursor: str | None = None
+    facets: TagFacetsSchema | None = None
+
+
 class CompanySchema(BaseModel):
     id: int
     name_ko: str | None
@@ -31,11 +58,43 @@ class CompanySchema(BaseModel):
 
 class PaginatedCompanyResponse(BaseModel):
     items: list[CompanySchema]
-    total: int
+    total: int | None
     limit: int
     offset: int
+    has_more: bool = False
+    next_cursor: str | None = None
 
 
 class TagUpdateResponse(BaseModel):
     company_id: int
     tags: list[CompanyTagSchema]
+
+
+class BulkTagStatus(str, Enum):
+    ADDED = "added"
+    ALREADY_EXISTS = "already_exists"
+    REMOVED = "removed"
+    NOT_ASSIGNED = "not_assigned"
+    COMPANY_NOT_FOUND = "company_not_found"
+    TAG_NOT_FOUND = "tag_not_found"
+
+
+class CompanyTagsAssignment(BaseModel):
+    company_id: int
+    tag_ids: list[int] = Field(min_length=1)
+
+
+class BulkTagRequest(BaseModel):
+    add: list[CompanyTagsAssignment] = []
+    remove: list[CompanyTagsAssignment] = []
+
+
+class BulkTagResult(BaseModel):
+    company_id: int
+    tag_id: int
+    status: BulkTagStatus
+
+
+class BulkTagResponse(BaseModel):
+    add: list[BulkTagResult]
+    remove: list[BulkTagResult]
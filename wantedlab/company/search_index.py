@@ -0,0 +1,209 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable, NamedTuple
+
+from wantedlab.company.text import normalize_name
+
+logger = logging.getLogger(__name__)
+
+CJK_GRAM_SIZE = 2
+LATIN_GRAM_SIZE = 3
+
+
+class IndexedCompany(NamedTuple):
+    id: int
+    name_ko: str | None
+    name_en: str | None
+    name_ja: str | None
+
+
+def _is_cjk(char: str) -> bool:
+    return (
+        "\u1100" <= char <= "\u11ff"  # Hangul Jamo
+        or "\u3040" <= char <= "\u30ff"  # Hiragana, Katakana
+        or "\u3130" <= char <= "\u318f"  # Hangul Compatibility Jamo
+        or "\u3400" <= char <= "\u9fff"  # CJK Unified Ideographs
+        or "\uac00" <= char <= "\ud7a3"  # Hangul Syllables
+    )
+
+
+def _script_runs(text: str) -> list[tuple[bool, str]]:
+    runs: list[tuple[bool, str]] = []
+    for char in text:
+        cjk = _is_cjk(char)
+        if runs and runs[-1][0] == cjk:
+            runs[-1] = (cjk, runs[-1][1] + char)
+        else:
+            runs.append((cjk, char))
+    return runs
+
+
+def ngrams(text: str) -> set[str]:
+    grams: set[str] = set()
+    for cjk, run in _script_runs(text):
+        size = CJK_GRAM_SIZE if cjk else LATIN_GRAM_SIZE
+        grams.update(run[i : i + size] for i in range(len(run) - size + 1))
+    return grams
+
+
+class CompanySearchIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._ready = False
+        self._building = False
+        self._pending: list[Callable[[], None]] = []
+        self._companies: dict[int, IndexedCompany] = {}
+        self._keys: dict[int, tuple[str, ...]] = {}
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._watermark = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._companies)
+
+    def build(self) -> None:
+        from django.db.models import Max
+
+        from wantedlab.company.models import Company
+
+        watermark = Company.objects.aggregate(updated_at=Max("updated_at"))["updated_at"]
+        rows = Company.objects.values_list("id", "name_ko", "name_en", "name_ja").iterator(chunk_size=2000)
+        self.load(rows)
+        self._watermark = watermark
+        logger.info("company search index built: %d companies, %d grams", len(self._companies), len(self._postings))
+
+    def refresh_if_changed(self) -> bool:
+        """Re-add companies saved since the last refresh; rebuild when the
+        company count still differs afterwards (deletes by other processes).
+
+        Re-adding what this process already indexed through signals is a no-op
+        change, so local writes never force a rebuild. updated_at is taken at
+        save time, so a row committed late can carry a time older than the
+        watermark; the re-read starts COMPANY_SEARCH_INDEX_REFRESH_OVERLAP
+        seconds earlier to pick those up."""
+        from datetime import timedelta
+
+        from django.conf import settings
+        from django.db.models import Max
+
+        from wantedlab.company.models import Company
+
+        if not self._ready or self._watermark is None:
+            self.build()
+            return True
+
+        since = self._watermark - timedelta(seconds=settings.COMPANY_SEARCH_INDEX_REFRESH_OVERLAP)
+        changed = Company.objects.filter(updated_at__gte=since).order_by()
+        watermark = changed.aggregate(updated_at=Max("updated_at"))["updated_at"] or self._watermark
+        rows = list(changed.values_list("id", "name_ko", "name_en", "name_ja"))
+        changed_rows = [row for row in rows if self._companies.get(row[0]) != IndexedCompany(*row)]
+        for row in changed_rows:
+            self.add(*row)
+        self._watermark = max(watermark, self._watermark)
+        if Company.objects.count() != len(self):
+            self.build()
+            return True
+        return bool(changed_rows)
+
+    def load(self, rows: Iterable[tuple[int, str | None, str | None, str | None]]) -> None:
+        with self._lock:
+            self._building = True
+            self._pending = []
+
+        try:
+            index = CompanySearchIndex()
+            for row in rows:
+                index._add(IndexedCompany(*row))
+        except Exception:
+            with self._lock:
+                self._building = False
+                self._pending = []
+            raise
+
+        with self._lock:
+            self._companies = index._companies
+            self._keys = index._keys
+            self._postings = index._postings
+            for apply in self._pending:
+                apply()
+            self._pending = []
+            self._building = False
+            self._ready = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ready = False
+            self._companies = {}
+            self._keys = {}
+            self._postings = defaultdict(set)
+
+    def add(self, company_id: int, name_ko: str | None, name_en: str | None, name_ja: str | None) -> None:
+        company = IndexedCompany(company_id, name_ko, name_en, name_ja)
+        with self._lock:
+            if self._building:
+                self._pending.append(lambda: self._add(company))
+            if self._ready or self._building:
+                self._add(company)
+
+    def remove(self, company_id: int) -> None:
+        with self._lock:
+            if self._building:
+                self._pending.append(lambda: self._remove(company_id))
+            if self._ready or self._building:
+                self._remove(company_id)
+
+    @staticmethod
+    def covers(query: str) -> bool:
+        """Whether the query yields grams to narrow candidates with. Shorter
+        queries would scan every company, so callers send them to the database."""
+        return bool(ngrams(normalize_name(query)))
+
+    def search(self, query: str) -> list[IndexedCompany]:
+        key = normalize_name(query)
+        with self._lock:
+            candidates = self._candidates(key)
+            return [
+                self._companies[company_id]
+                for company_id in sorted(candidates)
+                if any(key in name for name in self._keys[company_id])
+            ]
+
+    def _candidates(self, key: str) -> set[int] | dict[int, IndexedCompany]:
+        grams = ngrams(key)
+        if not grams:
+            return self._companies
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return candidates
+
+    def _add(self, company: IndexedCompany) -> None:
+        self._remove(company.id)
+        keys = tuple(normalize_name(name) for name in company[1:] if name)
+        self._companies[company.id] = company
+        self._keys[company.id] = keys
+        for gram in set().union(*map(ngrams, keys)):
+            self._postings[gram].add(company.id)
+
+    def _remove(self, company_id: int) -> None:
+        keys = self._keys.pop(company_id, None)
+        if keys is None:
+            return
+        self._companies.pop(company_id, None)
+        for gram in set().union(*map(ngrams, keys)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(company_id)
+            if not posting:
+                del self._postings[gram]
+
+
+company_search_index = CompanySearchIndex()
@@ -0,0 +1,138 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from wantedlab.company.cache import SCOPE_COMPANIES, SCOPE_TAGS, company_scope, response_cache, tag_scope
+from wantedlab.company.models import Company, CompanyTag, Tag
+from wantedlab.company.routing import record_primary_write
+from wantedlab.company.search_index import company_search_index
+from wantedlab.company.snapshots import refresh_tag_snapshots
+from wantedlab.company.tag_bitmaps import tag_bitmaps
+from wantedlab.company.tag_registry import tag_registry
+
+
+_bulk_tag_changes: ContextVar[bool] = ContextVar("bulk_tag_changes", default=False)
+# Company ids of the tags being deleted, by tag id. Their cascaded CompanyTag deletes are handled once per tag.
+_deleting_tags: ContextVar[dict[int, list[int]]] = ContextVar("deleting_tags", default={})
+
+
+@contextmanager
+def bulk_tag_changes() -> Iterator[None]:
+    # Per-row CompanyTag handlers are skipped; the caller must call company_tags_changed() once at the end.
+    token = _bulk_tag_changes.set(True)
+    try:
+        yield
+    finally:
+        _bulk_tag_changes.reset(token)
+
+
+def invalidate_on_commit(*scopes: str) -> None:
+    # Every write that invalidates cached reads passes through here.
+    record_primary_write()
+    transaction.on_commit(lambda: response_cache.invalidate(*scopes))
+
+
+def reload_tag_registry_on_commit() -> None:
+    if tag_registry.is_ready:
+        transaction.on_commit(tag_registry.build)
+
+
+def company_tags_changed(company_ids: Iterable[int], tag_numbers: Iterable[int]) -> None:
+    company_ids, tag_numbers = list(company_ids), list(tag_numbers)
+    refresh_tag_snapshots(company_ids)
+    invalidate_on_commit(*map(company_scope, company_ids), *map(tag_scope, tag_numbers))
+    if tag_bitmaps.is_tracking:
+        transaction.on_commit(lambda: tag_bitmaps.sync(company_ids, tag_numbers))
+
+
+@receiver(post_save, sender=Company)
+def index_company(sender, instance: Company, created: bool, **kwargs) -> None:
+    transaction.on_commit(
+        lambda: company_search_index.add(instance.id, instance.name_ko, instance.name_en, instance.name_ja)
+    )
+    if created:
+        company_id = instance.id
+        transaction.on_commit(lambda: tag_bitmaps.add_company(company_id))
+    invalidate_on_commit(SCOPE_COMPANIES, company_scope(instance.id))
+
+
+@receiver(post_delete, sender=Company)
+def unindex_company(sender, instance: Company, **kwargs) -> None:
+    company_id = instance.id
+    transaction.on_commit(lambda: company_search_index.remove(company_id))
+    transaction.on_commit(lambda: tag_bitmaps.remove_company(company_id))
+    invalidate_on_commit(SCOPE_COMPANIES, company_scope(company_id))
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance: Tag, created: bool, **kwargs) -> None:
+    if not created:
+        refresh_tag_snapshots(instance.companies.values_list("id", flat=True))
+    reload_tag_registry_on_commit()
+    invalidate_on_commit(SCOPE_TAGS, tag_scope(instance.number))
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_deleting(sender, instance: Tag, **kwargs) -> None:
+    company_ids = list(instance.companies.values_list("id", flat=True))
+    _deleting_tags.set({**_deleting_tags.get(), instance.id: company_ids})
+
+
+@receiver(post_delete, sender=Tag)
+def tag_deleted(sender, instance: Tag, **kwargs) -> None:
+    tag_id = instance.id
+    deleting = dict(_deleting_tags.get())
+    company_ids = deleting.pop(tag_id, [])
+    _deleting_tags.set(deleting)
+    reload_tag_registry_on_commit()
+    transaction.on_commit(lambda: tag_bitmaps.drop_tag(tag_id))
+    # One snapshot refresh for every company the tag was on, instead of one per cascaded CompanyTag.
+    transaction.on_commit(lambda: refresh_tag_snapshots(company_ids))
+    invalidate_on_commit(SCOPE_TAGS, tag_scope(instance.number), *map(company_scope, company_ids))
+
+
+@receiver(pre_save, sender=CompanyTag)
+def company_tag_saving(sender, instance: CompanyTag, **kwargs) -> None:
+    # An edit can move the row to another company or tag; the previous owners need refreshing too.
+    if _bulk_tag_changes.get() or instance._state.adding:
+        return
+    instance._previous_owner = (
+        CompanyTag.objects.filter(pk=instance.pk).values_list("company_id", "tag__number").first()
+    )
+
+
+@receiver(post_save, sender=CompanyTag)
+@receiver(post_delete, sender=CompanyTag)
+def company_tag_changed(sender, instance: CompanyTag, **kwargs) -> None:
+    if _bulk_tag_changes.get() or instance.tag_id in _deleting_tags.get():
+        return
+    company_ids, tag_numbers = {instance.company_id}, {instance.tag.number}
+    previous = instance.__dict__.pop("_previous_owner", None)
+    if previous is not None:
+        company_ids.add(previous[0])
+        tag_numbers.add(previous[1])
+    company_tags_changed(company_ids, tag_numbers)
+
+
+@receiver(m2m_changed, sender=Company.tags.through)
+def company_tags_m2m_changed(sender, instance, action: str, reverse: bool, pk_set: set[int] | None, **kwargs) -> None:
+    if action == "pre_clear" and reverse:
+        instance._cleared_company_ids = list(instance.companies.values_list("id", flat=True))
+    elif action == "post_clear" and reverse:
+        tag_id = instance.id
+        refresh_tag_snapshots(instance.__dict__.pop("_cleared_company_ids", []))
+        invalidate_on_commit(SCOPE_COMPANIES, tag_scope(instance.number))
+        transaction.on_commit(lambda: tag_bitmaps.drop_tag(tag_id))
+    elif action == "post_clear":
+        company_id = instance.id
+        refresh_tag_snapshots([company_id])
+        invalidate_on_commit(SCOPE_TAGS, company_scope(company_id))
+        transaction.on_commit(lambda: tag_bitmaps.untag_company(company_id))
+    elif action in ("post_add", "post_remove") and reverse:
+        company_tags_changed(pk_set, [instance.number])
+    elif action in ("post_add", "post_remove"):
+        company_tags_changed([instance.id], Tag.objects.filter(id__in=pk_set).values_list("number", flat=True))
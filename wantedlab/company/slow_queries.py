@@ -0,0 +1,92 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+
+
+class SlowQuery(NamedTuple):
+    recorded_at: float
+    duration_ms: float
+    method: str | None
+    route: str | None
+    query_string: str | None
+    sql: str
+    params: str
+    plan: str | None
+
+
+class SlowQueryLog:
+    """Ring buffer of statements slower than the threshold. With EXPLAIN on
+    (meant for non-production), a sample of the SELECTs is re-run under
+    EXPLAIN (ANALYZE, BUFFERS) in a rolled-back savepoint and the plan kept."""
+
+    def __init__(self) -> None:
+        options = settings.COMPANY_SLOW_QUERY
+        self.enabled: bool = options["ENABLED"]
+        self.threshold: float = options["THRESHOLD_MS"] / 1000
+        self.explain: bool = options["EXPLAIN"]
+        self.explain_sample_rate: float = options["EXPLAIN_SAMPLE_RATE"]
+        self._entries: deque[SlowQuery] = deque(maxlen=options["MAX_ENTRIES"])
+        self._lock = threading.Lock()
+
+    def entries(self) -> list[SlowQuery]:
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def capture(
+        self, sql: str, params, many: bool, context, duration: float, scope: dict | None, route: str | None
+    ) -> None:
+        plan = None
+        if self._should_explain(sql, many, context):
+            plan = self._explain(sql, params, context)
+
+        entry = SlowQuery(
+            recorded_at=time.time(),
+            duration_ms=round(duration * 1000, 3),
+            method=scope.get("method") if scope else None,
+            route=route,
+            query_string=scope.get("query_string", b"").decode("latin-1") if scope else None,
+            sql=sql,
+            params=repr(params),
+            plan=plan,
+        )
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning("slow query %.1f ms on %s %s: %s", entry.duration_ms, entry.method, entry.route, sql)
+
+    def _should_explain(self, sql: str, many: bool, context) -> bool:
+        # ANALYZE runs the statement again, so only plain reads are explained.
+        return (
+            self.explain
+            and not many
+            and context["connection"].vendor == "postgresql"
+            and sql.lstrip()[:6].upper() == "SELECT"
+            and random.random() < self.explain_sample_rate
+        )
+
+    @staticmethod
+    def _explain(sql: str, params, context) -> str:
+        raw = context["connection"].connection
+        try:
+            # A raw cursor bypasses the execute wrappers; the savepoint keeps a failed EXPLAIN from
+            # aborting the caller's transaction.
+            with raw.transaction(force_rollback=True), raw.cursor() as cursor:
+                cursor.execute(EXPLAIN_PREFIX + sql, params)
+                return "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            return f"EXPLAIN failed: {e}"
+
+
+slow_query_log = SlowQueryLog()
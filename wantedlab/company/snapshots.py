@@ -0,0 +1,30 @@
+from typing import Iterable
+
+from django.db import transaction
+
+from wantedlab.company.loaders import CompanyTagLoader
+from wantedlab.company.models import Company
+
+
+def build_tag_snapshots(company_ids: Iterable[int]) -> dict[int, list[dict]]:
+    tags_by_company = CompanyTagLoader().load_many(company_ids)
+    return {company_id: [tag.model_dump() for tag in tags] for company_id, tags in tags_by_company.items()}
+
+
+def refresh_tag_snapshots(company_ids: Iterable[int]) -> None:
+    """Rebuild Company.tag_snapshot from CompanyTag. Callers that bypass model
+    signals (bulk_create, raw SQL) must call this themselves."""
+    company_ids = sorted(set(company_ids))
+    if not company_ids:
+        return
+
+    with transaction.atomic():
+        # Lock the company rows first so concurrent refreshes cannot overwrite each other's changes.
+        locked = list(
+            Company.objects.select_for_update().filter(id__in=company_ids).order_by("id").values_list("id", flat=True)
+        )
+        snapshots = build_tag_snapshots(locked)
+        Company.objects.bulk_update(
+            [Company(id=company_id, tag_snapshot=snapshot) for company_id, snapshot in snapshots.items()],
+            ["tag_snapshot"],
+        )
@@ -0,0 +1,304 @@
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Callable, Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+_COUNT_BLOCK = 4096
+# Rough relative costs for facet counting: one company's tags through the Python loop vs one bitmap byte
+# through & and bit_count(). Measured at ~1.5 µs per company with 3 tags vs ~1 ns per byte.
+_COMPANY_COST = 1500
+
+
+def _bitmap(ids: Iterable[int]) -> int:
+    bits = bytearray()
+    for value in ids:
+        index = value >> 3
+        if index >= len(bits):
+            bits.extend(bytes(max(index + 1 - len(bits), len(bits))))
+        bits[index] |= 1 << (value & 7)
+    return int.from_bytes(bits, "little")
+
+
+class TagBitmaps:
+    """Per-tag sets of company ids as Python int bitsets (bit n set = company n
+    has the tag), plus one bitset of all company ids for NOT-only queries and
+    the reverse company -> tag ids map for facet counts.
+
+    &, |, & ~ and bit_count() run in C over machine words, so boolean tag queries
+    and their counts never touch the database; only the final page is hydrated.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ready = False
+        self._building = False
+        self._pending: list[Callable[[], None]] = []
+        # Highest Company and CompanyTag ids already read; refresh_if_changed() only reads past them.
+        self._watermark: tuple[int, int] | None = None
+        self._tags: dict[int, int] = {}
+        self._companies = 0
+        self._company_tags: dict[int, tuple[int, ...]] = {}
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    @property
+    def is_tracking(self) -> bool:
+        """Whether local writes should be reported: ready, or being built."""
+        return self._ready or self._building
+
+    @staticmethod
+    def _max_ids() -> tuple[int, int]:
+        from django.db.models import Max
+
+        from wantedlab.company.models import Company, CompanyTag
+
+        company_max = Company.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+        company_tag_max = CompanyTag.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+        return company_max, company_tag_max
+
+    def build(self) -> None:
+        from wantedlab.company.models import Company, CompanyTag
+
+        with self._lock:
+            self._building = True
+            self._pending = []
+
+        try:
+            watermark = self._max_ids()
+            ids_by_tag: dict[int, list[int]] = {}
+            tags_by_company: dict[int, list[int]] = {}
+            pairs = CompanyTag.objects.order_by().values_list("tag_id", "company_id").iterator(20000)
+            for tag_id, company_id in pairs:
+                ids_by_tag.setdefault(tag_id, []).append(company_id)
+                tags_by_company.setdefault(company_id, []).append(tag_id)
+            companies = _bitmap(Company.objects.order_by().values_list("id", flat=True).iterator(20000))
+        except Exception:
+            with self._lock:
+                self._building = False
+                self._pending = []
+            raise
+
+        self.load(
+            {tag_id: _bitmap(ids) for tag_id, ids in ids_by_tag.items()},
+            companies,
+            watermark,
+            {company_id: tuple(tag_ids) for company_id, tag_ids in tags_by_company.items()},
+        )
+        logger.info("tag bitmaps built: %d tags, %d companies", len(self._tags), companies.bit_count())
+
+    def refresh_if_changed(self) -> bool:
+        """Apply Company and CompanyTag rows added since the last refresh; rebuild
+        when the counts still differ afterwards (deletes by other processes).
+
+        Rows this process already applied on commit are set again, which changes
+        nothing, so local writes never force a rebuild."""
+        from wantedlab.company.models import Company, CompanyTag
+
+        if not self._ready or self._watermark is None:
+            self.build()
+            return True
+
+        company_max, company_tag_max = self._watermark
+        watermark = self._max_ids()
+        companies = list(Company.objects.filter(id__gt=company_max, id__lte=watermark[0]).values_list("id", flat=True))
+        pairs = list(
+            CompanyTag.objects.filter(id__gt=company_tag_max, id__lte=watermark[1]).values_list("company_id", "tag_id")
+        )
+        with self._lock:
+            for company_id in companies:
+                self._add_company(company_id)
+            for company_id, tag_id in pairs:
+                self._add(company_id, tag_id)
+            self._watermark = watermark
+            company_count = self._companies.bit_count()
+            company_tag_count = sum(bitmap.bit_count() for bitmap in self._tags.values())
+
+        if Company.objects.count() != company_count or CompanyTag.objects.count() != company_tag_count:
+            self.build()
+            return True
+        return bool(companies or pairs)
+
+    def load(
+        self,
+        tags: dict[int, int],
+        companies: int,
+        watermark: tuple[int, int] | None = None,
+        company_tags: dict[int, tuple[int, ...]] | None = None,
+    ) -> None:
+        if company_tags is None:
+            tags_by_company: dict[int, list[int]] = {}
+            for tag_id, bitmap in tags.items():
+                for company_id in self.page(bitmap, 0, bitmap.bit_count()):
+                    tags_by_company.setdefault(company_id, []).append(tag_id)
+            company_tags = {company_id: tuple(tag_ids) for company_id, tag_ids in tags_by_company.items()}
+        with self._lock:
+            self._tags, self._companies, self._company_tags = tags, companies, company_tags
+            self._watermark = watermark
+            # Writes committed while build() was reading may be missing from its snapshot; replay them.
+            for apply in self._pending:
+                apply()
+            self._pending = []
+            self._building = False
+            self._ready = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ready = False
+            self._watermark = None
+            self._tags, self._companies, self._company_tags = {}, 0, {}
+
+    def _apply(self, apply: Callable[[], None]) -> None:
+        with self._lock:
+            if self._building:
+                self._pending.append(apply)
+            if self._ready or self._building:
+                apply()
+
+    def sync(self, company_ids: Iterable[int], tag_numbers: Iterable[int]) -> None:
+        """Re-read the given companies' assignments of the given tags from CompanyTag."""
+        from wantedlab.company.models import CompanyTag, Tag
+
+        if not self.is_tracking:
+            return
+        company_ids, tag_numbers = list(company_ids), list(tag_numbers)
+        tag_ids = list(Tag.objects.filter(number__in=tag_numbers).values_list("id", flat=True))
+        assigned: dict[int, list[int]] = {tag_id: [] for tag_id in tag_ids}
+        for tag_id, company_id in CompanyTag.objects.filter(
+            company_id__in=company_ids, tag_id__in=tag_ids
+        ).values_list("tag_id", "company_id"):
+            assigned[tag_id].append(company_id)
+        touched = _bitmap(company_ids)
+
+        def apply() -> None:
+            for tag_id, ids in assigned.items():
+                self._tags[tag_id] = self._tags.get(tag_id, 0) & ~touched | _bitmap(ids)
+            for company_id in company_ids:
+                kept = [tag_id for tag_id in self._company_tags.get(company_id, ()) if tag_id not in assigned]
+                added = [tag_id for tag_id, ids in assigned.items() if company_id in ids]
+                self._set_company_tags(company_id, (*kept, *added))
+
+        self._apply(apply)
+
+    def add(self, company_id: int, tag_id: int) -> None:
+        self._apply(lambda: self._add(company_id, tag_id))
+
+    def remove(self, company_id: int, tag_id: int) -> None:
+        self._apply(lambda: self._remove(company_id, tag_id))
+
+    def add_company(self, company_id: int) -> None:
+        self._apply(lambda: self._add_company(company_id))
+
+    def untag_company(self, company_id: int) -> None:
+        self._apply(lambda: self._untag_company(company_id))
+
+    def remove_company(self, company_id: int) -> None:
+        self._apply(lambda: self._remove_company(company_id))
+
+    def drop_tag(self, tag_id: int) -> None:
+        # The id stays in _company_tags until the next build; tag_counts() skips tags it no longer has.
+        self._apply(lambda: self._tags.pop(tag_id, None))
+
+    # The underscored mutators below run with self._lock held.
+
+    def _add(self, company_id: int, tag_id: int) -> None:
+        self._tags[tag_id] = self._tags.get(tag_id, 0) | 1 << company_id
+        tag_ids = self._company_tags.get(company_id, ())
+        if tag_id not in tag_ids:
+            self._company_tags[company_id] = (*tag_ids, tag_id)
+
+    def _remove(self, company_id: int, tag_id: int) -> None:
+        self._tags[tag_id] = self._tags.get(tag_id, 0) & ~(1 << company_id)
+        tag_ids = self._company_tags.get(company_id, ())
+        self._set_company_tags(company_id, tuple(other for other in tag_ids if other != tag_id))
+
+    def _add_company(self, company_id: int) -> None:
+        self._companies |= 1 << company_id
+
+    def _untag_company(self, company_id: int) -> None:
+        mask = ~(1 << company_id)
+        self._tags = {tag_id: bitmap & mask for tag_id, bitmap in self._tags.items()}
+        self._company_tags.pop(company_id, None)
+
+    def _remove_company(self, company_id: int) -> None:
+        self._untag_company(company_id)
+        self._companies &= ~(1 << company_id)
+
+    def _set_company_tags(self, company_id: int, tag_ids: tuple[int, ...]) -> None:
+        if tag_ids:
+            self._company_tags[company_id] = tag_ids
+        else:
+            self._company_tags.pop(company_id, None)
+
+    def query(self, all_tags: Iterable[int] = (), any_tags: Iterable[int] = (), none_tags: Iterable[int] = ()) -> int:
+        tags = self._tags
+        result = self._companies
+        for tag_id in all_tags:
+            result &= tags.get(tag_id, 0)
+        any_tags = list(any_tags)
+        if any_tags:
+            matched = 0
+            for tag_id in any_tags:
+                matched |= tags.get(tag_id, 0)
+            result &= matched
+        for tag_id in none_tags:
+            result &= ~tags.get(tag_id, 0)
+        return result
+
+    def tag_counts(self, company_ids: Sequence[int], limit: int) -> list[tuple[int, int]]:
+        """The ``limit`` most common tags among ``company_ids`` as (tag id, count), most common first."""
+        tags, company_tags = self._tags, self._company_tags
+        matched = _bitmap(company_ids)
+        # Walking each company's tags is linear in the matched set; intersecting every tag bitmap is linear
+        # in tags x id range. Large matched sets over few tags favour the latter.
+        if len(company_ids) * _COMPANY_COST > len(tags) * (matched.bit_length() >> 3):
+            counts = Counter({tag_id: (bitmap & matched).bit_count() for tag_id, bitmap in tags.items()})
+        else:
+            counts = Counter(tag_id for company_id in company_ids for tag_id in company_tags.get(company_id, ()))
+        ranked = sorted(
+            ((tag_id, count) for tag_id, count in counts.items() if count and tag_id in tags),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return ranked[:limit]
+
+    @staticmethod
+    def page(bitmap: int, offset: int, limit: int, after: int | None = None) -> list[int]:
+        """Company ids of ``bitmap`` in ascending order: ``limit`` of them starting
+        ``offset`` ids in, or right after the id ``after`` when given."""
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        position = 0
+        skip = offset
+        if after is not None:
+            position, skip = (after + 1) >> 3, 0
+        else:
+            # Skip whole blocks by popcount before decoding byte by byte.
+            while position < len(data):
+                count = int.from_bytes(data[position : position + _COUNT_BLOCK], "little").bit_count()
+                if count > skip:
+                    break
+                skip -= count
+                position += _COUNT_BLOCK
+
+        ids: list[int] = []
+        for match in _NONZERO_BYTE.finditer(data, position):
+            base = match.start() << 3
+            for bit in _BITS[data[match.start()]]:
+                company_id = base | bit
+                if after is not None and company_id <= after:
+                    continue
+                if skip:
+                    skip -= 1
+                    continue
+                ids.append(company_id)
+                if len(ids) == limit:
+                    return ids
+        return ids
+
+
+tag_bitmaps = TagBitmaps()
@@ -0,0 +1,93 @@
+import logging
+import re
+import threading
+from typing import Iterable
+
+from wantedlab.company.schemas import CompanyTagSchema
+
+logger = logging.getLogger(__name__)
+
+_FULL_TAG = re.compile(r".+_(\d+)", re.ASCII)
+
+
+def parse_tag_number(full_tag: str) -> int | None:
+    match = _FULL_TAG.fullmatch(full_tag)
+    return int(match.group(1)) if match else None
+
+
+class TagRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ready = False
+        self._version: tuple | None = None
+        self._by_id: dict[int, CompanyTagSchema] = {}
+        self._by_number: dict[int, CompanyTagSchema] = {}
+        self._by_name: dict[str, CompanyTagSchema] = {}
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @staticmethod
+    def current_version() -> tuple:
+        from django.db.models import Count, Max
+
+        from wantedlab.company.models import Tag
+
+        version = Tag.objects.aggregate(updated_at=Max("updated_at"), count=Count("id"))
+        return version["updated_at"], version["count"]
+
+    def build(self) -> None:
+        from wantedlab.company.models import Tag
+
+        version = self.current_version()
+        self.load(Tag.objects.order_by("id").values_list("id", "name", "number"), version)
+        logger.info("tag registry loaded: %d tags", len(self))
+
+    def refresh_if_changed(self) -> bool:
+        if self._ready and self.current_version() == self._version:
+            return False
+        self.build()
+        return True
+
+    def load(self, rows: Iterable[tuple[int, str | None, int]], version: tuple | None = None) -> None:
+        by_id: dict[int, CompanyTagSchema] = {}
+        by_number: dict[int, CompanyTagSchema] = {}
+        by_name: dict[str, CompanyTagSchema] = {}
+        for tag_id, name, number in rows:
+            tag = CompanyTagSchema(id=tag_id, name=name, number=number)
+            by_id[tag_id] = tag
+            # Rows arrive in id order, so duplicate numbers or names resolve to the oldest tag like the DB lookup.
+            by_number.setdefault(number, tag)
+            if name:
+                by_name.setdefault(name, tag)
+
+        with self._lock:
+            self._by_id, self._by_number, self._by_name = by_id, by_number, by_name
+            self._version = version
+            self._ready = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ready = False
+            self._version = None
+            self._by_id, self._by_number, self._by_name = {}, {}, {}
+
+    def get(self, tag_id: int) -> CompanyTagSchema | None:
+        return self._by_id.get(tag_id)
+
+    def get_by_number(self, number: int) -> CompanyTagSchema | None:
+        return self._by_number.get(number)
+
+    def resolve(self, full_tag: str) -> CompanyTagSchema | None:
+        tag = self._by_name.get(full_tag)
+        if tag is not None:
+            return tag
+        number = parse_tag_number(full_tag)
+        return None if number is None else self._by_number.get(number)
+
+
+tag_registry = TagRegistry()
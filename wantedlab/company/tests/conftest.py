@@ -0,0 +1,10 @@
+import pytest
+
+from wantedlab.company.cache import response_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    response_cache.clear()
+    yield
+    response_cache.clear()
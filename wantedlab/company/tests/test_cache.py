@@ -0,0 +1,74 @@
+import pytest
+from asgiref.sync import sync_to_async
+
+from wantedlab.company.cache import cached_response, company_scope, response_cache, tag_scope
+from wantedlab.company.models import Company, CompanyTag, Tag
+from wantedlab.company.views import CompanyView
+
+
+def test_invalidate_evicts_only_dependent_entries():
+    # given
+    response_cache.set("tag-1", b"first", [tag_scope(1), company_scope(10)])
+    response_cache.set("tag-2", b"second", [tag_scope(2), company_scope(20)])
+
+    # when
+    response_cache.invalidate(company_scope(10))
+
+    # then
+    assert response_cache.get("tag-1") is None
+    assert response_cache.get("tag-2") == b"second"
+
+
+def test_make_key_normalizes_parameter_order():
+    # then
+    assert response_cache.make_key("ns", {"a": 1, "b": 2}) == response_cache.make_key("ns", {"b": 2, "a": 1})
+
+
+@pytest.mark.django_db
+@pytest.mark.asyncio
+async def test_add_company_tag_invalidates_tag_listing():
+    # given
+    tag = await sync_to_async(Tag.objects.create)(name="개발", number=1)
+    first = await sync_to_async(Company.objects.create)(name_ko="원티드랩")
+    second = await sync_to_async(Company.objects.create)(name_ko="원티드")
+    await sync_to_async(CompanyTag.objects.create)(company=first, tag=tag)
+    before = await CompanyView.list_companies_company_by_tag(full_tag="tag_1", offset=0, limit=10)
+
+    # when
+    await CompanyView.add_company_tag(second.id, tag.id)
+    after = await CompanyView.list_companies_company_by_tag(full_tag="tag_1", offset=0, limit=10)
+
+    # then
+    assert before.total == 1
+    assert after.total == 2
+    await sync_to_async(Company.objects.all().delete)()
+    await sync_to_async(Tag.objects.all().delete)()
+
+
+def test_locmem_cache_does_not_cross_processes():
+    # then
+    assert response_cache.crosses_processes is False
+
+
+@pytest.mark.asyncio
+async def test_result_read_across_an_invalidation_is_not_stored():
+    # given
+    calls = []
+
+    @cached_response("test_racing", scopes=lambda result, params: [company_scope(1)])
+    async def load() -> dict:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            # Another worker commits a write after this read started; the scope gets its new token first.
+            response_cache.invalidate(company_scope(1))
+        return {"call": len(calls)}
+
+    # when
+    first = await load()
+    second = await load()
+    third = await load()
+
+    # then
+    assert calls == [0, 1]
+    assert first == b'{"call":1}'
+    assert second == third == b'{"call":2}'
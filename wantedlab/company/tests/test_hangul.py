@@ -0,0 +1,32 @@
+from wantedlab.company.hangul import decompose_jamo, extract_chosung, is_chosung_query
+
+
+def test_extract_chosung():
+    # when
+    result = extract_chosung("원티드 랩")
+
+    # then
+    assert result == "ㅇㅌㄷㄹ"
+
+
+def test_decompose_jamo_splits_compound_vowels():
+    # when
+    result = decompose_jamo("원티드")
+
+    # then
+    assert result == "ㅇㅜㅓㄴㅌㅣㄷㅡ"
+
+
+def test_decompose_jamo_partial_input_matches_syllables():
+    # when
+    result = decompose_jamo("원ㅌ")
+
+    # then
+    assert decompose_jamo("원티드랩").startswith(result)
+
+
+def test_is_chosung_query():
+    # then
+    assert is_chosung_query("ㅇㅌ ㄷ")
+    assert not is_chosung_query("원ㅌ")
+    assert not is_chosung_query("")
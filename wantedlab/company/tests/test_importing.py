@@ -0,0 +1,161 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from wantedlab.company.importing import Checkpoint, ImportedTag, ImportFormatError, detect_format, read_companies
+from wantedlab.company.models import Company, CompanyName, CompanyTag, Tag
+
+CSV_DATA = (
+    "name_ko,name_en,name_ja,tags\n"
+    '원티드랩,Wantedlab,ウォンテッドラボ,"1:개발|2:디자인"\n'
+    '"줄바꿈\n회사",,,3\n'
+    ",Wanted,,\n"
+).encode()
+
+
+def test_read_companies_csv():
+    # when
+    records = list(read_companies(io.BytesIO(CSV_DATA), "csv"))
+
+    # then
+    companies = [company for company, _ in records]
+    assert [company.line for company in companies] == [1, 2, 3]
+    assert companies[0].tags == (ImportedTag(1, "개발"), ImportedTag(2, "디자인"))
+    assert companies[1].name_ko == "줄바꿈\n회사"
+    assert companies[1].tags == (ImportedTag(3, None),)
+    assert companies[2].name_ko is None
+    assert records[-1][1] == len(CSV_DATA)
+
+
+def test_read_companies_resumes_from_checkpoint():
+    # given
+    first, offset = next(read_companies(io.BytesIO(CSV_DATA), "csv"))
+    checkpoint = Checkpoint(offset=offset, line=first.line, size=len(CSV_DATA))
+
+    # when
+    companies = [company for company, _ in read_companies(io.BytesIO(CSV_DATA), "csv", checkpoint)]
+
+    # then
+    assert [company.line for company in companies] == [2, 3]
+    assert companies[0].name_ko == "줄바꿈\n회사"
+
+
+def test_read_companies_jsonl():
+    # given
+    data = '{"name_ko": "원티드랩", "tags": [{"number": 1, "name": "개발"}]}\n\n{"name_en": "Wanted"}\n'.encode()
+
+    # when
+    companies = [company for company, _ in read_companies(io.BytesIO(data), "jsonl")]
+
+    # then
+    assert [(company.line, company.name_ko, company.name_en) for company in companies] == [
+        (1, "원티드랩", None),
+        (3, None, "Wanted"),
+    ]
+    assert companies[0].tags == (ImportedTag(1, "개발"),)
+
+
+@pytest.mark.parametrize(
+    "data, fmt",
+    [
+        (b'{"name_ko": "a", "tags": ["x"]}\n', "jsonl"),
+        (b"[1]\n", "jsonl"),
+        (b"name_ko,tags\n,1\n", "csv"),
+    ],
+)
+def test_read_companies_invalid_rows(data: bytes, fmt: str):
+    # when
+    with pytest.raises(ImportFormatError):
+        list(read_companies(io.BytesIO(data), fmt))
+
+
+def test_detect_format():
+    # then
+    assert detect_format("companies.CSV") == "csv"
+    assert detect_format("companies.ndjson") == "jsonl"
+    with pytest.raises(ImportFormatError):
+        detect_format("companies.xlsx")
+
+
+@pytest.mark.django_db
+def test_import_companies_requires_postgresql(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    # given
+    path = tmp_path / "companies.csv"
+    path.write_bytes("name_ko,name_en,name_ja,tags\n원티드랩,,,1:개발\n".encode())
+    monkeypatch.setattr(connection, "vendor", "sqlite")
+
+    # when
+    with pytest.raises(CommandError, match="PostgreSQL 에서만"):
+        call_command("import_companies", str(path), stdout=io.StringIO())
+
+
+IMPORT_DATA = (
+    "name_ko,name_en,name_ja,tags\n"
+    '원티드랩,Wanted  Lab,ウォンテッドラボ,"1:개발|2:디자인"\n'
+    "원티드,,,3\n"
+    ",Wanted,,\n"
+    '원티드랩,Wanted  Lab,ウォンテッドラボ,"2:디자인팀|9"\n'
+)
+
+
+def company_rows() -> dict[tuple, list]:
+    return {
+        (company.name_ko, company.name_en, company.name_ja): company.tag_snapshot
+        for company in Company.objects.order_by("id")
+    }
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="COPY and ON CONFLICT need PostgreSQL")
+@pytest.mark.django_db(transaction=True)
+def test_import_companies_loads_and_resumes(tmp_path):
+    # given
+    Company.objects.all().delete()
+    Tag.objects.all().delete()
+    existing = Tag.objects.create(name="기존", number=3)
+    path = tmp_path / "companies.csv"
+    # Tag 9 has no name and does not exist, so the second batch fails after the first one committed.
+    path.write_bytes(IMPORT_DATA.encode())
+    first_run = io.StringIO()
+
+    # when
+    with pytest.raises(CommandError, match="태그 9"):
+        call_command("import_companies", str(path), batch_size=2, stdout=first_run)
+    after_first_batch = company_rows()
+    # Same size, so the checkpoint still applies; 9 becomes the existing tag 3.
+    path.write_bytes(IMPORT_DATA.replace("|9", "|3").encode())
+    resumed = io.StringIO()
+    call_command("import_companies", str(path), batch_size=2, resume=True, stdout=resumed)
+
+    # then
+    development, design = Tag.objects.get(number=1), Tag.objects.get(number=2)
+    assert set(after_first_batch) == {("원티드랩", "Wanted  Lab", "ウォンテッドラボ"), ("원티드", None, None)}
+    assert "2 번째 행 이후부터" in resumed.getvalue()
+    assert "2 개 행 가져오기 완료" in resumed.getvalue()
+    assert not (tmp_path / "companies.csv.checkpoint").exists()
+
+    assert design.name == "디자인팀"
+    assert Tag.objects.get(number=3).name == "기존"
+    assert Tag.objects.count() == 3
+
+    wanted_lab = Company.objects.get(name_ko="원티드랩")
+    assert Company.objects.count() == 3
+    assert set(wanted_lab.tags.values_list("number", flat=True)) == {1, 2, 3}
+    assert list(Company.objects.get(name_ko="원티드").tags.all()) == [existing]
+    assert CompanyTag.objects.count() == 4
+    assert dict(wanted_lab.names.values_list("lang", "normalized_name")) == {
+        CompanyName.Language.KO: "원티드랩",
+        CompanyName.Language.EN: "wanted lab",
+        CompanyName.Language.JA: "ウォンテッドラボ",
+    }
+    assert wanted_lab.name_chosung == "ㅇㅌㄷㄹ"
+    assert company_rows() == {
+        ("원티드랩", "Wanted  Lab", "ウォンテッドラボ"): [
+            {"id": existing.id, "name": "기존", "number": 3},
+            {"id": development.id, "name": "개발", "number": 1},
+            {"id": design.id, "name": "디자인팀", "number": 2},
+        ],
+        ("원티드", None, None): [{"id": existing.id, "name": "기존", "number": 3}],
+        (None, "Wanted", None): [],
+    }
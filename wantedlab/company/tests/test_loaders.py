@@ -0,0 +1,39 @@
+import pytest
+
+from wantedlab.company.loaders import CompanyTagLoader
+from wantedlab.company.models import Company, CompanyTag, Tag
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_load_many_batches_into_one_query(django_assert_num_queries):
+    # given
+    tags = [Tag.objects.create(name=f"태그{number}", number=number) for number in range(1, 4)]
+    companies = [Company.objects.create(name_ko=f"회사{i}") for i in range(3)]
+    for company, tag in zip(companies, tags):
+        CompanyTag.objects.create(company=company, tag=tag)
+    CompanyTag.objects.create(company=companies[0], tag=tags[2])
+    loader = CompanyTagLoader()
+
+    # when
+    with django_assert_num_queries(1):
+        result = loader.load_many(company.id for company in companies)
+
+    # then
+    assert [tag.number for tag in result[companies[0].id]] == [1, 3]
+    assert [tag.number for tag in result[companies[1].id]] == [2]
+    assert [tag.number for tag in result[companies[2].id]] == [3]
+
+
+def test_load_uses_cache(django_assert_num_queries):
+    # given
+    company = Company.objects.create(name_ko="원티드랩")
+    loader = CompanyTagLoader()
+    loader.load(company.id)
+
+    # when
+    with django_assert_num_queries(0):
+        result = loader.load(company.id)
+
+    # then
+    assert result == []
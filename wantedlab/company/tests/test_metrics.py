@@ -0,0 +1,128 @@
+import pytest
+from asgiref.sync import sync_to_async
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from wantedlab.company.metrics import (
+    DB_QUERIES,
+    HISTOGRAMS,
+    Histogram,
+    RequestMetricsMiddleware,
+    render_metrics,
+)
+from wantedlab.company.models import Company
+from wantedlab.company.routers import router
+from wantedlab.company.slow_queries import slow_query_log
+
+pytestmark = [pytest.mark.django_db, pytest.mark.asyncio]
+
+
+@pytest.fixture(autouse=True)
+def clear_histograms():
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+    yield
+
+
+@pytest.fixture
+async def company() -> Company:
+    await sync_to_async(Company.objects.all().delete)()
+    return await sync_to_async(Company.objects.create)(name_ko="원티드랩", name_en="Wantedlab")
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+    app.include_router(router)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+def test_histogram_render():
+    # given
+    histogram = Histogram("test_seconds", "Test.", (0.1, 1), ("route",))
+
+    # when
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/a",), 5)
+
+    # then
+    assert list(histogram.render()) == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_seconds_bucket{route="/a",le="1"} 2',
+        'test_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_seconds_sum{route="/a"} 5.55',
+        'test_seconds_count{route="/a"} 3',
+    ]
+
+
+async def test_server_timing_header(company: Company, client: AsyncClient):
+    # when
+    response = await client.get("/companies/search", params={"name": "원티드랩"})
+
+    # then
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert 'desc="1 queries"' in timing
+    for metric in ("db;dur=", "wait;dur=", "serialize;dur=", "app;dur="):
+        assert metric in timing
+
+
+async def test_request_histograms(company: Company, client: AsyncClient):
+    # when
+    await client.get("/companies/search", params={"name": "원티드랩"})
+    await client.get("/unknown")
+
+    # then
+    rendered = render_metrics({"max_workers": 4, "calls": {}}, {})
+    assert 'http_request_db_queries_count{method="GET",route="/companies/search"} 1' in rendered
+    assert 'http_request_db_queries_sum{method="GET",route="/companies/search"} 1' in rendered
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched"} 1' in rendered
+    assert 'http_response_size_bytes_count{method="GET",route="/companies/search"} 1' in rendered
+    assert DB_QUERIES.name in rendered
+
+
+@pytest.fixture
+def capture_all_queries(monkeypatch):
+    monkeypatch.setattr(slow_query_log, "enabled", True)
+    monkeypatch.setattr(slow_query_log, "threshold", 0)
+    # DEBUG turns on sampled EXPLAIN, which would make the plan random on PostgreSQL.
+    monkeypatch.setattr(slow_query_log, "explain", False)
+    slow_query_log.clear()
+    yield
+    slow_query_log.clear()
+
+
+async def test_slow_query_capture(company: Company, client: AsyncClient, capture_all_queries):
+    # when
+    await client.get("/companies/search", params={"name": "원티드랩"})
+
+    # then
+    [entry] = slow_query_log.entries()
+    assert entry.method == "GET"
+    assert entry.route == "/companies/search"
+    assert entry.query_string == "name=%EC%9B%90%ED%8B%B0%EB%93%9C%EB%9E%A9"
+    assert "company_company" in entry.sql
+    assert "원티드랩" in entry.params
+    assert entry.plan is None
+
+
+def test_slow_query_explains_only_sampled_postgres_selects(monkeypatch: pytest.MonkeyPatch):
+    # given
+    class Connection:
+        vendor = "postgresql"
+
+    context = {"connection": Connection()}
+    monkeypatch.setattr(slow_query_log, "explain", True)
+    monkeypatch.setattr(slow_query_log, "explain_sample_rate", 1.0)
+
+    # then
+    assert slow_query_log._should_explain(" SELECT 1", False, context)
+    assert not slow_query_log._should_explain("SELECT 1", True, context)
+    assert not slow_query_log._should_explain("UPDATE company_company SET name_ko = %s", False, context)
+    monkeypatch.setattr(Connection, "vendor", "sqlite")
+    assert not slow_query_log._should_explain("SELECT 1", False, context)
@@ -0,0 +1,103 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from wantedlab.company.models import Company, CompanyName, CompanyTag, Tag
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_company_save_syncs_normalized_names():
+    # given
+    company = Company.objects.create(name_ko="원티드랩", name_en="Wanted  Lab")
+
+    # when
+    company.name_en = None
+    company.name_ja = "ウォンテッドラボ"
+    company.save()
+
+    # then
+    assert dict(company.names.values_list("lang", "normalized_name")) == {
+        CompanyName.Language.KO: "원티드랩",
+        CompanyName.Language.JA: "ウォンテッドラボ",
+    }
+
+
+def test_tag_snapshot_follows_company_tags():
+    # given
+    company = Company.objects.create(name_ko="원티드랩")
+    tag = Tag.objects.create(name="개발", number=1)
+
+    # when
+    company.tags.add(tag)
+    added = Company.objects.get(id=company.id).tag_snapshot
+    tag.name = "개발자"
+    tag.save()
+    renamed = Company.objects.get(id=company.id).tag_snapshot
+    CompanyTag.objects.filter(company=company).delete()
+    removed = Company.objects.get(id=company.id).tag_snapshot
+
+    # then
+    assert added == [{"id": tag.id, "name": "개발", "number": 1}]
+    assert renamed == [{"id": tag.id, "name": "개발자", "number": 1}]
+    assert removed == []
+
+
+def test_moving_a_company_tag_refreshes_the_previous_company():
+    # given
+    first, second = Company.objects.create(name_ko="원티드랩"), Company.objects.create(name_ko="원티드")
+    development, design = Tag.objects.create(name="개발", number=1), Tag.objects.create(name="디자인", number=2)
+    company_tag = CompanyTag.objects.create(company=first, tag=development)
+
+    # when
+    company_tag.company, company_tag.tag = second, design
+    company_tag.save()
+
+    # then
+    assert Company.objects.get(id=first.id).tag_snapshot == []
+    assert Company.objects.get(id=second.id).tag_snapshot == [{"id": design.id, "name": "디자인", "number": 2}]
+
+
+def test_tag_delete_refreshes_snapshots_once(django_capture_on_commit_callbacks, monkeypatch):
+    # given
+    from wantedlab.company import signals
+
+    companies = [Company.objects.create(name_ko=f"회사{index}") for index in range(3)]
+    tag, kept = Tag.objects.create(name="개발", number=1), Tag.objects.create(name="디자인", number=2)
+    for company in companies:
+        company.tags.add(tag, kept)
+    refreshed = []
+    refresh_tag_snapshots = signals.refresh_tag_snapshots
+
+    def record_refresh(company_ids) -> None:
+        refreshed.append(sorted(company_ids))
+        refresh_tag_snapshots(company_ids)
+
+    monkeypatch.setattr(signals, "refresh_tag_snapshots", record_refresh)
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        tag.delete()
+
+    # then
+    assert refreshed == [sorted(company.id for company in companies)]
+    assert {tuple(Company.objects.get(id=company.id).tag_snapshot[0].values()) for company in companies} == {
+        (kept.id, "디자인", 2)
+    }
+    assert signals._deleting_tags.get() == {}
+
+
+def test_repair_tag_snapshots_rebuilds_stale_snapshots():
+    # given
+    company = Company.objects.create(name_ko="원티드랩")
+    tag = Tag.objects.create(name="개발", number=1)
+    CompanyTag.objects.bulk_create([CompanyTag(company=company, tag=tag)])
+
+    # when
+    with pytest.raises(CommandError):
+        call_command("repair_tag_snapshots", "--check", stdout=StringIO())
+    call_command("repair_tag_snapshots", stdout=StringIO())
+
+    # then
+    assert Company.objects.get(id=company.id).tag_snapshot == [{"id": tag.id, "name": "개발", "number": 1}]
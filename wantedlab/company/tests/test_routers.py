@@ -1,5 +1,8 @@
+import asyncio
+import json
+
 import pytest
-from fastapi import HTTPException, status
+from fastapi import FastAPI, HTTPException, status
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from pytest import MonkeyPatch
@@ -19,50 +22,63 @@ async def async_client():
 
 
 async def mock_list_companies_autocomplete(*args, **kwargs):
-    return {
-        "items": [
-            {
-                "id": 1,
-                "name_ko": "원티드랩",
-                "name_en": "Wantedlab",
-                "name_ja": "ウォンテッドラボ",
-            }
-        ],
-        "total": 1,
-        "offset": 0,
-        "limit": 10,
-    }
+    return json.dumps(
+        {
+            "items": [
+                {
+                    "id": 1,
+                    "name_ko": "원티드랩",
+                    "name_en": "Wantedlab",
+                    "name_ja": "ウォンテッドラボ",
+                }
+            ],
+            "total": 1,
+            "offset": 0,
+            "limit": 10,
+            "has_more": False,
+            "next_cursor": None,
+        },
+        ensure_ascii=False,
+    ).encode()
 
 
 async def mock_get_company_by_name(*args, **kwargs):
-    return {
-        "id": 1,
-        "name_ko": "원티드랩",
-        "name_en": "Wantedlab",
-        "name_ja": "ウォンテッドラボ",
-        "tags": [{"id": 1, "name": "태그1", "number": 1}, {"id": 2, "name": "태그2", "number": 2}],
-    }
+    return json.dumps(
+        {
+            "id": 1,
+            "name_ko": "원티드랩",
+            "name_en": "Wantedlab",
+            "name_ja": "ウォンテッドラボ",
+            "tags": [{"id": 1, "name": "태그1", "number": 1}, {"id": 2, "name": "태그2", "number": 2}],
+        },
+        ensure_ascii=False,
+    ).encode()
 
 
 async def mock_get_company_by_name_not_found(*args, **kwargs):
-    return None
+    return b"null"
 
 
 async def mock_list_companies_by_tag(*args, **kwargs):
-    return {
-        "items": [
-            {
-                "id": 1,
-                "name_ko": "원티드랩",
-                "name_en": "Wantedlab",
-                "name_ja": "ウォンテッドラボ",
-                "tags": [{"id": 1, "name": "개발", "number": 1}],
-            }
-        ],
-        "total": 1,
-        "offset": 0,
-        "limit": 10,
-    }
+    return json.dumps(
+        {
+            "items": [
+                {
+                    "id": 1,
+                    "name_ko": "원티드랩",
+                    "name_en": "Wantedlab",
+                    "name_ja": "ウォンテッドラボ",
+                    "tags": [{"id": 1, "name": "개발", "number": 1}],
+                }
+            ],
+            "total": 1,
+            "offset": 0,
+            "limit": 10,
+            "has_more": False,
+            "next_cursor": None,
+        },
+        ensure_ascii=False,
+    ).encode()
 
 
 async def mock_add_company_tag(*args, **kwargs):
@@ -108,6 +124,8 @@ def test_list_companies_autocomplete(monkeypatch: MonkeyPatch):
         "total": 1,
         "offset": 0,
         "limit": 10,
+        "has_more": False,
+        "next_cursor": None,
     }
 
 
@@ -185,6 +203,8 @@ def test_list_companies_by_tag(monkeypatch: MonkeyPatch):
         "total": 1,
         "offset": 0,
         "limit": 10,
+        "has_more": False,
+        "next_cursor": None,
     }
 
 
@@ -231,3 +251,113 @@ def test_remove_tag_from_company(monkeypatch: MonkeyPatch):
         "company_id": 1,
         "tags": [],
     }
+
+
+async def mock_bulk_update_company_tags(*args, **kwargs):
+    return {
+        "add": [{"company_id": 1, "tag_id": 1, "status": "added"}],
+        "remove": [{"company_id": 1, "tag_id": 2, "status": "not_assigned"}],
+    }
+
+
+def test_bulk_update_company_tags(monkeypatch: MonkeyPatch):
+    # given
+    monkeypatch.setattr(
+        CompanyView,
+        "bulk_update_company_tags",
+        mock_bulk_update_company_tags,
+    )
+
+    # when
+    response = client.post(
+        "/companies/tags/bulk",
+        json={"add": [{"company_id": 1, "tag_ids": [1]}], "remove": [{"company_id": 1, "tag_ids": [2]}]},
+    )
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "add": [{"company_id": 1, "tag_id": 1, "status": "added"}],
+        "remove": [{"company_id": 1, "tag_id": 2, "status": "not_assigned"}],
+    }
+
+
+async def mock_export_companies(*args, **kwargs):
+    async def chunks():
+        yield b'{"id":1,"name_ko":null,"name_en":"Wantedlab","name_ja":null,"tags":[]}\n'
+        yield b'{"id":2,"name_ko":null,"name_en":"Wanted","name_ja":null,"tags":[]}\n'
+
+    return chunks()
+
+
+def test_export_companies(monkeypatch: MonkeyPatch):
+    # given
+    monkeypatch.setattr(
+        CompanyView,
+        "export_companies",
+        mock_export_companies,
+    )
+
+    # when
+    response = client.get("/companies/export")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [line["id"] for line in map(json.loads, response.text.splitlines())] == [1, 2]
+
+
+def test_query_companies_by_tags(monkeypatch: MonkeyPatch):
+    # given
+    received = {}
+
+    async def mock_query_companies_by_tags(**kwargs):
+        received.update(kwargs)
+        return json.dumps({"items": [], "total": 0, "offset": 0, "limit": 10, "has_more": False, "next_cursor": None})
+
+    monkeypatch.setattr(CompanyView, "query_companies_by_tags", mock_query_companies_by_tags)
+
+    # when
+    response = client.get("/companies/tags/query?all=tag_3&all=tag_17&none=tag_20")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert received["all_tags"] == ["tag_3", "tag_17"]
+    assert received["any_tags"] == []
+    assert received["none_tags"] == ["tag_20"]
+
+
+def test_openapi_schema():
+    # given
+    app = FastAPI()
+    app.include_router(router)
+
+    # when
+    schema = app.openapi()
+
+    # then
+    parameters = schema["paths"]["/companies/search/keyword"]["get"]["parameters"]
+    mode = next(parameter for parameter in parameters if parameter["name"] == "mode")
+    assert mode["schema"]["$ref"] == "#/components/schemas/AutocompleteMode"
+
+
+async def test_admin_application_bounds_concurrency():
+    # given
+    from wantedlab.asgi import BoundedASGIApp
+
+    running, peak = 0, 0
+
+    async def app(scope, receive, send):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    bounded = BoundedASGIApp(app, max_concurrency=2)
+
+    # when
+    await asyncio.gather(*(bounded({"type": "http"}, None, None) for _ in range(6)))
+
+    # then
+    assert peak == 2
@@ -0,0 +1,263 @@
+import time
+
+import pytest
+from django.db import transaction
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from wantedlab.company import routing
+from wantedlab.company.cache import cached_response, response_cache
+from wantedlab.company.routing import (
+    PIN_COOKIE,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    ReplicaSet,
+    RequestRouting,
+    _current,
+    _pinned_until,
+    record_primary_write,
+    reads_pinned,
+)
+
+
+@pytest.fixture
+def replicas(monkeypatch: pytest.MonkeyPatch) -> ReplicaSet:
+    replicas = ReplicaSet(["replica_1", "replica_2"])
+    monkeypatch.setattr(routing, "replicas", replicas)
+    return replicas
+
+
+@pytest.fixture
+def request_routing() -> RequestRouting:
+    request_routing = RequestRouting()
+    token = _current.set(request_routing)
+    yield request_routing
+    _current.reset(token)
+
+
+def test_replica_set_round_robin_skips_unhealthy(replicas: ReplicaSet):
+    # when
+    replicas.mark("replica_1", False)
+    skipped = [replicas.choose() for _ in range(2)]
+    replicas.mark("replica_2", False)
+    none_healthy = replicas.choose()
+    replicas.mark("replica_1", True)
+    replicas.mark("replica_2", True)
+
+    # then
+    assert skipped == ["replica_2", "replica_2"]
+    assert none_healthy is None
+    assert sorted(replicas.choose() for _ in range(2)) == ["replica_1", "replica_2"]
+    assert replicas.status() == {"replica_1": True, "replica_2": True}
+
+
+def test_replica_set_check(replicas: ReplicaSet, monkeypatch: pytest.MonkeyPatch):
+    # given
+    class Cursor:
+        def __init__(self, alias: str) -> None:
+            self.alias = alias
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info) -> None:
+            pass
+
+        def execute(self, sql: str) -> None:
+            if self.alias == "replica_2":
+                raise ConnectionError("connection refused")
+
+    class Connection:
+        def __init__(self, alias: str) -> None:
+            self.alias = alias
+            self.closed = False
+
+        def cursor(self) -> Cursor:
+            return Cursor(self.alias)
+
+        def close(self) -> None:
+            self.closed = True
+
+    connections = {alias: Connection(alias) for alias in replicas.aliases}
+    monkeypatch.setattr(routing, "connections", connections)
+
+    # when
+    status = replicas.check()
+
+    # then
+    assert status == {"replica_1": True, "replica_2": False}
+    assert connections["replica_2"].closed is True
+    assert [replicas.choose() for _ in range(2)] == ["replica_1", "replica_1"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_router_reads_from_replicas_only_inside_requests(replicas: ReplicaSet):
+    # given
+    router = ReplicaRouter()
+
+    # when
+    outside_request = router.db_for_read(None)
+    token = _current.set(RequestRouting())
+    try:
+        in_request = router.db_for_read(None)
+        second_read = router.db_for_read(None)
+        with transaction.atomic():
+            in_transaction = router.db_for_read(None)
+        record_primary_write()
+        after_write = router.db_for_read(None)
+    finally:
+        _current.reset(token)
+
+    # then
+    assert outside_request is None
+    assert in_request in replicas.aliases
+    assert second_read == in_request
+    assert in_transaction is None
+    assert after_write is None
+    assert router.db_for_write(None) == "default"
+    assert router.allow_migrate("replica_1", "company") is False
+
+
+def test_pinned_until_is_capped(settings):
+    # given
+    settings.DB_READ_YOUR_WRITES_SECONDS = 5
+    now = time.time()
+
+    # when
+    from_cookie = _pinned_until({"headers": [(b"cookie", f"a=b; {PIN_COOKIE}={now + 2}".encode())]})
+    forged = _pinned_until({"headers": [(b"x-read-primary-until", b"99999999999")]})
+    invalid = _pinned_until({"headers": [(b"x-read-primary-until", b"soon")]})
+
+    # then
+    assert from_cookie == pytest.approx(now + 2)
+    assert forged <= time.time() + 5
+    assert invalid == 0
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/read")
+    async def read():
+        return {"pinned": reads_pinned()}
+
+    @app.post("/write")
+    async def write():
+        record_primary_write()
+        return {}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.asyncio
+async def test_write_pins_following_reads(client: AsyncClient):
+    # when
+    before = await client.get("/read")
+    written = await client.post("/write")
+    with_cookie = await client.get("/read")
+    client.cookies.clear()
+    with_header = await client.get("/read", headers={"X-Read-Primary-Until": written.headers["x-read-primary-until"]})
+    expired = await client.get("/read", headers={"X-Read-Primary-Until": str(time.time() - 1)})
+
+    # then
+    assert before.json() == {"pinned": False}
+    assert PIN_COOKIE in written.headers["set-cookie"]
+    assert with_cookie.json() == {"pinned": True}
+    assert "set-cookie" not in with_cookie.headers
+    assert with_header.json() == {"pinned": True}
+    assert expired.json() == {"pinned": False}
+
+
+@pytest.mark.asyncio
+async def test_routing_applies_only_under_path_prefix():
+    # given
+    seen = []
+
+    async def app(scope, receive, send) -> None:
+        seen.append(_current.get())
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = ReadYourWritesMiddleware(app, path_prefix="/api/")
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message) -> None:
+        pass
+
+    # when
+    for path in ("/api/v1/companies", "/django/admin/company/company/"):
+        await middleware({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send)
+
+    # then
+    assert isinstance(seen[0], RequestRouting)
+    assert seen[1] is None
+
+
+@pytest.mark.asyncio
+async def test_pinned_reads_bypass_response_cache(request_routing: RequestRouting):
+    # given
+    calls = []
+
+    @cached_response("test_pinned", scopes=lambda result, params: [])
+    async def load(value: int) -> dict:
+        calls.append(value)
+        return {"value": value}
+
+    # when
+    await load(1)
+    await load(1)
+    request_routing.pinned = True
+    await load(1)
+
+    # then
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_refill_recently_invalidated_entries(
+    request_routing: RequestRouting, replicas: ReplicaSet, settings
+):
+    # given
+    settings.DB_READ_YOUR_WRITES_SECONDS = 5
+    lagging_replica = {"value": "before write"}
+    calls = []
+
+    @cached_response("test_lagging", scopes=lambda result, params: ["lagging"])
+    async def load() -> dict:
+        calls.append(ReplicaRouter().db_for_read(None))
+        return dict(lagging_replica)
+
+    await load()
+
+    # when
+    response_cache.invalidate("lagging")
+    await load()
+    await load()
+    settings.DB_READ_YOUR_WRITES_SECONDS = 0
+    await load()
+    await load()
+
+    # then
+    assert calls == [request_routing.replica] * 4
+
+
+def test_pool_options_build_a_health_checked_pool():
+    # given
+    from django.db.backends.postgresql.base import DatabaseWrapper
+    from psycopg_pool import ConnectionPool
+
+    from wantedlab import settings as project_settings
+
+    wrapper = DatabaseWrapper({**project_settings.DATABASES["default"], "TIME_ZONE": None}, alias="pool_check")
+
+    # when
+    pool = wrapper.pool
+
+    # then
+    assert pool._check == ConnectionPool.check_connection
+    assert pool.max_size == project_settings.DB_POOL_MAX_SIZE
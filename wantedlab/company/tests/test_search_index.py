@@ -0,0 +1,141 @@
+import pytest
+
+from wantedlab.company.models import Company
+from wantedlab.company.pagination import paginate_sequence
+from wantedlab.company.search_index import CompanySearchIndex, ngrams
+
+
+@pytest.fixture
+def index() -> CompanySearchIndex:
+    index = CompanySearchIndex()
+    index.load(
+        [
+            (1, "원티드랩", "Wantedlab", "ウォンテッドラボ"),
+            (2, "원티드", "Wanted", None),
+            (3, "네이버", "NAVER", "ネイバー"),
+        ]
+    )
+    return index
+
+
+def test_ngrams():
+    # given
+    text = "원티드lab"
+
+    # when
+    result = ngrams(text)
+
+    # then
+    assert result == {"원티", "티드", "lab"}
+
+
+def test_search_ko(index: CompanySearchIndex):
+    # when
+    result = index.search("티드")
+
+    # then
+    assert [company.id for company in result] == [1, 2]
+
+
+def test_search_en_ignores_case(index: CompanySearchIndex):
+    # when
+    result = index.search("WANTEDL")
+
+    # then
+    assert [company.id for company in result] == [1]
+    assert result[0].name_en == "Wantedlab"
+
+
+def test_search_ja(index: CompanySearchIndex):
+    # when
+    result = index.search("イバ")
+
+    # then
+    assert [company.id for company in result] == [3]
+
+
+def test_search_shorter_than_gram(index: CompanySearchIndex):
+    # when
+    result = index.search("na")
+
+    # then
+    assert [company.id for company in result] == [3]
+
+
+def test_search_after_update_and_remove(index: CompanySearchIndex):
+    # when
+    index.add(2, "원티드코리아", None, None)
+    index.remove(1)
+
+    # then
+    assert [company.id for company in index.search("원티드")] == [2]
+    assert index.search("Wanted") == []
+
+
+def test_search_paginates_with_cursor(index: CompanySearchIndex):
+    # given
+    matches = index.search("원티드")
+
+    # when
+    first = paginate_sequence(matches, 0, 1, None, sort_key=lambda match: [match.id])
+    second = paginate_sequence(matches, 0, 1, first.next_cursor, sort_key=lambda match: [match.id])
+
+    # then
+    assert [match.id for match in first.rows] == [1]
+    assert [match.id for match in second.rows] == [2]
+    assert second.next_cursor is None
+
+
+def test_covers():
+    # then
+    assert CompanySearchIndex.covers("원티")
+    assert CompanySearchIndex.covers("wan")
+    assert not CompanySearchIndex.covers("원")
+    assert not CompanySearchIndex.covers("wa")
+
+
+@pytest.mark.django_db
+def test_refresh_if_changed_adds_rows_written_elsewhere(monkeypatch: pytest.MonkeyPatch):
+    # given
+    Company.objects.all().delete()
+    Company.objects.create(name_ko="원티드랩")
+    index = CompanySearchIndex()
+    index.build()
+    local = Company.objects.create(name_ko="원티드")
+    index.add(local.id, local.name_ko, None, None)
+    # bulk_create skips post_save, like a write from another process
+    [remote] = Company.objects.bulk_create([Company(name_ko="원티드코리아")])
+
+    def fail_build() -> None:
+        raise AssertionError("rebuilt")
+
+    monkeypatch.setattr(index, "build", fail_build)
+
+    # when
+    index.refresh_if_changed()
+
+    # then
+    assert len(index) == 3
+    assert remote.id in [company.id for company in index.search("코리")]
+
+
+@pytest.mark.django_db
+def test_refresh_if_changed_picks_up_renames_committed_late():
+    # given
+    Company.objects.all().delete()
+    company = Company.objects.create(name_ko="원티드랩")
+    index = CompanySearchIndex()
+    index.build()
+    newer = Company.objects.create(name_ko="원티드")
+    index.add(newer.id, newer.name_ko, None, None)
+    index.refresh_if_changed()
+
+    # when
+    # Saved before the newest row but committed after the last refresh, as by another process.
+    Company.objects.filter(id=company.id).update(name_ko="원티드코리아", updated_at=company.updated_at)
+    refreshed = index.refresh_if_changed()
+
+    # then
+    assert refreshed is True
+    assert [match.id for match in index.search("코리")] == [company.id]
+    assert index.refresh_if_changed() is False
@@ -0,0 +1,149 @@
+import pytest
+
+from wantedlab.company.models import Company, CompanyTag, Tag
+from wantedlab.company import tag_bitmaps
+from wantedlab.company.tag_bitmaps import TagBitmaps, _bitmap
+
+
+@pytest.fixture
+def bitmaps() -> TagBitmaps:
+    bitmaps = TagBitmaps()
+    bitmaps.load(
+        {
+            1: _bitmap([1, 2, 3, 5, 8]),
+            2: _bitmap([2, 3, 8, 13]),
+            3: _bitmap([3, 21]),
+        },
+        _bitmap([1, 2, 3, 5, 8, 13, 21, 34]),
+    )
+    return bitmaps
+
+
+def ids(bitmap: int) -> list[int]:
+    return TagBitmaps.page(bitmap, 0, 100)
+
+
+def test_query(bitmaps: TagBitmaps):
+    # then
+    assert ids(bitmaps.query(all_tags=[1, 2])) == [2, 3, 8]
+    assert ids(bitmaps.query(all_tags=[1, 2], none_tags=[3])) == [2, 8]
+    assert ids(bitmaps.query(any_tags=[2, 3])) == [2, 3, 8, 13, 21]
+    assert ids(bitmaps.query(none_tags=[1, 2])) == [21, 34]
+    assert ids(bitmaps.query(all_tags=[99])) == []
+    assert bitmaps.query(any_tags=[1, 3]).bit_count() == 6
+
+
+def test_page(bitmaps: TagBitmaps):
+    # given
+    matched = bitmaps.query(any_tags=[1, 2, 3])
+
+    # then
+    assert TagBitmaps.page(matched, 0, 3) == [1, 2, 3]
+    assert TagBitmaps.page(matched, 3, 3) == [5, 8, 13]
+    assert TagBitmaps.page(matched, 6, 3) == [21]
+    assert TagBitmaps.page(matched, 0, 2, after=5) == [8, 13]
+    assert TagBitmaps.page(0, 0, 10) == []
+
+
+def test_add_remove(bitmaps: TagBitmaps):
+    # when
+    bitmaps.add(34, 3)
+    bitmaps.remove(3, 3)
+    bitmaps.remove_company(2)
+    bitmaps.add_company(55)
+
+    # then
+    assert ids(bitmaps.query(all_tags=[3])) == [21, 34]
+    assert ids(bitmaps.query(all_tags=[2])) == [3, 8, 13]
+    assert ids(bitmaps.query(none_tags=[1, 2, 3])) == [55]
+
+
+@pytest.mark.parametrize("company_cost", [0, 10**9])
+def test_tag_counts(bitmaps: TagBitmaps, monkeypatch: pytest.MonkeyPatch, company_cost: int):
+    # given
+    # 0 always intersects the tag bitmaps, 10**9 always walks the matched companies' tags
+    monkeypatch.setattr(tag_bitmaps, "_COMPANY_COST", company_cost)
+
+    # when
+    bitmaps.add(5, 3)
+    bitmaps.remove(8, 1)
+    bitmaps.drop_tag(2)
+
+    # then
+    assert bitmaps.tag_counts([1, 3, 5, 8, 13, 21, 34], 10) == [(1, 3), (3, 3)]
+    assert bitmaps.tag_counts([1, 3, 5, 8, 13, 21, 34], 1) == [(1, 3)]
+    assert bitmaps.tag_counts([], 10) == []
+
+
+@pytest.mark.django_db
+def test_build_and_sync():
+    # given
+    Company.objects.all().delete()
+    first, second = Company.objects.create(name_ko="원티드랩"), Company.objects.create(name_ko="원티드")
+    development, design = Tag.objects.create(name="개발", number=1), Tag.objects.create(name="디자인", number=2)
+    CompanyTag.objects.create(company=first, tag=development)
+    bitmaps = TagBitmaps()
+    bitmaps.build()
+
+    # when
+    CompanyTag.objects.create(company=second, tag=development)
+    CompanyTag.objects.create(company=second, tag=design)
+    CompanyTag.objects.filter(company=first).delete()
+    bitmaps.sync([first.id, second.id], [1, 2])
+
+    # then
+    assert ids(bitmaps.query(all_tags=[development.id])) == [second.id]
+    assert ids(bitmaps.query(all_tags=[design.id])) == [second.id]
+    assert ids(bitmaps.query(none_tags=[development.id])) == [first.id]
+
+
+@pytest.mark.django_db
+def test_refresh_if_changed_applies_new_rows_without_rebuilding(monkeypatch: pytest.MonkeyPatch):
+    # given
+    Company.objects.all().delete()
+    first = Company.objects.create(name_ko="원티드랩")
+    development = Tag.objects.create(name="개발", number=1)
+    bitmaps = TagBitmaps()
+    bitmaps.build()
+    local = CompanyTag.objects.create(company=first, tag=development)
+    bitmaps.add(first.id, development.id)
+    bitmaps.refresh_if_changed()
+
+    # when
+    second = Company.objects.create(name_ko="원티드")
+    CompanyTag.objects.create(company=second, tag=development)
+    monkeypatch.setattr(bitmaps, "build", lambda: pytest.fail("local and new rows must not force a rebuild"))
+    refreshed = bitmaps.refresh_if_changed()
+    monkeypatch.undo()
+    local.delete()
+    rebuilt = bitmaps.refresh_if_changed()
+
+    # then
+    assert refreshed is True
+    assert rebuilt is True
+    assert ids(bitmaps.query(all_tags=[development.id])) == [second.id]
+    assert bitmaps.refresh_if_changed() is False
+
+
+@pytest.mark.django_db
+def test_writes_during_build_are_replayed(monkeypatch: pytest.MonkeyPatch):
+    # given
+    Company.objects.all().delete()
+    first = Company.objects.create(name_ko="원티드랩")
+    development = Tag.objects.create(name="개발", number=1)
+    bitmaps = TagBitmaps()
+    load = bitmaps.load
+
+    def load_after_write(*args) -> None:
+        # committed after build() read its snapshot
+        bitmaps.add(first.id, development.id)
+        load(*args)
+
+    monkeypatch.setattr(bitmaps, "load", load_after_write)
+
+    # when
+    bitmaps.build()
+
+    # then
+    assert bitmaps.is_ready
+    assert ids(bitmaps.query(all_tags=[development.id])) == [first.id]
@@ -0,0 +1,54 @@
+import pytest
+
+from wantedlab.company.models import Tag
+from wantedlab.company.tag_registry import TagRegistry, parse_tag_number
+
+
+@pytest.mark.parametrize(
+    "full_tag, expected",
+    [
+        ("tag_1", 1),
+        ("태그_20", 20),
+        ("my_tag_3", 3),
+        ("tag1", None),
+        ("tag_", None),
+        ("tag_1_0x", None),
+        ("tag_١", None),
+    ],
+)
+def test_parse_tag_number(full_tag: str, expected: int | None):
+    # then
+    assert parse_tag_number(full_tag) == expected
+
+
+def test_resolve_by_name_then_number():
+    # given
+    registry = TagRegistry()
+    registry.load([(1, "개발", 1), (2, "tag_1", 7), (3, "중복", 1)])
+
+    # then
+    assert registry.resolve("개발").id == 1
+    assert registry.resolve("tag_1").id == 2
+    assert registry.resolve("태그_7").id == 2
+    assert registry.get_by_number(1).id == 1
+    assert registry.get(3).name == "중복"
+    assert registry.resolve("tag_99") is None
+    assert registry.resolve("없는태그") is None
+
+
+@pytest.mark.django_db
+def test_refresh_if_changed():
+    # given
+    registry = TagRegistry()
+    Tag.objects.create(name="개발", number=1)
+    registry.build()
+
+    # when
+    unchanged = registry.refresh_if_changed()
+    Tag.objects.create(name="디자인", number=2)
+    changed = registry.refresh_if_changed()
+
+    # then
+    assert unchanged is False
+    assert changed is True
+    assert registry.resolve("tag_2").name == "디자인"
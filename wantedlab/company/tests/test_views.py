@@ -1,8 +1,26 @@
+import json
+import threading
+
 import pytest
 from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
 from fastapi import HTTPException
 
+from wantedlab.company.counting import count_cache
+from wantedlab.company.db import executor_stats, run_in_db
+from wantedlab.company.mutations import TagMutation
+from wantedlab.company.pagination import encode_cursor
 from wantedlab.company.models import Company, CompanyTag, Tag
+from wantedlab.company.schemas import (
+    AutocompleteMode,
+    BulkTagRequest,
+    BulkTagStatus,
+    PaginatedCompanyResponse,
+    TotalMode,
+)
+from wantedlab.company.search_index import CompanySearchIndex
+from wantedlab.company.tag_bitmaps import tag_bitmaps
+from wantedlab.company.tag_registry import tag_registry
 from wantedlab.company.views import CompanyView
 
 pytestmark = [pytest.mark.django_db, pytest.mark.asyncio]
@@ -84,6 +102,22 @@ async def test_get_company_by_name_ko(company: Company, company_tag: CompanyTag,
     assert result.tags[0].number == tag.number
 
 
+async def test_get_company_by_name_records_executor_stats(company: Company):
+    # given
+    label = "CompanyView._get_company_by_name"
+    before = executor_stats()["calls"].get(label, {}).get("calls", 0)
+
+    # when
+    await CompanyView.get_company_by_name("원티드랩")
+
+    # then
+    stats = executor_stats()["calls"][label]
+    assert stats["calls"] == before + 1
+    assert stats["queued"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["run_seconds_total"] > 0
+
+
 async def test_get_company_by_name_en(company: Company, company_tag: CompanyTag, tag: Tag):
     # given
     company_name = "Wantedlab"
@@ -257,3 +291,605 @@ async def test_delete_company_tag_tag_not_found(company: Company):
 
     assert exc_info.value.status_code == 404
     assert exc_info.value.detail == "태그를 찾을 수 없습니다."
+
+
+async def test_list_companies_autocomplete_from_search_index(company: Company, monkeypatch: pytest.MonkeyPatch):
+    # given
+    index = CompanySearchIndex()
+    await sync_to_async(index.build)()
+    monkeypatch.setattr("wantedlab.company.views.company_search_index", index)
+
+    # when
+    result = await CompanyView.list_companies_autocomplete(
+        company_name="wanted",
+        offset=0,
+        limit=10,
+    )
+
+    # then
+    assert result.total == 1
+    assert result.items[0].id == company.id
+    assert result.items[0].name_ja == company.name_ja
+
+
+async def test_list_companies_autocomplete_short_query_skips_search_index(
+    company: Company, monkeypatch: pytest.MonkeyPatch
+):
+    # given
+    index = CompanySearchIndex()
+    await sync_to_async(index.build)()
+
+    def scan(query: str):
+        raise AssertionError("short queries must not scan the index")
+
+    monkeypatch.setattr(index, "search", scan)
+    monkeypatch.setattr("wantedlab.company.views.company_search_index", index)
+
+    # when
+    result = await CompanyView.list_companies_autocomplete(company_name="wa", offset=0, limit=10)
+
+    # then
+    assert [item.id for item in result.items] == [company.id]
+
+
+async def test_autocomplete_cache_key_follows_search_path(company: Company, monkeypatch: pytest.MonkeyPatch):
+    # given
+    def key(company_name: str, mode: AutocompleteMode = AutocompleteMode.DEFAULT) -> dict:
+        return CompanyView._autocomplete_key(
+            {"company_name": company_name, "offset": 0, "limit": 10, "mode": mode, "cursor": None, "total_mode": None}
+        )
+
+    index = CompanySearchIndex()
+    await sync_to_async(index.build)()
+
+    # when
+    database_keys = [key("Straße"), key("STRASSE")]
+    chosung_keys = [key("ㅇㅌㄷ", AutocompleteMode.CHOSUNG), key("ㅇ ㅌ ㄷ", AutocompleteMode.CHOSUNG)]
+    monkeypatch.setattr("wantedlab.company.views.company_search_index", index)
+    index_keys = [key("Wanted  Lab"), key("wanted lab")]
+
+    # then
+    assert database_keys[0] != database_keys[1]
+    assert chosung_keys[0] == chosung_keys[1]
+    assert index_keys[0] == index_keys[1]
+    assert index_keys[0] != key("wanted lab", AutocompleteMode.TRIGRAM)
+
+
+async def test_list_companies_autocomplete_trigram_ranks_prefix_first(company: Company):
+    # given
+    other = await sync_to_async(Company.objects.create)(name_ko="주식회사 원티드랩", name_en="Wantedlab Inc.")
+
+    # when
+    result = await CompanyView.list_companies_autocomplete(
+        company_name="원티드랩",
+        offset=0,
+        limit=10,
+        mode=AutocompleteMode.TRIGRAM,
+    )
+
+    # then
+    assert result.total == 2
+    assert [item.id for item in result.items] == [company.id, other.id]
+
+
+@pytest.mark.parametrize("company_name", ["ㅇㅌㄷ", "ㄷㄹ", "원ㅌ"])
+async def test_list_companies_autocomplete_chosung(company: Company, company_name: str):
+    # when
+    result = await CompanyView.list_companies_autocomplete(
+        company_name=company_name,
+        offset=0,
+        limit=10,
+        mode=AutocompleteMode.CHOSUNG,
+    )
+
+    # then
+    assert result.total == 1
+    assert result.items[0].id == company.id
+
+
+async def test_list_companies_company_by_tag_cursor(tag: Tag):
+    # given
+    companies = [await sync_to_async(Company.objects.create)(name_ko=f"회사{i}") for i in range(3)]
+    for company in companies:
+        await sync_to_async(CompanyTag.objects.create)(company=company, tag=tag)
+
+    # when
+    first = await CompanyView.list_companies_company_by_tag(full_tag=f"tag_{tag.number}", offset=0, limit=2)
+    second = await CompanyView.list_companies_company_by_tag(
+        full_tag=f"tag_{tag.number}", offset=0, limit=2, cursor=first.next_cursor
+    )
+
+    # then
+    assert [item.id for item in first.items] == [company.id for company in companies[:2]]
+    assert first.next_cursor is not None
+    assert [item.id for item in second.items] == [companies[2].id]
+    assert second.next_cursor is None
+
+
+async def test_list_companies_autocomplete_invalid_cursor(company: Company):
+    # when & then
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.list_companies_autocomplete(company_name="원티드", offset=0, limit=10, cursor="invalid")
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "잘못된 커서입니다."
+
+
+async def test_list_companies_autocomplete_total_mode_none(company: Company):
+    # given
+    await sync_to_async(Company.objects.create)(name_ko="원티드코리아")
+
+    # when
+    result = await CompanyView.list_companies_autocomplete(
+        company_name="원티드",
+        offset=0,
+        limit=1,
+        total_mode=TotalMode.NONE,
+    )
+
+    # then
+    assert result.total is None
+    assert result.has_more is True
+    assert len(result.items) == 1
+
+
+async def test_list_companies_company_by_tag_total_mode_estimate(company_tag: CompanyTag, tag: Tag):
+    # given
+    count_cache.clear()
+
+    # when
+    result = await CompanyView.list_companies_company_by_tag(
+        full_tag=f"tag_{tag.number}",
+        offset=0,
+        limit=10,
+        total_mode=TotalMode.ESTIMATE,
+    )
+
+    # then
+    assert isinstance(result.total, int)
+    assert result.has_more is False
+    assert len(result.items) == 1
+
+
+async def test_list_companies_company_by_tag_stale_zero_estimate_still_lists(
+    company: Company, company_tag: CompanyTag, tag: Tag, monkeypatch: pytest.MonkeyPatch
+):
+    # given
+    # A cached estimate taken before the company was tagged
+    monkeypatch.setattr("wantedlab.company.counting.estimate_count", lambda queryset: 0)
+
+    # when
+    result = await CompanyView.list_companies_company_by_tag(
+        full_tag=f"tag_{tag.number}", offset=0, limit=10, total_mode=TotalMode.ESTIMATE
+    )
+
+    # then
+    assert result.total == 0
+    assert [item.id for item in result.items] == [company.id]
+
+
+async def test_get_company_by_name_normalizes_case_and_whitespace(company: Company):
+    # given
+    company_name = "  WANTEDLAB "
+
+    # when
+    result = await CompanyView.get_company_by_name(company_name)
+
+    # then
+    assert result is not None
+    assert result.id == company.id
+
+
+async def test_get_company_by_name_duplicates_returns_oldest(company: Company):
+    # given
+    await sync_to_async(Company.objects.create)(name_ko="원티드랩 재팬", name_en="Wantedlab")
+
+    # when
+    result = await CompanyView.get_company_by_name("Wantedlab")
+
+    # then
+    assert result is not None
+    assert result.id == company.id
+
+
+async def test_bulk_update_company_tags(company: Company, company_tag: CompanyTag, tag: Tag):
+    # given
+    other_company = await sync_to_async(Company.objects.create)(name_ko="원티드코리아")
+    other_tag = await sync_to_async(Tag.objects.create)(name="디자인", number=2)
+    request = BulkTagRequest(
+        add=[
+            {"company_id": company.id, "tag_ids": [tag.id, other_tag.id]},
+            {"company_id": other_company.id, "tag_ids": [tag.id, -1]},
+            {"company_id": -1, "tag_ids": [tag.id]},
+        ],
+        remove=[
+            {"company_id": company.id, "tag_ids": [tag.id]},
+            {"company_id": other_company.id, "tag_ids": [other_tag.id]},
+        ],
+    )
+
+    # when
+    result = await CompanyView.bulk_update_company_tags(request)
+
+    # then
+    assert [item.status for item in result.add] == [
+        BulkTagStatus.ADDED,
+        BulkTagStatus.ADDED,
+        BulkTagStatus.ADDED,
+        BulkTagStatus.TAG_NOT_FOUND,
+        BulkTagStatus.COMPANY_NOT_FOUND,
+    ]
+    assert [item.status for item in result.remove] == [BulkTagStatus.REMOVED, BulkTagStatus.NOT_ASSIGNED]
+    snapshots = dict(await sync_to_async(list)(Company.objects.values_list("id", "tag_snapshot")))
+    assert [tag["id"] for tag in snapshots[company.id]] == [tag.id, other_tag.id]
+    assert [tag["id"] for tag in snapshots[other_company.id]] == [tag.id]
+
+
+async def test_bulk_update_company_tags_locks_companies_before_writing(
+    company: Company, tag: Tag, monkeypatch: pytest.MonkeyPatch
+):
+    # given
+    events = []
+    select_for_update, bulk_create = QuerySet.select_for_update, QuerySet.bulk_create
+
+    def record_lock(self, *args, **kwargs):
+        events.append(("lock", self.model))
+        return select_for_update(self, *args, **kwargs)
+
+    def record_insert(self, *args, **kwargs):
+        events.append(("insert", self.model))
+        return bulk_create(self, *args, **kwargs)
+
+    monkeypatch.setattr(QuerySet, "select_for_update", record_lock)
+    monkeypatch.setattr(QuerySet, "bulk_create", record_insert)
+
+    # when
+    await CompanyView.bulk_update_company_tags(BulkTagRequest(add=[{"company_id": company.id, "tag_ids": [tag.id]}]))
+
+    # then
+    assert events[0] == ("lock", Company)
+    assert events.index(("insert", CompanyTag)) > 0
+
+
+async def test_bulk_update_company_tags_too_many_items(company: Company, tag: Tag, settings):
+    # given
+    settings.COMPANY_BULK_TAG_MAX_ITEMS = 1
+    request = BulkTagRequest(add=[{"company_id": company.id, "tag_ids": [tag.id, tag.id + 1]}])
+
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.bulk_update_company_tags(request)
+
+    # then
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "mutation, detail",
+    [
+        (
+            TagMutation(company_exists=False, tag_number=None, changed=False, tag_snapshot=[]),
+            "회사를 찾을 수 없습니다.",
+        ),
+        (
+            TagMutation(company_exists=True, tag_number=None, changed=False, tag_snapshot=[]),
+            "태그를 찾을 수 없습니다.",
+        ),
+    ],
+)
+async def test_tag_mutation_response_not_found(mutation: TagMutation, detail: str):
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        CompanyView._tag_mutation_response(1, mutation)
+
+    # then
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == detail
+
+
+async def test_tag_mutation_response():
+    # given
+    mutation = TagMutation(
+        company_exists=True, tag_number=1, changed=True, tag_snapshot=[{"id": 1, "name": "개발", "number": 1}]
+    )
+
+    # when
+    result = CompanyView._tag_mutation_response(1, mutation)
+
+    # then
+    assert result.company_id == 1
+    assert result.tags[0].name == "개발"
+
+
+async def test_export_companies(company: Company, company_tag: CompanyTag, tag: Tag):
+    # given
+    other_company = await sync_to_async(Company.objects.create)(name_ko="원티드코리아")
+
+    # when
+    chunks = await CompanyView.export_companies()
+    lines = b"".join([chunk async for chunk in chunks]).decode().splitlines()
+
+    # then
+    assert [json.loads(line)["id"] for line in lines] == [company.id, other_company.id]
+    assert json.loads(lines[0])["tags"] == [{"id": tag.id, "name": "개발", "number": 1}]
+
+
+async def test_export_companies_runs_on_export_executor(company: Company, monkeypatch: pytest.MonkeyPatch):
+    # given
+    threads = []
+    export_chunks = CompanyView._export_chunks
+
+    def record_thread(*args):
+        threads.append(threading.current_thread().name)
+        yield from export_chunks(*args)
+
+    monkeypatch.setattr(CompanyView, "_export_chunks", staticmethod(record_thread))
+    label = record_thread.__qualname__
+
+    # when
+    chunks = [chunk async for chunk in await CompanyView.export_companies()]
+
+    # then
+    assert chunks
+    assert threads[0].startswith("company-export")
+    stats = executor_stats()
+    assert stats["export"]["calls"][label]["calls"] == 1
+    assert label not in stats["calls"]
+
+
+async def test_export_companies_by_tag_streams_in_chunks(
+    company: Company, company_tag: CompanyTag, tag: Tag, settings
+):
+    # given
+    settings.COMPANY_EXPORT_CHUNK_SIZE = 1
+    await sync_to_async(Company.objects.create)(name_ko="원티드코리아")
+    tagged = await sync_to_async(Company.objects.create)(name_ko="원티드재팬")
+    await sync_to_async(CompanyTag.objects.create)(company=tagged, tag=tag)
+
+    # when
+    chunks = await CompanyView.export_companies(full_tag=f"tag_{tag.number}")
+    first = await anext(chunks)
+    await chunks.aclose()
+
+    # then
+    assert json.loads(first)["id"] == company.id
+
+
+async def test_export_companies_tag_not_found():
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.export_companies(full_tag="tag_999")
+
+    # then
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.parametrize("full_tag", ["tag", "tag_abc", "tag_1_"])
+async def test_list_companies_company_by_tag_malformed(full_tag: str):
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.list_companies_company_by_tag(full_tag=full_tag, offset=0, limit=10)
+
+    # then
+    assert exc_info.value.status_code == 400
+
+
+async def test_list_companies_company_by_tag_uses_registry(company_tag: CompanyTag, tag: Tag, mocker):
+    # given
+    tag_registry.load([(tag.id, tag.name, tag.number)])
+    find_tag = mocker.spy(CompanyView, "_find_tag")
+
+    try:
+        # when
+        result = await CompanyView.list_companies_company_by_tag(full_tag=tag.name, offset=0, limit=10)
+    finally:
+        tag_registry.clear()
+
+    # then
+    assert find_tag.call_count == 0
+    assert [item.id for item in result.items] == [company_tag.company_id]
+
+
+async def test_list_companies_company_by_tag_as_json_matches_schema(company_tag: CompanyTag, tag: Tag):
+    # when
+    payload = await CompanyView.list_companies_company_by_tag(
+        full_tag=f"tag_{tag.number}", offset=0, limit=10, as_json=True
+    )
+
+    # then
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == PaginatedCompanyResponse.model_validate_json(payload).model_dump(mode="json")
+
+
+async def test_get_company_by_name_as_json_not_found():
+    # when
+    payload = await CompanyView.get_company_by_name("존재하지 않는 회사", as_json=True)
+
+    # then
+    assert payload == b"null"
+
+
+@pytest.fixture
+async def tagged_companies() -> tuple[list[Company], list[Tag]]:
+    def create():
+        companies = [Company.objects.create(name_ko=f"회사{index}") for index in range(4)]
+        tags = [Tag.objects.create(name=f"태그{number}", number=number) for number in (1, 2, 3)]
+        for company_index, tag_indexes in ((0, (0, 1)), (1, (0, 1, 2)), (2, (0,)), (3, (1,))):
+            for tag_index in tag_indexes:
+                CompanyTag.objects.create(company=companies[company_index], tag=tags[tag_index])
+        return companies, tags
+
+    return await sync_to_async(create)()
+
+
+@pytest.mark.parametrize("use_bitmaps", [False, True])
+async def test_query_companies_by_tags(tagged_companies: tuple[list[Company], list[Tag]], use_bitmaps: bool):
+    # given
+    companies, tags = tagged_companies
+    if use_bitmaps:
+        await sync_to_async(tag_bitmaps.build)()
+
+    try:
+        # when
+        both = await CompanyView.query_companies_by_tags(["tag_1", "tag_2"], [], ["tag_3"], offset=0, limit=10)
+        either = await CompanyView.query_companies_by_tags([], ["tag_1", "tag_2"], [], offset=0, limit=2)
+        rest = await CompanyView.query_companies_by_tags(
+            [], ["tag_1", "tag_2"], [], offset=0, limit=2, cursor=either.next_cursor
+        )
+        untagged = await CompanyView.query_companies_by_tags([], [], ["tag_1"], offset=0, limit=10)
+    finally:
+        tag_bitmaps.clear()
+
+    # then
+    assert [item.id for item in both.items] == [companies[0].id]
+    assert both.total == 1
+    assert [item.tags[0].number for item in both.items] == [1]
+    assert [item.id for item in either.items] == [companies[0].id, companies[1].id]
+    assert either.total == 4
+    assert either.has_more is True
+    assert [item.id for item in rest.items] == [companies[2].id, companies[3].id]
+    assert rest.has_more is False
+    assert [item.id for item in untagged.items] == [companies[3].id]
+
+
+async def test_query_companies_by_tags_follows_tag_changes(tagged_companies: tuple[list[Company], list[Tag]]):
+    # given
+    companies, tags = tagged_companies
+    await sync_to_async(tag_bitmaps.build)()
+
+    try:
+        # when
+        await CompanyView.add_company_tag(companies[2].id, tags[2].id)
+        await CompanyView.delete_company_tag(companies[1].id, tags[2].id)
+        result = await CompanyView.query_companies_by_tags(["tag_3"], [], [], offset=0, limit=10)
+    finally:
+        tag_bitmaps.clear()
+
+    # then
+    assert [item.id for item in result.items] == [companies[2].id]
+
+
+async def test_query_companies_by_tags_requires_a_tag():
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.query_companies_by_tags([], [], [], offset=0, limit=10)
+
+    # then
+    assert exc_info.value.status_code == 400
+
+
+async def test_query_companies_by_tags_tag_not_found(tagged_companies: tuple[list[Company], list[Tag]]):
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.query_companies_by_tags(["tag_1"], [], ["tag_99"], offset=0, limit=10)
+
+    # then
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.parametrize("use_bitmaps", [False, True])
+async def test_list_companies_autocomplete_facets(
+    tagged_companies: tuple[list[Company], list[Tag]], use_bitmaps: bool
+):
+    # given
+    if use_bitmaps:
+        await sync_to_async(tag_bitmaps.build)()
+
+    try:
+        # when
+        result = await CompanyView.list_companies_autocomplete(company_name="회사", offset=0, limit=1, facets=2)
+    finally:
+        tag_bitmaps.clear()
+
+    # then
+    assert len(result.items) == 1
+    assert result.facets.matched == 4
+    assert result.facets.sampled is False
+    assert [(facet.number, facet.name, facet.count) for facet in result.facets.items] == [
+        (1, "태그1", 3),
+        (2, "태그2", 3),
+    ]
+
+
+async def test_list_companies_autocomplete_facets_sampled(tagged_companies: tuple[list[Company], list[Tag]], settings):
+    # given
+    settings.COMPANY_FACET_SAMPLE_SIZE = 2
+
+    # when
+    result = await CompanyView.list_companies_autocomplete(company_name="회사", offset=0, limit=10, facets=10)
+
+    # then
+    assert result.facets.matched == 4
+    assert result.facets.sampled is True
+    # Two sampled companies scaled up to four matches
+    assert all(facet.count in (2, 4) for facet in result.facets.items)
+
+
+async def test_matched_company_ids_samples_randomly(tagged_companies: tuple[list[Company], list[Tag]]):
+    # given
+    companies, _ = tagged_companies
+    queryset = CompanyView._autocomplete_queryset("회사", AutocompleteMode.DEFAULT)
+
+    # when
+    samples = [await run_in_db(CompanyView._matched_company_ids, queryset, 2) for _ in range(20)]
+
+    # then
+    assert {matched for _, matched in samples} == {4}
+    assert all(len(company_ids) == 2 for company_ids, _ in samples)
+    # Taking the first matches would only ever return the two oldest companies.
+    assert {company_id for company_ids, _ in samples for company_id in company_ids} - {
+        companies[0].id,
+        companies[1].id,
+    }
+
+
+async def test_list_companies_autocomplete_without_facets(company: Company):
+    # when
+    payload = await CompanyView.list_companies_autocomplete(company_name="원티드", offset=0, limit=10, as_json=True)
+
+    # then
+    assert "facets" not in json.loads(payload)
+
+
+TAMPERED_CURSORS = [encode_cursor(["x"]), encode_cursor([None]), encode_cursor([{"a": 1}]), encode_cursor([True])]
+
+
+@pytest.mark.parametrize("cursor", TAMPERED_CURSORS)
+@pytest.mark.parametrize("use_index", [False, True])
+async def test_list_companies_autocomplete_tampered_cursor(
+    company: Company, monkeypatch: pytest.MonkeyPatch, cursor: str, use_index: bool
+):
+    # given
+    if use_index:
+        index = CompanySearchIndex()
+        await sync_to_async(index.build)()
+        monkeypatch.setattr("wantedlab.company.views.company_search_index", index)
+
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.list_companies_autocomplete(company_name="원티드", offset=0, limit=10, cursor=cursor)
+
+    # then
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", [*TAMPERED_CURSORS, encode_cursor([0, "x"]), encode_cursor([0, 0.5, "x"])])
+async def test_list_companies_autocomplete_trigram_tampered_cursor(company: Company, cursor: str):
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.list_companies_autocomplete(
+            company_name="원티드", offset=0, limit=10, mode=AutocompleteMode.TRIGRAM, cursor=cursor
+        )
+
+    # then
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("cursor", TAMPERED_CURSORS)
+async def test_list_companies_company_by_tag_tampered_cursor(company_tag: CompanyTag, cursor: str):
+    # when
+    with pytest.raises(HTTPException) as exc_info:
+        await CompanyView.list_companies_company_by_tag(full_tag="tag_1", offset=0, limit=10, cursor=cursor)
+
+    # then
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,11 @@
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(value: str | None) -> str:
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKC", value).casefold()
+    return _WHITESPACE.sub(" ", value).strip()
@@ -1,133 +1,462 @@
-from asgiref.sync import sync_to_async
-from django.db import IntegrityError
-from django.db.models import Q, QuerySet
+import json
+import random
+from typing import AsyncIterator, Iterator
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Count, Exists, IntegerField, OuterRef, Q, QuerySet, Value, When
+from django.db.models.functions import Greatest
 from fastapi import HTTPException
+from pydantic import BaseModel
+from pydantic_core import to_json
 
-from wantedlab.company.models import Company, Tag
+from wantedlab.company.cache import SCOPE_COMPANIES, SCOPE_TAGS, cached_response, company_scope, tag_scope
+from wantedlab.company.counting import count_queryset
+from wantedlab.company.db import run_in_db, stream_in_db
+from wantedlab.company.hangul import decompose_jamo, extract_chosung, is_chosung_query
+from wantedlab.company.models import Company, CompanyTag, Tag
+from wantedlab.company.mutations import TagMutation, delete_company_tag, insert_company_tag
+from wantedlab.company.metrics import measure_serialization
+from wantedlab.company.pagination import decode_cursor, encode_cursor, paginate_queryset, paginate_sequence
 from wantedlab.company.schemas import (
-    AutocompletedCompanySchema,
+    AutocompleteMode,
+    BulkTagRequest,
+    BulkTagResponse,
+    BulkTagResult,
+    BulkTagStatus,
     CompanySchema,
     CompanyTagSchema,
     PaginatedAutocompleteResponse,
     PaginatedCompanyResponse,
     TagUpdateResponse,
+    TotalMode,
 )
+from wantedlab.company.search_index import company_search_index
+from wantedlab.company.tag_bitmaps import tag_bitmaps
+from wantedlab.company.tag_registry import parse_tag_number, tag_registry
+from wantedlab.company.signals import bulk_tag_changes, company_tags_changed
+from wantedlab.company.text import normalize_name
+
+
+AUTOCOMPLETE_FIELDS = ("id", "name_ko", "name_en", "name_ja")
+COMPANY_FIELDS = ("id", "name_ko", "name_en", "name_ja", "tag_snapshot")
 
 
 class CompanyView:
+    """Read endpoints build plain dicts from ``values()`` rows and cache them as
+    JSON bytes. Pass ``as_json=True`` to get those bytes back unvalidated; the
+    routers return them as-is."""
+
+    @staticmethod
+    def _load(payload: bytes, model: type[BaseModel], as_json: bool):
+        if as_json:
+            return payload
+        return None if payload == b"null" else model.model_validate_json(payload)
+
     @staticmethod
     async def list_companies_autocomplete(
         company_name: str,
         offset: int,
         limit: int,
-    ) -> PaginatedAutocompleteResponse:
-        companies: QuerySet[Company] = await sync_to_async(Company.objects.filter)(
+        mode: AutocompleteMode = AutocompleteMode.DEFAULT,
+        cursor: str | None = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        facets: int = 0,
+        as_json: bool = False,
+    ) -> PaginatedAutocompleteResponse | bytes:
+        payload = await CompanyView._autocomplete_payload(company_name, offset, limit, mode, cursor, total_mode)
+        if facets:
+            # Facets follow every tag change, so they are computed per request and appended to the cached page.
+            tag_facets = await CompanyView._tag_facets(company_name, mode, facets)
+            with measure_serialization():
+                payload = payload[:-1] + b',"facets":' + to_json(tag_facets) + b"}"
+        return CompanyView._load(payload, PaginatedAutocompleteResponse, as_json)
+
+    @staticmethod
+    @cached_response(
+        "autocomplete",
+        scopes=lambda result, params: [SCOPE_COMPANIES],
+        key_params=lambda params: CompanyView._autocomplete_key(params),
+    )
+    async def _autocomplete_payload(
+        company_name: str,
+        offset: int,
+        limit: int,
+        mode: AutocompleteMode,
+        cursor: str | None,
+        total_mode: TotalMode,
+    ) -> dict:
+        if CompanyView._uses_search_index(company_name, mode):
+            matches = await run_in_db(company_search_index.search, company_name)
+            page = paginate_sequence(matches, offset, limit, cursor, sort_key=lambda match: [match.id])
+            return CompanyView._page_payload(
+                [match._asdict() for match in page.rows],
+                None if total_mode == TotalMode.NONE else len(matches),
+                limit,
+                offset,
+                page.next_cursor,
+            )
+
+        companies = CompanyView._autocomplete_queryset(company_name, mode)
+        return await run_in_db(CompanyView._paginate_autocomplete, companies, offset, limit, cursor, total_mode)
+
+    @staticmethod
+    def _autocomplete_key(params: dict) -> dict:
+        # Queries share a cache entry only when the path that serves them would match the same rows.
+        company_name, mode = params["company_name"], params["mode"]
+        if CompanyView._uses_search_index(company_name, mode):
+            return {**params, "company_name": normalize_name(company_name), "index": True}
+        if mode == AutocompleteMode.CHOSUNG:
+            return {**params, "company_name": CompanyView._chosung_key(company_name)}
+        # ILIKE and trigram similarity fold case in the database, so the query is kept as typed.
+        return params
+
+    @staticmethod
+    def _uses_search_index(company_name: str, mode: AutocompleteMode) -> bool:
+        return (
+            mode == AutocompleteMode.DEFAULT
+            and company_search_index.is_ready
+            and company_search_index.covers(company_name)
+        )
+
+    @staticmethod
+    def _autocomplete_queryset(company_name: str, mode: AutocompleteMode) -> QuerySet[Company]:
+        if mode == AutocompleteMode.TRIGRAM:
+            return CompanyView._trigram_queryset(company_name)
+        if mode == AutocompleteMode.CHOSUNG:
+            return CompanyView._chosung_queryset(company_name)
+        return Company.objects.filter(
             Q(name_ko__icontains=company_name)
             | Q(name_en__icontains=company_name)
             | Q(name_ja__icontains=company_name)
+        ).order_by("id")
+
+    @staticmethod
+    def _trigram_queryset(company_name: str) -> QuerySet[Company]:
+        fields = ("name_ko", "name_en", "name_ja")
+
+        def match(lookup: str) -> Q:
+            return Q(*[Q(**{f"{field}__{lookup}": company_name}) for field in fields], _connector=Q.OR)
+
+        companies = Company.objects.filter(match("ilike_contains")).annotate(
+            match_rank=Case(
+                When(match("iexact"), then=Value(0)),
+                When(match("istartswith"), then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            )
         )
+        if connection.vendor != "postgresql":
+            return companies.order_by("match_rank", "id")
 
-        total = await sync_to_async(companies.count)()
+        return companies.annotate(
+            similarity=Greatest(*[TrigramSimilarity(field, company_name) for field in fields])
+        ).order_by("match_rank", "-similarity", "id")
 
-        paginated_companies = companies[offset : offset + limit]
+    @staticmethod
+    def _chosung_key(company_name: str) -> tuple[str, str]:
+        if is_chosung_query(company_name):
+            return "name_chosung", extract_chosung(company_name)
+        return "name_jamo", decompose_jamo(company_name)
 
-        items = [
-            AutocompletedCompanySchema(
-                id=company.id,
-                name_ko=company.name_ko,
-                name_en=company.name_en,
-                name_ja=company.name_ja,
+    @staticmethod
+    def _chosung_queryset(company_name: str) -> QuerySet[Company]:
+        field, key = CompanyView._chosung_key(company_name)
+        return (
+            Company.objects.filter(**{f"{field}__contains": key})
+            .annotate(
+                match_rank=Case(
+                    When(**{f"{field}__startswith": key}, then=Value(0)),
+                    default=Value(1),
+                    output_field=IntegerField(),
+                )
             )
-            for company in await sync_to_async(list)(paginated_companies)
-        ]
+            .order_by("match_rank", "id")
+        )
 
-        return PaginatedAutocompleteResponse(
-            items=items,
-            total=total,
-            limit=limit,
-            offset=offset,
+    @staticmethod
+    async def _tag_facets(company_name: str, mode: AutocompleteMode, limit: int) -> dict:
+        sample_size = settings.COMPANY_FACET_SAMPLE_SIZE
+        if CompanyView._uses_search_index(company_name, mode):
+            company_ids = [match.id for match in await run_in_db(company_search_index.search, company_name)]
+            matched = len(company_ids)
+            if matched > sample_size:
+                company_ids = random.sample(company_ids, sample_size)
+        else:
+            companies = CompanyView._autocomplete_queryset(company_name, mode)
+            company_ids, matched = await run_in_db(CompanyView._matched_company_ids, companies, sample_size)
+
+        if tag_bitmaps.is_ready:
+            counts = tag_bitmaps.tag_counts(company_ids, limit)
+        else:
+            counts = await run_in_db(CompanyView._count_tags, company_ids, limit)
+        sampled = len(company_ids) < matched
+        scale = matched / len(company_ids) if sampled else 1
+        tags = await CompanyView._tags_by_id([tag_id for tag_id, _ in counts])
+        items = [{**tags[tag_id], "count": round(count * scale)} for tag_id, count in counts if tag_id in tags]
+        return {"items": items, "matched": matched, "sampled": sampled}
+
+    @staticmethod
+    def _matched_company_ids(companies: QuerySet[Company], sample_size: int) -> tuple[list[int], int]:
+        company_ids = list(companies.values_list("id", flat=True)[: sample_size + 1])
+        if len(company_ids) <= sample_size:
+            return company_ids, len(company_ids)
+        # The counts are scaled up to every match, so the sample must be random; the first matches in id order
+        # are the oldest companies. ORDER BY random() with a LIMIT keeps only sample_size rows while sorting.
+        sample = list(companies.order_by("?").values_list("id", flat=True)[:sample_size])
+        return sample, companies.count()
+
+    @staticmethod
+    def _count_tags(company_ids: list[int], limit: int) -> list[tuple[int, int]]:
+        rows = (
+            CompanyTag.objects.filter(company_id__in=company_ids)
+            .values("tag_id")
+            .annotate(count=Count("id"))
+            .order_by("-count", "tag_id")[:limit]
         )
+        return [(row["tag_id"], row["count"]) for row in rows]
 
     @staticmethod
-    async def get_company_by_name(company_name: str) -> CompanySchema | None:
-        try:
-            company: Company = await sync_to_async(Company.objects.get)(
-                Q(name_ko=company_name) | Q(name_en=company_name) | Q(name_ja=company_name)
-            )
-        except Company.DoesNotExist:
-            return None
-        except Company.MultipleObjectsReturned:
-            raise HTTPException(status_code=400, detail="회사를 찾을 수 없습니다.")
-
-        tags = await sync_to_async(list)(company.tags.all())
-        return CompanySchema(
-            id=company.id,
-            name_ko=company.name_ko,
-            name_en=company.name_en,
-            name_ja=company.name_ja,
-            tags=[
-                CompanyTagSchema(
-                    id=tag.id,
-                    name=tag.name,
-                    number=tag.number,
-                )
-                for tag in tags
-            ],
+    async def _tags_by_id(tag_ids: list[int]) -> dict[int, dict]:
+        if tag_registry.is_ready:
+            tags = [tag_registry.get(tag_id) for tag_id in tag_ids]
+            return {tag.id: tag.model_dump() for tag in tags if tag is not None}
+        return await run_in_db(CompanyView._find_tags, tag_ids)
+
+    @staticmethod
+    def _find_tags(tag_ids: list[int]) -> dict[int, dict]:
+        return {row["id"]: row for row in Tag.objects.filter(id__in=tag_ids).values("id", "name", "number")}
+
+    @staticmethod
+    def _paginate_autocomplete(
+        companies: QuerySet[Company],
+        offset: int,
+        limit: int,
+        cursor: str | None,
+        total_mode: TotalMode,
+    ) -> dict:
+        total = count_queryset(companies, total_mode)
+        # Ordering keys (match_rank, similarity) are fetched for the cursor and dropped from the items.
+        ordering = [str(field).lstrip("-") for field in companies.query.order_by]
+        page = paginate_queryset(companies.values(*AUTOCOMPLETE_FIELDS, *ordering), offset, limit, cursor)
+        items = [{field: row[field] for field in AUTOCOMPLETE_FIELDS} for row in page.rows]
+        return CompanyView._page_payload(items, total, limit, offset, page.next_cursor)
+
+    @staticmethod
+    def _page_payload(items: list[dict], total: int | None, limit: int, offset: int, next_cursor: str | None) -> dict:
+        return {
+            "items": items,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def _company_payload(row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "name_ko": row["name_ko"],
+            "name_en": row["name_en"],
+            "name_ja": row["name_ja"],
+            "tags": row["tag_snapshot"],
+        }
+
+    @staticmethod
+    async def get_company_by_name(company_name: str, as_json: bool = False) -> CompanySchema | bytes | None:
+        payload = await CompanyView._company_by_name_payload(company_name)
+        return CompanyView._load(payload, CompanySchema, as_json)
+
+    @staticmethod
+    @cached_response(
+        "company_by_name",
+        scopes=lambda result, params: [
+            SCOPE_COMPANIES,
+            SCOPE_TAGS,
+            *([company_scope(result["id"])] if result else []),
+        ],
+        key_params=lambda params: {"company_name": normalize_name(params["company_name"])},
+    )
+    async def _company_by_name_payload(company_name: str) -> dict | None:
+        return await run_in_db(CompanyView._get_company_by_name, company_name)
+
+    @staticmethod
+    def _get_company_by_name(company_name: str) -> dict | None:
+        row = (
+            Company.objects.filter(names__normalized_name=normalize_name(company_name))
+            .order_by("id")
+            .values(*COMPANY_FIELDS)
+            .first()
         )
+        return None if row is None else CompanyView._company_payload(row)
 
     @staticmethod
     async def list_companies_company_by_tag(
         full_tag: str,
         offset: int,
         limit: int,
-    ) -> PaginatedCompanyResponse:
-        try:
-            _, number = full_tag.split("_")
-            tag: Tag = await sync_to_async(Tag.objects.get)(number=int(number))
-            companies: QuerySet[Company] = await sync_to_async(tag.companies.all)()
-
-            total = await sync_to_async(companies.count)()
-
-            if not total:
-                return PaginatedCompanyResponse(
-                    items=[],
-                    total=0,
-                    limit=limit,
-                    offset=offset,
-                )
+        cursor: str | None = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        as_json: bool = False,
+    ) -> PaginatedCompanyResponse | bytes:
+        tag = await CompanyView._resolve_tag(full_tag)
+        payload = await CompanyView._companies_by_tag_payload(tag, offset, limit, cursor, total_mode)
+        return CompanyView._load(payload, PaginatedCompanyResponse, as_json)
 
-            paginated_companies = companies[offset : offset + limit]
-            companies_list = await sync_to_async(list)(paginated_companies)
-
-            items = []
-            for company in companies_list:
-                tags = await sync_to_async(list)(company.tags.all())
-                items.append(
-                    CompanySchema(
-                        id=company.id,
-                        name_ko=company.name_ko,
-                        name_en=company.name_en,
-                        name_ja=company.name_ja,
-                        tags=[CompanyTagSchema(id=tag.id, name=tag.name, number=tag.number) for tag in tags],
-                    )
-                )
+    @staticmethod
+    @cached_response(
+        "companies_by_tag",
+        scopes=lambda result, params: [
+            SCOPE_TAGS,
+            tag_scope(params["tag"].number),
+            *(company_scope(item["id"]) for item in result["items"]),
+        ],
+        key_params=lambda params: {**params, "tag": params["tag"].id},
+    )
+    async def _companies_by_tag_payload(
+        tag: CompanyTagSchema,
+        offset: int,
+        limit: int,
+        cursor: str | None,
+        total_mode: TotalMode,
+    ) -> dict:
+        return await run_in_db(CompanyView._list_companies_by_tag, tag.id, offset, limit, cursor, total_mode)
 
-            return PaginatedCompanyResponse(
-                items=items,
-                total=total,
-                limit=limit,
-                offset=offset,
-            )
-        except Tag.DoesNotExist:
+    @staticmethod
+    def _list_companies_by_tag(
+        tag_id: int,
+        offset: int,
+        limit: int,
+        cursor: str | None,
+        total_mode: TotalMode,
+    ) -> dict:
+        companies = Company.objects.filter(companytag__tag_id=tag_id).order_by("id").values(*COMPANY_FIELDS)
+        total = count_queryset(companies, total_mode)
+        # Estimates are cached and may predate the companies just tagged; only an exact zero skips the page query.
+        if total == 0 and total_mode == TotalMode.EXACT:
+            return CompanyView._page_payload([], 0, limit, offset, None)
+
+        page = paginate_queryset(companies, offset, limit, cursor)
+        items = [CompanyView._company_payload(row) for row in page.rows]
+        return CompanyView._page_payload(items, total, limit, offset, page.next_cursor)
+
+    @staticmethod
+    async def _resolve_tag(full_tag: str) -> CompanyTagSchema:
+        if tag_registry.is_ready:
+            tag = tag_registry.resolve(full_tag)
+        else:
+            tag = await run_in_db(CompanyView._find_tag, full_tag)
+
+        if tag is None and parse_tag_number(full_tag) is None:
+            raise HTTPException(status_code=400, detail="잘못된 태그 형식입니다.")
+        if tag is None:
             raise HTTPException(status_code=404, detail="태그를 찾을 수 없습니다.")
+        return tag
+
+    @staticmethod
+    def _find_tag(full_tag: str) -> CompanyTagSchema | None:
+        tag = Tag.objects.filter(name=full_tag).order_by("id").first()
+        number = parse_tag_number(full_tag)
+        if tag is None and number is not None:
+            tag = Tag.objects.filter(number=number).order_by("id").first()
+        return None if tag is None else CompanyTagSchema(id=tag.id, name=tag.name, number=tag.number)
+
+    @staticmethod
+    async def query_companies_by_tags(
+        all_tags: list[str],
+        any_tags: list[str],
+        none_tags: list[str],
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        as_json: bool = False,
+    ) -> PaginatedCompanyResponse | bytes:
+        if not (all_tags or any_tags or none_tags):
+            raise HTTPException(status_code=400, detail="검색할 태그를 하나 이상 지정하세요.")
+        all_ids, any_ids, none_ids = [
+            [(await CompanyView._resolve_tag(full_tag)).id for full_tag in dict.fromkeys(tags)]
+            for tags in (all_tags, any_tags, none_tags)
+        ]
+        after = decode_cursor(cursor, [int])[0] if cursor is not None else None
+
+        if tag_bitmaps.is_ready:
+            matched = tag_bitmaps.query(all_ids, any_ids, none_ids)
+            ids = tag_bitmaps.page(matched, offset, limit + 1, after)
+            payload = await run_in_db(CompanyView._tagged_companies_page, ids, matched.bit_count(), offset, limit)
+        else:
+            payload = await run_in_db(
+                CompanyView._query_companies_by_tags, all_ids, any_ids, none_ids, offset, limit, cursor
+            )
+        with measure_serialization():
+            encoded = to_json(payload)
+        return CompanyView._load(encoded, PaginatedCompanyResponse, as_json)
+
+    @staticmethod
+    def _tagged_companies_page(ids: list[int], total: int, offset: int, limit: int) -> dict:
+        # ids holds up to limit + 1 matches from the bitmaps; only the page itself is read from the DB.
+        page_ids = ids[:limit]
+        rows = {row["id"]: row for row in Company.objects.filter(id__in=page_ids).values(*COMPANY_FIELDS)}
+        items = [CompanyView._company_payload(rows[company_id]) for company_id in page_ids if company_id in rows]
+        next_cursor = encode_cursor([page_ids[-1]]) if len(ids) > limit else None
+        return CompanyView._page_payload(items, total, limit, offset, next_cursor)
+
+    @staticmethod
+    def _query_companies_by_tags(
+        all_ids: list[int], any_ids: list[int], none_ids: list[int], offset: int, limit: int, cursor: str | None
+    ) -> dict:
+        def tagged(**filters) -> Exists:
+            return Exists(CompanyTag.objects.filter(company_id=OuterRef("id"), **filters))
+
+        companies = Company.objects.all()
+        for tag_id in all_ids:
+            companies = companies.filter(tagged(tag_id=tag_id))
+        if any_ids:
+            companies = companies.filter(tagged(tag_id__in=any_ids))
+        if none_ids:
+            companies = companies.exclude(tagged(tag_id__in=none_ids))
+        companies = companies.order_by("id").values(*COMPANY_FIELDS)
+
+        page = paginate_queryset(companies, offset, limit, cursor)
+        items = [CompanyView._company_payload(row) for row in page.rows]
+        return CompanyView._page_payload(items, companies.count(), limit, offset, page.next_cursor)
+
+    @staticmethod
+    async def export_companies(full_tag: str | None = None) -> AsyncIterator[bytes]:
+        companies = Company.objects.order_by("id")
+        if full_tag is not None:
+            tag = await CompanyView._resolve_tag(full_tag)
+            companies = companies.filter(companytag__tag_id=tag.id)
+        return stream_in_db(CompanyView._export_chunks, companies, settings.COMPANY_EXPORT_CHUNK_SIZE)
+
+    @staticmethod
+    def _export_chunks(companies: QuerySet[Company], chunk_size: int) -> Iterator[bytes]:
+        rows = companies.values_list("id", "name_ko", "name_en", "name_ja", "tag_snapshot").iterator(chunk_size)
+        lines = []
+        for company_id, name_ko, name_en, name_ja, tags in rows:
+            company = {"id": company_id, "name_ko": name_ko, "name_en": name_en, "name_ja": name_ja, "tags": tags}
+            lines.append(json.dumps(company, ensure_ascii=False, separators=(",", ":")) + "\n")
+            if len(lines) >= chunk_size:
+                yield "".join(lines).encode()
+                lines = []
+        if lines:
+            yield "".join(lines).encode()
 
     @staticmethod
     async def add_company_tag(company_id: int, tag_id: int) -> TagUpdateResponse:
+        return await run_in_db(CompanyView._add_company_tag, company_id, tag_id)
+
+    @staticmethod
+    def _add_company_tag(company_id: int, tag_id: int) -> TagUpdateResponse:
+        if connection.vendor == "postgresql":
+            return CompanyView._tag_mutation_response(company_id, insert_company_tag(company_id, tag_id))
+
         try:
-            company: Company = await sync_to_async(Company.objects.get)(id=company_id)
-            tag: Tag = await sync_to_async(Tag.objects.get)(id=tag_id)
-            await sync_to_async(company.tags.add)(tag)
-            return await CompanyView._company_tag_response(company, company_id)
+            company = Company.objects.get(id=company_id)
+            tag = Tag.objects.get(id=tag_id)
+            company.tags.add(tag)
+            return CompanyView._company_tag_response(company_id)
 
         except Company.DoesNotExist:
             raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다.")
@@ -138,11 +467,18 @@ class CompanyView:
 
     @staticmethod
     async def delete_company_tag(company_id: int, tag_id: int) -> TagUpdateResponse:
+        return await run_in_db(CompanyView._delete_company_tag, company_id, tag_id)
+
+    @staticmethod
+    def _delete_company_tag(company_id: int, tag_id: int) -> TagUpdateResponse:
+        if connection.vendor == "postgresql":
+            return CompanyView._tag_mutation_response(company_id, delete_company_tag(company_id, tag_id))
+
         try:
-            company: Company = await sync_to_async(Company.objects.get)(id=company_id)
-            tag: Tag = await sync_to_async(Tag.objects.get)(id=tag_id)
-            await sync_to_async(company.tags.remove)(tag)
-            return await CompanyView._company_tag_response(company, company_id)
+            company = Company.objects.get(id=company_id)
+            tag = Tag.objects.get(id=tag_id)
+            company.tags.remove(tag)
+            return CompanyView._company_tag_response(company_id)
 
         except Company.DoesNotExist:
             raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다.")
@@ -150,14 +486,95 @@ class CompanyView:
             raise HTTPException(status_code=404, detail="태그를 찾을 수 없습니다.")
 
     @staticmethod
-    async def _company_tag_response(company: Company, company_id: int) -> TagUpdateResponse:
-        tags = await sync_to_async(list)(company.tags.all())
-        tag_schemas = [
-            CompanyTagSchema(
-                id=tag.id,
-                name=tag.name,
-                number=tag.number,
+    def _tag_mutation_response(company_id: int, mutation: TagMutation) -> TagUpdateResponse:
+        if not mutation.company_exists:
+            raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다.")
+        if mutation.tag_number is None:
+            raise HTTPException(status_code=404, detail="태그를 찾을 수 없습니다.")
+        return TagUpdateResponse(company_id=company_id, tags=mutation.tag_snapshot)
+
+    @staticmethod
+    def _company_tag_response(company_id: int) -> TagUpdateResponse:
+        tag_snapshot = Company.objects.values_list("tag_snapshot", flat=True).get(id=company_id)
+        return TagUpdateResponse(company_id=company_id, tags=tag_snapshot)
+
+    @staticmethod
+    async def bulk_update_company_tags(request: BulkTagRequest) -> BulkTagResponse:
+        return await run_in_db(CompanyView._bulk_update_company_tags, request)
+
+    @staticmethod
+    def _bulk_update_company_tags(request: BulkTagRequest) -> BulkTagResponse:
+        to_add = list(dict.fromkeys((item.company_id, tag_id) for item in request.add for tag_id in item.tag_ids))
+        to_remove = list(
+            dict.fromkeys((item.company_id, tag_id) for item in request.remove for tag_id in item.tag_ids)
+        )
+        if len(to_add) + len(to_remove) > settings.COMPANY_BULK_TAG_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"한 번에 최대 {settings.COMPANY_BULK_TAG_MAX_ITEMS}개의 항목만 처리할 수 있습니다.",
             )
-            for tag in tags
-        ]
-        return TagUpdateResponse(company_id=company_id, tags=tag_schemas)
+
+        pairs = to_add + to_remove
+        company_ids = {company_id for company_id, _ in pairs}
+        tag_ids = {tag_id for _, tag_id in pairs}
+
+        with transaction.atomic():
+            # Lock the companies in id order before any CompanyTag write. The inserts' foreign key checks take
+            # KEY SHARE on these rows, and upgrading that to the snapshot refresh's FOR UPDATE afterwards
+            # deadlocks against another bulk request that touches the same companies.
+            existing_companies = set(
+                Company.objects.select_for_update()
+                .filter(id__in=company_ids)
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+            tag_numbers = dict(Tag.objects.filter(id__in=tag_ids).values_list("id", "number"))
+            assigned = {
+                (company_id, tag_id): company_tag_id
+                for company_tag_id, company_id, tag_id in CompanyTag.objects.filter(
+                    company_id__in=company_ids, tag_id__in=tag_ids
+                ).values_list("id", "company_id", "tag_id")
+            }
+
+            def status_of(
+                pair: tuple[int, int], current: set[tuple[int, int]], found: BulkTagStatus, missing: BulkTagStatus
+            ) -> BulkTagStatus:
+                if pair[0] not in existing_companies:
+                    return BulkTagStatus.COMPANY_NOT_FOUND
+                if pair[1] not in tag_numbers:
+                    return BulkTagStatus.TAG_NOT_FOUND
+                return found if pair in current else missing
+
+            # Removals are applied before additions so a pair listed in both ends up assigned.
+            current = set(assigned)
+            removed = [
+                (pair, status_of(pair, current, BulkTagStatus.REMOVED, BulkTagStatus.NOT_ASSIGNED))
+                for pair in to_remove
+            ]
+            removed_pairs = {pair for pair, status in removed if status == BulkTagStatus.REMOVED}
+            current -= removed_pairs
+            added = [
+                (pair, status_of(pair, current, BulkTagStatus.ALREADY_EXISTS, BulkTagStatus.ADDED)) for pair in to_add
+            ]
+            added_pairs = [pair for pair, status in added if status == BulkTagStatus.ADDED]
+
+            with bulk_tag_changes():
+                if removed_pairs:
+                    CompanyTag.objects.filter(id__in=[assigned[pair] for pair in removed_pairs]).delete()
+                CompanyTag.objects.bulk_create(
+                    [CompanyTag(company_id=company_id, tag_id=tag_id) for company_id, tag_id in added_pairs],
+                    batch_size=1000,
+                    ignore_conflicts=True,
+                )
+
+            changed = removed_pairs.union(added_pairs)
+            if changed:
+                company_tags_changed(
+                    {company_id for company_id, _ in changed},
+                    {tag_numbers[tag_id] for _, tag_id in changed},
+                )
+
+        return BulkTagResponse(
+            add=[BulkTagResult(company_id=pair[0], tag_id=pair[1], status=status) for pair, status in added],
+            remove=[BulkTagResult(company_id=pair[0], tag_id=pair[1], status=status) for pair, status in removed],
+        )
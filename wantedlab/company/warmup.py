@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from wantedlab.company.db import run_in_db
+from wantedlab.company.routing import replicas
+from wantedlab.company.search_index import company_search_index
+from wantedlab.company.tag_bitmaps import tag_bitmaps
+from wantedlab.company.tag_registry import tag_registry
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_company_indexes() -> None:
+    try:
+        await run_in_db(tag_registry.build)
+    except Exception:
+        logger.exception("tag registry load failed; tag lookups fall back to the database")
+    if settings.COMPANY_SEARCH_INDEX_ENABLED:
+        try:
+            await sync_to_async(company_search_index.build, thread_sensitive=False)()
+        except Exception:
+            logger.exception("company search index build failed; autocomplete falls back to the database")
+    if settings.COMPANY_TAG_BITMAPS_ENABLED:
+        try:
+            await run_in_db(tag_bitmaps.build)
+        except Exception:
+            logger.exception("tag bitmaps build failed; tag queries fall back to the database")
+
+
+async def refresh_tag_registry_periodically() -> None:
+    # Catches tag writes from other processes (admin, import_companies); local writes reload via signals.
+    while True:
+        await asyncio.sleep(settings.COMPANY_TAG_REGISTRY_REFRESH_INTERVAL)
+        try:
+            await run_in_db(tag_registry.refresh_if_changed)
+        except Exception:
+            logger.exception("tag registry refresh failed")
+
+
+async def refresh_search_index_periodically() -> None:
+    # Local writes update the index through signals; this picks up other workers and import_companies.
+    if not settings.COMPANY_SEARCH_INDEX_ENABLED:
+        return
+    while True:
+        await asyncio.sleep(settings.COMPANY_SEARCH_INDEX_REFRESH_INTERVAL)
+        try:
+            await run_in_db(company_search_index.refresh_if_changed)
+        except Exception:
+            logger.exception("company search index refresh failed")
+
+
+async def refresh_tag_bitmaps_periodically() -> None:
+    # Local writes update the bitmaps on commit; this picks up writes made by other processes.
+    if not settings.COMPANY_TAG_BITMAPS_ENABLED:
+        return
+    while True:
+        await asyncio.sleep(settings.COMPANY_TAG_BITMAPS_REFRESH_INTERVAL)
+        try:
+            await run_in_db(tag_bitmaps.refresh_if_changed)
+        except Exception:
+            logger.exception("tag bitmaps refresh failed")
+
+
+async def check_replicas_periodically() -> None:
+    if not replicas.aliases:
+        return
+    while True:
+        try:
+            await run_in_db(replicas.check)
+        except Exception:
+            logger.exception("replica health check failed")
+        await asyncio.sleep(settings.DB_REPLICA_HEALTH_CHECK_INTERVAL)
@@ -1,21 +1,56 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 
 import django
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "wantedlab.settings")
 django.setup()
 
-from django.core.wsgi import get_wsgi_application
+from django.conf import settings
 from fastapi import FastAPI
-from fastapi.middleware.wsgi import WSGIMiddleware
+from fastapi.responses import PlainTextResponse
 
+from wantedlab.asgi import admin_application
+from wantedlab.company.db import executor_stats, pool_stats
+from wantedlab.company.metrics import RequestMetricsMiddleware, render_metrics
 from wantedlab.company.routers import router as company_router
+from wantedlab.company.routing import ReadYourWritesMiddleware, replicas
+from wantedlab.company.slow_queries import slow_query_log
+from wantedlab.company.warmup import (
+    check_replicas_periodically,
+    refresh_search_index_periodically,
+    refresh_tag_bitmaps_periodically,
+    refresh_tag_registry_periodically,
+    warm_up_company_indexes,
+)
 
-app = FastAPI(title="Wanted Lab API")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up = asyncio.create_task(warm_up_company_indexes())
+    tag_refresh = asyncio.create_task(refresh_tag_registry_periodically())
+    bitmap_refresh = asyncio.create_task(refresh_tag_bitmaps_periodically())
+    index_refresh = asyncio.create_task(refresh_search_index_periodically())
+    replica_checks = asyncio.create_task(check_replicas_periodically())
+    yield
+    warm_up.cancel()
+    tag_refresh.cancel()
+    bitmap_refresh.cancel()
+    index_refresh.cancel()
+    replica_checks.cancel()
 
-django_app = WSGIMiddleware(get_wsgi_application())
-app.mount("/django", django_app)
+
+app = FastAPI(title="Wanted Lab API", lifespan=lifespan)
+
+# The admin mount and the health/metrics endpoints stay on the primary.
+app.add_middleware(ReadYourWritesMiddleware, path_prefix="/api/")
+
+if settings.REQUEST_METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
+
+app.mount("/django", admin_application)
 
 
 app.include_router(company_router, prefix="/api/v1", tags=["companies"])
@@ -24,3 +59,24 @@ app.include_router(company_router, prefix="/api/v1", tags=["companies"])
 @app.get("/")
 async def root():
     return {"message": "Welcome to Wanted Lab"}
+
+
+@app.get("/health/db")
+async def database_health():
+    return {"pools": pool_stats(), "executor": executor_stats(), "replicas": replicas.status()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(executor_stats(), pool_stats()), media_type="text/plain; version=0.0.4")
+
+
+if settings.DEBUG:
+
+    @app.get("/debug/slow-queries", include_in_schema=False)
+    async def slow_queries():
+        return {
+            "enabled": slow_query_log.enabled,
+            "threshold_ms": slow_query_log.threshold * 1000,
+            "entries": [entry._asdict() for entry in slow_query_log.entries()],
+        }
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "wantedlab.company",
 ]
 
@@ -70,17 +72,103 @@ TEMPLATES = [
 WSGI_APPLICATION = "wantedlab.wsgi.application"
 
 
+# Django admin, mounted into the FastAPI app at /django
+
+DJANGO_ADMIN_MAX_CONCURRENCY = int(os.environ.get("DJANGO_ADMIN_MAX_CONCURRENCY", "4"))
+
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+
+def env_bool(name: str, default: bool) -> bool:
+    return os.environ.get(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+DB_POOL_ENABLED = env_bool("DB_POOL", True)
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "20"))
+# Threads that stream exports. Exports hold a connection for the whole response, so they get their own
+# small executor and can never take every API thread.
+DB_EXPORT_MAX_WORKERS = int(os.environ.get("DB_EXPORT_MAX_WORKERS", "2"))
+# Threads that run blocking ORM calls for the API and warmup. Export threads and the admin (up to
+# DJANGO_ADMIN_MAX_CONCURRENCY) take connections from the same pool, so the default leaves room for them.
+# Raising it past that makes calls wait up to DB_POOL_TIMEOUT for a connection once all of them are busy.
+DB_EXECUTOR_MAX_WORKERS = int(
+    os.environ.get(
+        "DB_EXECUTOR_MAX_WORKERS",
+        str(max(DB_POOL_MAX_SIZE - DB_EXPORT_MAX_WORKERS - DJANGO_ADMIN_MAX_CONCURRENCY, 1)),
+    )
+)
+# Calls that wait longer than this for a free thread are logged.
+DB_EXECUTOR_SLOW_WAIT_MS = float(os.environ.get("DB_EXECUTOR_SLOW_WAIT_MS", "100"))
+
+
+def database_options() -> dict:
+    if not DB_POOL_ENABLED:
+        return {}
+
+    # CONN_HEALTH_CHECKS makes Django pass check=ConnectionPool.check_connection to the pool itself.
+    return {
+        "pool": {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800")),
+        }
+    }
+
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
-        "NAME": "wantedlab",
-        "USER": "postgres",
-        "PASSWORD": "postgres",
-        "HOST": "db",
-        "PORT": "5432",
+        "NAME": os.environ.get("DB_NAME", "wantedlab"),
+        "USER": os.environ.get("DB_USER", "postgres"),
+        "PASSWORD": os.environ.get("DB_PASSWORD", "postgres"),
+        "HOST": os.environ.get("DB_HOST", "db"),
+        "PORT": os.environ.get("DB_PORT", "5432"),
+        # Django requires CONN_MAX_AGE = 0 when the psycopg pool owns connection reuse.
+        "CONN_MAX_AGE": 0 if DB_POOL_ENABLED else int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": database_options(),
+    }
+}
+
+# Read replicas as "host" or "host:port", comma separated. Each becomes a read-only "replica_<n>" alias with the
+# primary's credentials; a second alias to the primary itself is enough to try the routing locally.
+DB_REPLICA_ALIASES = []
+for index, replica in enumerate(filter(None, map(str.strip, os.environ.get("DB_REPLICA_HOSTS", "").split(","))), 1):
+    replica_host, _, replica_port = replica.partition(":")
+    DB_REPLICA_ALIASES.append(f"replica_{index}")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+        "OPTIONS": {**database_options(), "options": "-c default_transaction_read_only=on"},
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["wantedlab.company.routing.ReplicaRouter"]
+DB_REPLICA_HEALTH_CHECK_INTERVAL = float(os.environ.get("DB_REPLICA_HEALTH_CHECK_INTERVAL", "5"))
+# Expected worst replication lag. After a write the client's reads stay on the primary this long, and replica
+# reads don't refill response cache entries invalidated within it.
+DB_READ_YOUR_WRITES_SECONDS = float(os.environ.get("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[os.environ.get("CACHE_BACKEND", "locmem")],
+        "LOCATION": os.environ.get("CACHE_LOCATION", "wantedlab"),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
     }
 }
 
@@ -125,3 +213,50 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Request metrics: Server-Timing response header and the Prometheus /metrics endpoint
+
+REQUEST_METRICS_ENABLED = env_bool("REQUEST_METRICS", True)
+REQUEST_METRICS_SERVER_TIMING = env_bool("REQUEST_METRICS_SERVER_TIMING", True)
+
+
+# Company search
+
+COMPANY_SEARCH_INDEX_ENABLED = True
+COMPANY_SEARCH_INDEX_REFRESH_INTERVAL = 60
+# updated_at is set at save time, not commit time, so each refresh re-reads this many seconds before the
+# newest updated_at it saw. A transaction that stays open longer than this can still be missed until a rebuild.
+COMPANY_SEARCH_INDEX_REFRESH_OVERLAP = 600
+
+COMPANY_COUNT_CACHE_TTL = 60
+
+COMPANY_TAG_REGISTRY_REFRESH_INTERVAL = 30
+
+# Per-tag company id bitsets behind GET /companies/tags/query; rebuilt when another process changed CompanyTag.
+COMPANY_TAG_BITMAPS_ENABLED = True
+COMPANY_TAG_BITMAPS_REFRESH_INTERVAL = 60
+
+# Autocomplete tag facets count at most this many matched companies and scale the counts up past it.
+COMPANY_FACET_SAMPLE_SIZE = 10000
+
+COMPANY_BULK_TAG_MAX_ITEMS = 10000
+
+COMPANY_EXPORT_CHUNK_SIZE = 2000
+
+# Statements slower than THRESHOLD_MS are logged and kept for GET /debug/slow-queries (DEBUG only).
+# EXPLAIN (ANALYZE, BUFFERS) re-runs a sample of the slow SELECTs, so it is never on outside DEBUG.
+COMPANY_SLOW_QUERY = {
+    "ENABLED": env_bool("COMPANY_SLOW_QUERY", False),
+    "THRESHOLD_MS": float(os.environ.get("COMPANY_SLOW_QUERY_THRESHOLD_MS", "100")),
+    "MAX_ENTRIES": 200,
+    "EXPLAIN": DEBUG and env_bool("COMPANY_SLOW_QUERY_EXPLAIN", True),
+    "EXPLAIN_SAMPLE_RATE": float(os.environ.get("COMPANY_SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.2")),
+}
+
+COMPANY_RESPONSE_CACHE = {
+    "ENABLED": env_bool("COMPANY_RESPONSE_CACHE", True),
+    "TTL": int(os.environ.get("COMPANY_RESPONSE_CACHE_TTL", "300")),
+    "MAX_ENTRIES": 10000,
+    "SHARED_ALIAS": "default",
+}